@@ -13,7 +13,8 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-from src.apps.tasks.models import Task, TaskStatusEnum
+from src.apps.auth.models import RefreshToken
+from src.apps.tasks.models import Task, TaskMetric, TaskOutboxEvent, TaskStatusEnum
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -0,0 +1,114 @@
+"""
+Compara el throughput del acceso síncrono (Session sobre pg8000, ejecutado
+dentro de un handler async como lo hacían los controladores) y el asíncrono
+(AsyncSession sobre asyncpg) para la consulta del listado de tareas.
+
+Ambas rutas se montan en una misma aplicación de FastAPI y se invocan en el
+mismo proceso con httpx, con varias peticiones concurrentes, por lo que una
+consulta síncrona bloquea el event loop igual que en el servidor. Se usa la
+base de datos configurada en las variables de entorno.
+
+Con una concurrencia mayor al pool síncrono (DB_POOL_SIZE no aplica a este
+motor, que usa 5 + 10 conexiones) la ruta síncrona espera una conexión
+bloqueando el event loop y las peticiones fallan al agotarse el tiempo de
+espera del pool.
+
+Para comparar las dos versiones desplegadas con los escenarios de Locust se
+puede usar `locust -f locust/read_endpoints.py`.
+
+Uso:
+    poetry run python manage.py benchmark-db --requests 1000 --concurrency 10
+"""
+
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.apps.tasks.models import Task
+from src.apps.users.models import User
+from src.apps.videos.models import Video
+from src.core.database.base import async_engine, engine
+from src.core.database.dependencies import get_async_db, get_db
+
+
+def get_query(user_id: int):
+    return (
+        select(Task)
+        .where(Task.user_id == user_id, Task.is_active == True)
+        .order_by(Task.id.desc())
+        .limit(10)
+    )
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync/{user_id}")
+    async def sync_tasks(user_id: int, session: Session = Depends(get_db)):
+        return [task.id for task in session.execute(get_query(user_id)).scalars()]
+
+    @app.get("/async/{user_id}")
+    async def async_tasks(user_id: int, session: AsyncSession = Depends(get_async_db)):
+        result = await session.execute(get_query(user_id))
+        return [task.id for task in result.scalars()]
+
+    return app
+
+
+async def run_stack(
+    client: httpx.AsyncClient, path: str, requests: int, concurrency: int
+) -> dict:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    # Se calientan los pools de conexiones antes de medir
+    await asyncio.gather(*(call() for _ in range(concurrency)))
+    latencies.clear()
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def run(user_id: int, requests: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=create_app())
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for stack in ("sync", "async"):
+            results[stack] = await run_stack(
+                client, f"/{stack}/{user_id}", requests, concurrency
+            )
+    await async_engine.dispose()
+    engine.dispose()
+    return results
+
+
+def run_benchmark(user_id: int = 1, requests: int = 1000, concurrency: int = 10):
+    results = asyncio.run(run(user_id, requests, concurrency))
+    print(f"{'stack':<8}{'req/s':>10}{'p50 (ms)':>12}{'p95 (ms)':>12}")
+    for stack, result in results.items():
+        print(
+            f"{stack:<8}"
+            f"{result['throughput']:>10.1f}"
+            f"{result['p50']:>12.2f}"
+            f"{result['p95']:>12.2f}"
+        )
+    return results
@@ -0,0 +1,93 @@
+"""
+Compara el costo de crear los clientes de Cloud Storage y Pub/Sub en cada
+petición, como se hacía antes, contra reutilizar los clientes compartidos
+del proceso (`src.core.gcp.clients`).
+
+Se mide:
+- El inicio: el tiempo de `warm_up_clients` (solo con `--network`).
+- Por petición sin red: leer las credenciales y construir los dos clientes
+  contra obtener los clientes compartidos.
+- Por petición con red (`--network`): consultar los metadatos de un archivo
+  del bucket VIDEOS_BUCKET con un cliente nuevo (token y conexión TLS nuevos)
+  contra el cliente compartido.
+
+Usa las credenciales configuradas en GCP_CREDENTIALS_BASE64.
+
+Uso:
+    poetry run python manage.py benchmark-gcp --requests 50 --network
+"""
+
+import base64
+import json
+import statistics
+import time
+from typing import Callable
+
+from google.cloud import pubsub_v1, storage  # type: ignore
+from google.oauth2.service_account import Credentials  # type: ignore
+
+from src.core.gcp import clients
+from src.settings.base import settings
+
+
+def create_clients() -> tuple[storage.Client, pubsub_v1.PublisherClient]:
+    # Lo que hacían GCPCloudStorage y PubSubPublisher en cada uso
+    account_info = json.loads(base64.b64decode(settings.GCP_CREDENTIALS_BASE64))
+    credentials = Credentials.from_service_account_info(account_info)
+    storage_client = storage.Client(
+        project=settings.GCP_PROJECT_ID, credentials=credentials
+    )
+    publisher = pubsub_v1.PublisherClient(credentials=credentials)
+    return storage_client, publisher
+
+
+def measure(func: Callable, requests: int) -> dict:
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def run_benchmark(requests: int = 50, network: bool = False) -> dict:
+    results = {}
+    if network:
+        start = time.perf_counter()
+        timings = clients.warm_up_clients()
+        print(f"Inicio: {(time.perf_counter() - start) * 1000:.1f} ms")
+        for step, value in timings.items():
+            print(f"  {step:<20}{value * 1000:>10.1f} ms")
+
+    def new_clients():
+        storage_client, publisher = create_clients()
+        publisher.transport.close()
+        return storage_client
+
+    def shared_clients():
+        clients.get_publisher_client()
+        return clients.get_storage_client()
+
+    results["new clients"] = measure(new_clients, requests)
+    results["shared clients"] = measure(shared_clients, requests)
+    if network:
+
+        def metadata(get_client: Callable) -> Callable:
+            def call():
+                bucket = get_client().bucket(settings.VIDEOS_BUCKET)
+                bucket.blob(".warm-up").exists()
+
+            return call
+
+        results["new clients + GET"] = measure(metadata(new_clients), requests)
+        results["shared clients + GET"] = measure(metadata(shared_clients), requests)
+    clients.close_clients()
+
+    print(f"{'mode':<24}{'p50 (ms)':>12}{'p95 (ms)':>12}")
+    for mode, result in results.items():
+        print(f"{mode:<24}{result['p50']:>12.2f}{result['p95']:>12.2f}")
+    return results
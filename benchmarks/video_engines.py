@@ -0,0 +1,65 @@
+"""
+Compara el tiempo de ejecución y el pico de memoria (RSS) de los motores de
+procesamiento de video sobre un archivo local.
+
+Cada ejecución corre en un proceso nuevo para que la memoria reportada
+corresponda solo al motor evaluado. Se reporta el RSS del proceso de Python y
+el máximo RSS de los procesos hijos (ffmpeg).
+
+Uso:
+    poetry run python manage.py benchmark-engines <ruta_video> --repeat 3
+"""
+
+import multiprocessing
+import os
+import resource
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.apps.tasks.processing import ENGINES, render_video
+
+
+def run_engine(engine: str, source_path: str) -> dict:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        destination_path = os.path.join(temp_dir, f"{engine}.mp4")
+        start_wall = time.perf_counter()
+        render_video(source_path, destination_path, engine=engine)
+        wall_time = time.perf_counter() - start_wall
+    usage_self = resource.getrusage(resource.RUSAGE_SELF)
+    usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        "wall_time": wall_time,
+        "cpu_time": usage_self.ru_utime
+        + usage_self.ru_stime
+        + usage_children.ru_utime
+        + usage_children.ru_stime,
+        # ru_maxrss se reporta en KiB en Linux
+        "python_rss_mb": usage_self.ru_maxrss / 1024,
+        "children_rss_mb": usage_children.ru_maxrss / 1024,
+    }
+
+
+def run_benchmark(source_path: str, repeat: int = 1, engines: list | None = None):
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for engine in engines or list(ENGINES):
+        runs = []
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                runs.append(pool.submit(run_engine, engine, source_path).result())
+        results[engine] = runs
+
+    header = f"{'engine':<10}{'wall (s)':>12}{'cpu (s)':>12}"
+    header += f"{'python RSS (MB)':>18}{'ffmpeg RSS (MB)':>18}"
+    print(header)
+    for engine, runs in results.items():
+        print(
+            f"{engine:<10}"
+            f"{statistics.median(r['wall_time'] for r in runs):>12.2f}"
+            f"{statistics.median(r['cpu_time'] for r in runs):>12.2f}"
+            f"{max(r['python_rss_mb'] for r in runs):>18.1f}"
+            f"{max(r['children_rss_mb'] for r in runs):>18.1f}"
+        )
+    return results
@@ -0,0 +1,45 @@
+import os
+
+from locust import HttpUser, between, task
+
+
+class ReadEndpointsUser(HttpUser):
+    """
+    Escenario de lectura para comparar el throughput de dos despliegues, por
+    ejemplo el acceso síncrono y el asíncrono a la base de datos:
+
+        locust -f locust/read_endpoints.py --host http://localhost:9000
+
+    Las credenciales se leen de LOCUST_USERNAME y LOCUST_PASSWORD.
+    """
+
+    wait_time = between(0.1, 0.5)
+
+    def on_start(self):
+        payload = {
+            "username": os.environ.get("LOCUST_USERNAME", "dukkegei"),
+            "password": os.environ.get("LOCUST_PASSWORD", "abcd1234"),
+        }
+        response = self.client.post("/api/auth/login", json=payload)
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        self.task_ids = []
+
+    @task(3)
+    def get_tasks(self):
+        response = self.client.get("/api/tasks?max=20", headers=self.headers)
+        if response.ok:
+            self.task_ids = [task["id"] for task in response.json()]
+
+    @task(2)
+    def get_task(self):
+        if self.task_ids:
+            self.client.get(
+                f"/api/tasks/{self.task_ids[0]}",
+                headers=self.headers,
+                name="/api/tasks/[id]",
+            )
+
+    @task(1)
+    def get_videos(self):
+        self.client.get("/api/videos?max=20", headers=self.headers)
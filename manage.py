@@ -175,6 +175,36 @@ def run_locust():
     )
 
 
+@app.command()
+def benchmark_engines(source: str, repeat: int = 1):
+    """
+    Comando para comparar tiempo y memoria de los motores de procesamiento de video
+    """
+    from benchmarks.video_engines import run_benchmark
+
+    run_benchmark(source_path=source, repeat=repeat)
+
+
+@app.command()
+def benchmark_db(user_id: int = 1, requests: int = 1000, concurrency: int = 10):
+    """
+    Comando para comparar el throughput del acceso síncrono y asíncrono a la base de datos
+    """
+    from benchmarks.database_stacks import run_benchmark
+
+    run_benchmark(user_id=user_id, requests=requests, concurrency=concurrency)
+
+
+@app.command()
+def benchmark_gcp(requests: int = 50, network: bool = False):
+    """
+    Comando para comparar la creación de clientes de GCP por petición contra los clientes compartidos
+    """
+    from benchmarks.gcp_clients import run_benchmark
+
+    run_benchmark(requests=requests, network=network)
+
+
 @app.command()
 def pre_commit():
     """
@@ -1,23 +1,30 @@
 import logging
 import re
+from datetime import datetime, timezone
 
-import jwt
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy import or_, select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.apps.auth.hashing import get_server_timing, password_hashing_pool
+from src.apps.auth.models import RefreshToken
 from src.apps.auth.schemas import (
     LoginInputSchema,
     LoginOutputSchema,
+    RefreshInputSchema,
     SignupInputSchema,
     SignupOutputSchema,
 )
-from src.apps.auth.utils import encrypt_password, validate_password
+from src.apps.auth.utils import (
+    create_tokens,
+    encrypt_password,
+    hash_refresh_token,
+    validate_password,
+)
 from src.apps.commons.exceptions import CustomException
 from src.apps.commons.schemas import BaseErrorSchema, UnexpectedErrorSchema
 from src.apps.users.models import User
-from src.core.database.dependencies import get_db
-from src.settings.base import settings
+from src.core.database.dependencies import get_async_db
 
 logger = logging.getLogger(__name__)
 
@@ -43,9 +50,14 @@ METADATA = {
             "description": "Unexpected error response",
             "model": UnexpectedErrorSchema,
         },
+        503: {"description": "Busy server response", "model": BaseErrorSchema},
     },
 )
-async def login(body: LoginInputSchema, session: Session = Depends(get_db)):
+async def login(
+    body: LoginInputSchema,
+    response: Response,
+    session: AsyncSession = Depends(get_async_db),
+):
     """
     Permite iniciar sesión y obtener el token de autorización para consumir los
     recursos del API, suministrando el nombre de usuario y la contraseña de
@@ -56,26 +68,87 @@ async def login(body: LoginInputSchema, session: Session = Depends(get_db)):
         query = select(User).where(User.email == body.username)
     else:
         query = select(User).where(User.username == body.username)
-    user = session.execute(query).scalars().first()
+    user = (await session.execute(query)).scalars().first()
     if user is None:
         raise CustomException(
             error="error_auth",
             message="Usuario no encontrado",
             status_code=404,
         )
-    is_valid_password = validate_password(body.password, user.password)
+    is_valid_password, timing = await password_hashing_pool.run(
+        validate_password, body.password, user.password
+    )
+    response.headers["Server-Timing"] = get_server_timing(timing)
     if not is_valid_password:
         raise CustomException(
             error="error_auth",
             message="Credenciales inválidas",
             status_code=403,
         )
-    token = jwt.encode(
-        {"id": user.id, "email": user.email, "username": user.username},
-        settings.SECRET_KEY,
-        algorithm="HS256",
+    tokens = create_tokens(session, user)
+    await session.commit()
+    return tokens.model_dump()
+
+
+@router.post(
+    "/refresh",
+    response_model=LoginOutputSchema,
+    responses={
+        401: {"description": "Unauthorized response", "model": BaseErrorSchema},
+        500: {
+            "description": "Unexpected error response",
+            "model": UnexpectedErrorSchema,
+        },
+    },
+)
+async def refresh(
+    body: RefreshInputSchema, session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Permite obtener un nuevo token de acceso a partir del token de
+    actualización entregado al iniciar sesión, sin verificar de nuevo la
+    contraseña. Cada token de actualización se usa una sola vez y se reemplaza
+    por uno nuevo; si se presenta un token ya usado se revocan todos los
+    tokens del usuario.
+    """
+    now = datetime.now(timezone.utc)
+    query = (
+        select(RefreshToken, User)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(RefreshToken.token_hash == hash_refresh_token(body.refresh_token))
+        .with_for_update(of=RefreshToken)
     )
-    return LoginOutputSchema(access_token=token).model_dump()
+    row = (await session.execute(query)).first()
+    if row is None:
+        raise CustomException(
+            error="error_auth",
+            message="Token de actualización inválido",
+            status_code=401,
+        )
+    refresh_token, user = row
+    if refresh_token.revoked_at is not None:
+        # El token ya fue usado, por lo que pudo haber sido robado
+        await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user.id, RefreshToken.revoked_at == None)
+            .values(revoked_at=now)
+        )
+        await session.commit()
+        raise CustomException(
+            error="error_auth",
+            message="Token de actualización inválido",
+            status_code=401,
+        )
+    if refresh_token.expires_at <= now or not user.is_active:
+        raise CustomException(
+            error="error_auth",
+            message="Token de actualización expirado",
+            status_code=401,
+        )
+    refresh_token.revoked_at = now
+    tokens = create_tokens(session, user)
+    await session.commit()
+    return tokens.model_dump()
 
 
 @router.post(
@@ -87,9 +160,14 @@ async def login(body: LoginInputSchema, session: Session = Depends(get_db)):
             "description": "Unexpected error response",
             "model": UnexpectedErrorSchema,
         },
+        503: {"description": "Busy server response", "model": BaseErrorSchema},
     },
 )
-async def create_user(body: SignupInputSchema, session: Session = Depends(get_db)):
+async def create_user(
+    body: SignupInputSchema,
+    response: Response,
+    session: AsyncSession = Depends(get_async_db),
+):
     """
     Permite crear una cuenta con los campos para nombre de usuario, correo
     electrónico y contraseña. El nombre y el correo electrónico deben ser
@@ -101,7 +179,7 @@ async def create_user(body: SignupInputSchema, session: Session = Depends(get_db
     query = select(User).where(
         or_(User.username == body.username, User.email == body.email)
     )
-    user = session.execute(query).scalars().first()
+    user = (await session.execute(query)).scalars().first()
 
     if user:
         raise CustomException(
@@ -110,10 +188,13 @@ async def create_user(body: SignupInputSchema, session: Session = Depends(get_db
             status_code=400,
         )
 
-    hashed_password = encrypt_password(password=body.password1)
+    hashed_password, timing = await password_hashing_pool.run(
+        encrypt_password, body.password1
+    )
+    response.headers["Server-Timing"] = get_server_timing(timing)
     user = User(username=body.username, email=body.email, password=hashed_password)
     session.add(user)
-    session.commit()
+    await session.commit()
 
     return SignupOutputSchema(
         message="Usuario creado exitosamente",
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.apps.commons.exceptions import CustomException
+from src.settings.base import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashingPool:
+    """
+    Ejecuta el hashing de contraseñas (PBKDF2) en un pool de hilos dedicado,
+    para no bloquear el event loop durante las iteraciones. hashlib libera el
+    GIL al calcular el hash, por lo que los hilos se ejecutan en paralelo.
+
+    Las llamadas en espera están limitadas por PASSWORD_HASHING_MAX_PENDING;
+    cuando el pool está saturado se rechazan de inmediato con un error 503 en
+    lugar de acumular peticiones.
+    """
+
+    def __init__(self, workers: int | None = None, max_pending: int | None = None):
+        self.workers = workers or settings.PASSWORD_HASHING_WORKERS or os.cpu_count()
+        self.max_pending = max_pending or settings.PASSWORD_HASHING_MAX_PENDING
+        self.executor: ThreadPoolExecutor | None = None
+        self.pending = 0
+        self.stats = {"calls": 0, "rejected": 0, "wait_time": 0.0, "run_time": 0.0}
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hashing"
+            )
+        return self.executor
+
+    async def run(self, func: Callable, *args) -> tuple[Any, dict]:
+        """
+        Ejecuta una función de hashing en el pool.
+
+        Args:
+            func (Callable): Función de hashing, por ejemplo `validate_password`.
+            *args: Argumentos de la función.
+
+        Returns:
+            tuple[Any, dict]: Resultado de la función y tiempos de la llamada en
+            milisegundos: espera en la cola (`wait`) y cálculo (`run`).
+
+        Raises:
+            CustomException: Si hay demasiadas llamadas en espera.
+        """
+        # El contador solo se modifica desde el event loop
+        if self.pending >= self.max_pending:
+            self.stats["rejected"] += 1
+            raise CustomException(
+                error="error_busy",
+                message="El servidor está ocupado, intente nuevamente",
+                status_code=503,
+            )
+        self.pending += 1
+        queued_at = time.perf_counter()
+        started_at = None
+
+        def call():
+            nonlocal started_at
+            started_at = time.perf_counter()
+            return func(*args)
+
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.get_executor(), call)
+        finally:
+            self.pending -= 1
+        finished_at = time.perf_counter()
+        timing = {
+            "wait": (started_at - queued_at) * 1000,
+            "run": (finished_at - started_at) * 1000,
+        }
+        self.stats["calls"] += 1
+        self.stats["wait_time"] += timing["wait"]
+        self.stats["run_time"] += timing["run"]
+        logger.debug(
+            f"{func.__name__}: espera {timing['wait']:.1f} ms, "
+            f"cálculo {timing['run']:.1f} ms, en cola {self.pending}"
+        )
+        return result, timing
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+
+def get_server_timing(timing: dict) -> str:
+    """
+    Genera el valor del header `Server-Timing` con los tiempos del hashing.
+    """
+    return f"hash_wait;dur={timing['wait']:.1f}, hash;dur={timing['run']:.1f}"
+
+
+password_hashing_pool = PasswordHashingPool()
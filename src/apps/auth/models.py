@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Optional
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database.base import Base
+from src.core.database.mixins.id import IntegerIdMixin
+from src.core.database.mixins.timestamp import TimestampMixin
+
+
+class RefreshToken(IntegerIdMixin, TimestampMixin, Base):
+    __tablename__ = "refresh_tokens"
+    user_id: Mapped[int] = mapped_column(sa.ForeignKey("users.id"), index=True)
+    # Solo se guarda el SHA-256 del token, que se consulta por igualdad
+    token_hash: Mapped[str] = mapped_column(sa.String(64), unique=True)
+    expires_at: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True))
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(sa.DateTime(timezone=True))
@@ -27,6 +27,13 @@ class LoginInputSchema(BaseModel):
 
 class LoginOutputSchema(BaseModel):
     access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class RefreshInputSchema(BaseModel):
+    refresh_token: str
 
 
 class SignupInputSchema(BaseModel):
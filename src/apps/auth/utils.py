@@ -3,12 +3,22 @@ import hashlib
 import hmac
 import logging
 import os
+import secrets
+from datetime import datetime, timedelta, timezone
 
 import jwt
 from fastapi import Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.apps.auth.models import RefreshToken
+from src.apps.auth.schemas import LoginOutputSchema
 from src.apps.commons.exceptions import CustomException
+from src.apps.users.cache import user_cache
+from src.apps.users.models import User
+from src.apps.users.schemas import CurrentUserSchema
+from src.core.database.dependencies import get_async_db
 from src.settings.base import settings
 
 logger = logging.getLogger(__name__)
@@ -89,6 +99,53 @@ def validate_password(password, stored_password):
     return hmac.compare_digest(hashed_password, stored_hash)
 
 
+def hash_refresh_token(token: str) -> str:
+    """
+    Obtiene el SHA-256 de un token de actualización. El token es aleatorio y
+    de alta entropía, por lo que no requiere un hash lento como PBKDF2.
+    """
+    return hashlib.sha256(token.encode("ascii")).hexdigest()
+
+
+def create_tokens(session: AsyncSession, user: User) -> LoginOutputSchema:
+    """
+    Genera un token de acceso de corta duración y un token de actualización,
+    del cual se guarda solo el hash en la sesión indicada. El commit queda a
+    cargo de quien llama.
+
+    Args:
+        session (AsyncSession): Sesión de la base de datos.
+        user (User): Usuario autenticado.
+
+    Returns:
+        LoginOutputSchema: Tokens generados.
+    """
+    now = datetime.now(timezone.utc)
+    expires_in = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    access_token = jwt.encode(
+        {
+            "id": user.id,
+            "email": user.email,
+            "username": user.username,
+            "iat": now,
+            "exp": now + timedelta(seconds=expires_in),
+        },
+        settings.SECRET_KEY,
+        algorithm="HS256",
+    )
+    refresh_token = secrets.token_urlsafe(32)
+    session.add(
+        RefreshToken(
+            user_id=user.id,
+            token_hash=hash_refresh_token(refresh_token),
+            expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return LoginOutputSchema(
+        access_token=access_token, refresh_token=refresh_token, expires_in=expires_in
+    )
+
+
 async def get_authorization_header(
     request: Request,
     bearer: HTTPAuthorizationCredentials = Depends(HTTPBearer(auto_error=False)),
@@ -118,3 +175,30 @@ async def get_authorization_header(
             error="auth_error", message="Token invalido", status_code=401
         )
     return payload
+
+
+async def get_current_user(
+    session: AsyncSession = Depends(get_async_db),
+    jwt_payload: dict = Depends(get_authorization_header),
+) -> CurrentUserSchema:
+    """
+    Obtiene el usuario activo de la petición autenticada. El usuario se
+    consulta en la base de datos solo si no está en el caché.
+
+    Raises:
+        CustomException: Si el usuario no existe o no está activo.
+    """
+    user = await user_cache.get(jwt_payload["id"])
+    if user is not None:
+        return user
+    query = select(User).where(User.id == jwt_payload["id"], User.is_active == True)
+    db_user = (await session.execute(query)).scalars().first()
+    if not db_user:
+        raise CustomException(
+            error="error_user",
+            message="Usuario no encontrado",
+            status_code=404,
+        )
+    user = CurrentUserSchema.model_validate(db_user)
+    await user_cache.set(user)
+    return user
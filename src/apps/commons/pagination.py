@@ -0,0 +1,117 @@
+import base64
+import binascii
+import json
+
+from fastapi import Request, Response
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.apps.commons.exceptions import CustomException
+from src.settings.base import settings
+
+NEXT = "next"
+PREV = "prev"
+
+
+def encode_cursor(id: int, direction: str) -> str:
+    """
+    Genera un cursor opaco a partir del id de un registro.
+
+    Args:
+        id (int): Id del registro desde el que continúa la página.
+        direction (str): `next` para los registros posteriores o `prev` para
+            los anteriores.
+
+    Returns:
+        str: Cursor codificado en base64.
+    """
+    data = json.dumps({"id": id, "direction": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int, str]:
+    """
+    Interpreta un cursor generado con `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor codificado en base64.
+
+    Returns:
+        tuple[int, str]: Id del registro y dirección de la página.
+
+    Raises:
+        CustomException: Si el cursor no es válido.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        id, direction = data["id"], data["direction"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        id, direction = None, None
+    if not isinstance(id, int) or direction not in (NEXT, PREV):
+        raise CustomException(
+            error="error_cursor",
+            message="Cursor de paginación inválido",
+            status_code=400,
+        )
+    return id, direction
+
+
+async def paginate(
+    session: AsyncSession,
+    query: Select,
+    column: InstrumentedAttribute,
+    request: Request,
+    response: Response,
+    limit: int,
+    order: int = 0,
+    cursor: str | None = None,
+) -> list:
+    """
+    Pagina una consulta por keyset sobre una columna única, de forma que
+    cualquier página cuesta lo mismo que la primera, y agrega a la respuesta
+    el header `Link` con los enlaces `next` y `prev` que existan.
+
+    Args:
+        session (AsyncSession): Sesión de la base de datos.
+        query (Select): Consulta con los filtros de la página, sin orden.
+        column (InstrumentedAttribute): Columna única por la que se ordena.
+        request (Request): Petición, usada para construir los enlaces.
+        response (Response): Respuesta a la que se agrega el header `Link`.
+        limit (int): Tamaño de la página, limitado por `PAGINATION_MAX_PAGE_SIZE`.
+        order (int): 0 para orden ascendente, cualquier otro para descendente.
+        cursor (str | None): Cursor de la página, obtenido de un enlace.
+
+    Returns:
+        list: Registros de la página en el orden solicitado.
+
+    Raises:
+        CustomException: Si el cursor no es válido.
+    """
+    limit = min(max(limit, 1), settings.PAGINATION_MAX_PAGE_SIZE)
+    ascending = order == 0
+    id, direction = decode_cursor(cursor) if cursor else (None, NEXT)
+    # La página anterior se consulta en el orden inverso y luego se invierte
+    forward = ascending == (direction == NEXT)
+    if id is not None:
+        query = query.where(column > id if forward else column < id)
+    query = query.order_by(column.asc() if forward else column.desc())
+    items = (await session.execute(query.limit(limit + 1))).scalars().all()
+    has_more = len(items) > limit
+    items = items[:limit]
+    if direction == PREV:
+        items.reverse()
+
+    links = []
+    if items:
+        if (direction == NEXT and has_more) or direction == PREV:
+            links.append((encode_cursor(getattr(items[-1], column.key), NEXT), NEXT))
+        if (direction == PREV and has_more) or (direction == NEXT and id is not None):
+            links.append((encode_cursor(getattr(items[0], column.key), PREV), PREV))
+    if links:
+        response.headers["Link"] = ", ".join(
+            f'<{request.url.include_query_params(cursor=value, max=limit)}>; rel="{rel}"'
+            for value, rel in links
+        )
+    return items
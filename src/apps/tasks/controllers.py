@@ -3,28 +3,54 @@ import os
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, UploadFile
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 
-from src.apps.auth.utils import get_authorization_header
+from src.apps.auth.utils import get_current_user
 from src.apps.commons.exceptions import CustomException
+from src.apps.commons.pagination import paginate
 from src.apps.commons.schemas import BaseErrorSchema, UnexpectedErrorSchema
-from src.apps.tasks.models import Task, TaskStatusEnum
+from src.apps.tasks.events import (
+    build_task_event,
+    get_notify_statement,
+    stream_task_events,
+)
+from src.apps.tasks.models import (
+    IN_FLIGHT_STATUSES,
+    Task,
+    TaskOutboxEvent,
+    TaskStatusEnum,
+)
+from src.apps.tasks.outbox import task_outbox_relay
 from src.apps.tasks.schemas import (
     CreateTaskOutputSchema,
+    CreateUploadInputSchema,
+    CreateUploadOutputSchema,
     DeleteTaskOutputSchema,
+    FinalizeUploadInputSchema,
     GetAllTaskOutputSchema,
+    GetTaskMetricOutputSchema,
     GetTaskOutputSchema,
+    GetTaskProgressOutputSchema,
     GetTaskVideoOutputSchema,
 )
 from src.apps.tasks.tasks import process_video
-from src.apps.users.models import User
+from src.apps.users.schemas import CurrentUserSchema
 from src.apps.videos.models import Video
-from src.core.database.dependencies import get_db
-from src.core.gcp.cloud_storage.base import GCPCloudStorage
+from src.apps.videos.utils import (
+    check_media_info,
+    check_video_filename,
+    get_content_hash,
+    probe_upload,
+)
+from src.core.database.dependencies import get_async_db
+from src.core.gcp.executor import AsyncCloudStorage
 from src.core.gcp.pubsub.handlers import PubSubEvents
-from src.core.gcp.pubsub.publisher import PubSubPublisher
+from src.core.media.mp4 import Mp4Error
 from src.settings.base import settings
 
 logger = logging.getLogger(__name__)
@@ -49,30 +75,23 @@ METADATA = {
     },
 )
 async def get_tasks(
+    request: Request,
+    response: Response,
     max: int = 10,
     order: int = 0,
-    session: Session = Depends(get_db),
-    jwt_payload: dict = Depends(get_authorization_header),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_async_db),
+    user: CurrentUserSchema = Depends(get_current_user),
 ):
     """
     Permite recuperar todas las tareas de edición de un usuario autorizado en
-    la aplicación.
+    la aplicación. Las páginas siguiente y anterior se obtienen con los
+    enlaces del header `Link`.
     """
-    query = select(User).where(User.id == jwt_payload["id"], User.is_active == True)
-    user = session.execute(query).scalars().first()
-    if not user:
-        raise CustomException(
-            error="error_user",
-            message="Usuario no encontrado",
-            status_code=404,
-        )
     query = select(Task).where(Task.user_id == user.id, Task.is_active == True)
-    if order == 0:
-        query = query.order_by(Task.id.asc())
-    else:
-        query = query.order_by(Task.id.desc())
-    query = query.limit(max)
-    tasks = session.execute(query).scalars().all()
+    tasks = await paginate(
+        session, query, Task.id, request, response, max, order, cursor
+    )
     return [
         GetAllTaskOutputSchema(
             id=task.id,
@@ -89,6 +108,34 @@ async def get_tasks(
     ]
 
 
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}},
+        404: {"description": "Not found response", "model": BaseErrorSchema},
+        500: {
+            "description": "Unexpected error response",
+            "model": UnexpectedErrorSchema,
+        },
+    },
+)
+async def get_task_events(
+    request: Request,
+    user: CurrentUserSchema = Depends(get_current_user),
+):
+    """
+    Permite recibir, mediante Server-Sent Events, los cambios de estado y de
+    progreso de las tareas de un usuario autorizado, sin consultar
+    periódicamente las tareas.
+    """
+    return StreamingResponse(
+        stream_task_events(request, user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/{task_id}",
     response_model=GetTaskOutputSchema,
@@ -102,25 +149,23 @@ async def get_tasks(
 )
 async def get_tasks(
     task_id: int,
-    session: Session = Depends(get_db),
-    jwt_payload: dict = Depends(get_authorization_header),
+    session: AsyncSession = Depends(get_async_db),
+    user: CurrentUserSchema = Depends(get_current_user),
 ):
     """
     Permite recuperar la información de una tarea concreta perteneciente a un
     usuario, para lo cual se requiere autorización.
     """
-    query = select(User).where(User.id == jwt_payload["id"], User.is_active == True)
-    user = session.execute(query).scalars().first()
-    if not user:
-        raise CustomException(
-            error="error_user",
-            message="Usuario no encontrado",
-            status_code=404,
+    query = (
+        select(Task)
+        .where(Task.user_id == user.id, Task.id == task_id, Task.is_active == True)
+        .options(
+            joinedload(Task.original_video),
+            joinedload(Task.processed_video),
+            selectinload(Task.metrics),
         )
-    query = select(Task).where(
-        Task.user_id == user.id, Task.id == task_id, Task.is_active == True
     )
-    task = session.execute(query).scalars().first()
+    task = (await session.execute(query)).scalars().first()
     if not task:
         raise CustomException(
             error="error_task",
@@ -149,6 +194,23 @@ async def get_tasks(
             if task.processed_video
             else None
         ),
+        metrics=[
+            GetTaskMetricOutputSchema(
+                stage=metric.stage,
+                wall_time=metric.wall_time,
+                cpu_time=metric.cpu_time,
+            )
+            for metric in task.metrics
+        ],
+        progress=(
+            GetTaskProgressOutputSchema(
+                percent=task.progress,
+                stage=task.progress_stage,
+                eta=task.progress_eta,
+            )
+            if task.progress_stage
+            else None
+        ),
         status=task.status.value,
         created_at=task.created_at,
         updated_at=task.updated_at,
@@ -156,6 +218,118 @@ async def get_tasks(
     )
 
 
+async def get_upload_task(
+    session: AsyncSession, user: CurrentUserSchema, video_uuid: str
+) -> Task | None:
+    query = select(Task).where(Task.task_id == video_uuid, Task.user_id == user.id)
+    return (await session.execute(query)).scalars().first()
+
+
+async def start_video_task(
+    session: AsyncSession, user: CurrentUserSchema, video: Video, video_uuid: str
+) -> CreateTaskOutputSchema:
+    """
+    Crea la tarea de edición de un video ya guardado en Cloud Storage y, en
+    la misma transacción, el evento para procesarlo que publica el relay de
+    eventos. Si el video ya fue procesado en otra tarea, la nueva tarea apunta
+    al video procesado sin volver a procesarlo; si se está procesando en otra
+    tarea, la nueva tarea queda en espera y el worker la completa junto con
+    esa tarea.
+
+    Args:
+        session (AsyncSession): Sesión de la base de datos.
+        user (CurrentUserSchema): Usuario dueño de la tarea.
+        video (Video): Video original, ya agregado a la sesión.
+        video_uuid (str): Identificador de la tarea.
+
+    Returns:
+        CreateTaskOutputSchema: Tarea creada.
+    """
+    # Crear tarea
+    task = Task(
+        task_id=video_uuid,
+        user_id=user.id,
+        original_video_id=video.id,
+        processed_video_id=None,
+    )
+    session.add(task)
+    await session.flush()
+    # Si el video se está procesando en otra tarea no se publica otro evento,
+    # el worker completa también esta tarea. La fila de la tarea en proceso
+    # queda bloqueada hasta confirmar la transacción, de forma que el worker
+    # no la puede completar antes de que esta tarea sea visible para él; si
+    # la completa primero, la consulta ya no la encuentra
+    query = (
+        select(Task.id)
+        .where(
+            Task.original_video_id == video.id,
+            Task.status.in_(IN_FLIGHT_STATUSES),
+            Task.id != task.id,
+        )
+        .order_by(Task.id.desc())
+        .limit(1)
+        .with_for_update()
+    )
+    in_flight_task_id = (await session.execute(query)).scalars().first()
+    if in_flight_task_id:
+        task.status = TaskStatusEnum.UPLOADED
+        await session.execute(get_notify_statement(build_task_event(task)))
+        await session.commit()
+        logger.info(
+            f"Tarea {task.id} asociada a la tarea en proceso {in_flight_task_id}"
+        )
+        return CreateTaskOutputSchema(
+            id=task.id,
+            task_id=task.task_id,
+            message="Tarea creada exitosamente",
+        )
+    # Si el video ya fue procesado la tarea apunta al video procesado sin
+    # volver a procesarlo
+    query = (
+        select(Task)
+        .where(
+            Task.original_video_id == video.id,
+            Task.status == TaskStatusEnum.PROCESSED,
+            Task.processed_video_id.is_not(None),
+        )
+        .order_by(Task.id.desc())
+    )
+    processed_task = (await session.execute(query)).scalars().first()
+    if processed_task:
+        task.processed_video_id = processed_task.processed_video_id
+        task.status = TaskStatusEnum.PROCESSED
+        await session.execute(get_notify_statement(build_task_event(task)))
+        await session.commit()
+        logger.info(
+            f"Tarea {task.id} asociada al video procesado {task.processed_video_id}"
+        )
+        return CreateTaskOutputSchema(
+            id=task.id,
+            task_id=task.task_id,
+            message="Tarea creada exitosamente",
+        )
+    # El evento de Pub/Sub se guarda en la misma transacción que la tarea y el
+    # relay lo publica después, fuera de la petición
+    # response = process_video.apply_async((video.id, task.id), task_id=task.task_id)
+    session.add(
+        TaskOutboxEvent(
+            task_id=task.id,
+            event_type=PubSubEvents.PROCESS_VIDEO,
+            payload={"video_id": video.id, "task_id": task.id},
+        )
+    )
+    task.status = TaskStatusEnum.UPLOADED
+    await session.execute(get_notify_statement(build_task_event(task)))
+    await session.commit()
+    task_outbox_relay.wake()
+    logger.info(f"Tarea creada {task.id}")
+    return CreateTaskOutputSchema(
+        id=task.id,
+        task_id=task.task_id,
+        message="Tarea creada exitosamente",
+    )
+
+
 @router.post(
     "",
     response_model=CreateTaskOutputSchema,
@@ -170,79 +344,176 @@ async def get_tasks(
 )
 async def create_task(
     file: UploadFile,
-    session: Session = Depends(get_db),
-    jwt_payload: dict = Depends(get_authorization_header),
+    session: AsyncSession = Depends(get_async_db),
+    user: CurrentUserSchema = Depends(get_current_user),
 ):
     """
     Permite crear una nueva tarea de edición de video. El usuario requiere
     autorización.
     """
-    query = select(User).where(User.id == jwt_payload["id"], User.is_active == True)
-    user = session.execute(query).scalars().first()
-    if not user:
-        raise CustomException(
-            error="error_user",
-            message="Usuario no encontrado",
-            status_code=404,
-        )
     # Crear directorio para guardar el video
     video_uuid = str(uuid.uuid4())
-    valid_extensions = ["mp4"]
-    file_extension = file.filename.split(".")[-1]
-    if not file_extension:
-        raise CustomException(
-            error="error_video",
-            message="Extension de video no encontrada",
-            status_code=400,
+    check_video_filename(file.filename)
+    # Validar el video leyendo solo la cabecera del archivo. La lectura del
+    # archivo ocurre en un hilo para no bloquear el event loop
+    media_info = await run_in_threadpool(probe_upload, file)
+    # Buscar un video con el mismo contenido subido previamente por el
+    # usuario, en cuyo caso se reutiliza en lugar de subirlo de nuevo
+    content_hash = await run_in_threadpool(get_content_hash, file.file)
+    query = (
+        select(Video)
+        .join(Task, Task.original_video_id == Video.id)
+        .where(
+            Video.user_id == user.id,
+            Video.content_hash == content_hash,
+            Video.is_active == True,
         )
-    if file_extension not in valid_extensions:
-        raise CustomException(
-            error="error_video",
-            message="Formato de video no permitido",
-            status_code=400,
+        .order_by(Video.id.desc())
+    )
+    video = (await session.execute(query)).scalars().first()
+    if video:
+        logger.info(f"Video repetido, se reutiliza el video {video.id}")
+    else:
+        # Guardar video
+        client = AsyncCloudStorage()
+        public_url = await client.upload_file(
+            bucket_name=settings.VIDEOS_BUCKET,
+            file=file.file,
+            destination_path=f"{video_uuid}/{file.filename}",
         )
-    # Guardar video
-    client = GCPCloudStorage()
-    public_url = client.upload_file(
+        logger.info(f"Video guardado en {video_uuid}/{file.filename}")
+        video = Video(
+            title=f"""video {user.username} {datetime.now().strftime("%d_%m_%Y")}""",
+            user_id=user.id,
+            filename=file.filename,
+            url=f"{video_uuid}/{file.filename}",
+            score=None,
+            content_hash=content_hash,
+            **media_info.model_dump(),
+        )
+        session.add(video)
+        await session.flush()
+    return await start_video_task(session, user, video, video_uuid)
+
+
+@router.post(
+    "/uploads",
+    response_model=CreateUploadOutputSchema,
+    responses={
+        400: {"description": "Unsuccesful response", "model": BaseErrorSchema},
+        500: {
+            "description": "Unexpected error response",
+            "model": UnexpectedErrorSchema,
+        },
+    },
+)
+async def create_upload(
+    data: CreateUploadInputSchema,
+    request: Request,
+    user: CurrentUserSchema = Depends(get_current_user),
+):
+    """
+    Inicia la subida de un video directamente a Cloud Storage, sin pasar por
+    la API. El cliente sube el video con la URL obtenida, siguiendo el
+    protocolo de subidas reanudables de Cloud Storage, y luego crea la tarea
+    con `POST /api/tasks/uploads/{video_uuid}`. El usuario requiere
+    autorización.
+    """
+    filename = os.path.basename(data.filename)
+    check_video_filename(filename)
+    video_uuid = str(uuid.uuid4())
+    client = AsyncCloudStorage()
+    upload_url = await client.create_upload_session(
         bucket_name=settings.VIDEOS_BUCKET,
-        file=file.file,
-        destination_path=f"{video_uuid}/{file.filename}",
+        destination_path=f"{video_uuid}/{filename}",
+        content_type="video/mp4",
+        size=data.size,
+        origin=request.headers.get("origin"),
+        # El dueño queda en los metadatos del archivo para validarlo al
+        # finalizar la subida
+        metadata={"user_id": str(user.id)},
     )
-    logger.info(f"Video guardado en {video_uuid}/{file.filename}")
+    logger.info(f"Subida iniciada en {video_uuid}/{filename}")
+    return CreateUploadOutputSchema(video_uuid=video_uuid, upload_url=upload_url)
+
+
+@router.post(
+    "/uploads/{video_uuid}",
+    response_model=CreateTaskOutputSchema,
+    responses={
+        400: {"description": "Unsuccesful response", "model": BaseErrorSchema},
+        404: {"description": "Not found response", "model": BaseErrorSchema},
+        500: {
+            "description": "Unexpected error response",
+            "model": UnexpectedErrorSchema,
+        },
+    },
+)
+async def finalize_upload(
+    video_uuid: str,
+    data: FinalizeUploadInputSchema,
+    session: AsyncSession = Depends(get_async_db),
+    user: CurrentUserSchema = Depends(get_current_user),
+):
+    """
+    Crea la tarea de edición de un video subido con `POST /api/tasks/uploads`.
+    Se valida que el video exista en Cloud Storage, que pertenezca al usuario
+    y que sea un video válido leyendo solo su cabecera. Si la subida ya fue
+    finalizada se retorna la tarea existente. El usuario requiere
+    autorización.
+    """
+    filename = os.path.basename(data.filename)
+    check_video_filename(filename)
+    task = await get_upload_task(session, user, video_uuid)
+    if task:
+        return CreateTaskOutputSchema(
+            id=task.id, task_id=task.task_id, message="Tarea creada exitosamente"
+        )
+    client = AsyncCloudStorage()
+    cloud_path = f"{video_uuid}/{filename}"
+    blob = await client.get_file(
+        bucket_name=settings.VIDEOS_BUCKET, source_path=cloud_path
+    )
+    if not blob or (blob.metadata or {}).get("user_id") != str(user.id):
+        raise CustomException(
+            error="error_video",
+            message="Video no encontrado",
+            status_code=404,
+        )
+    try:
+        media_info = await client.probe_file(
+            bucket_name=settings.VIDEOS_BUCKET,
+            source_path=cloud_path,
+            size=blob.size,
+            generation=blob.generation,
+            max_size=settings.VIDEO_PROBE_MAX_BYTES,
+        )
+    except Mp4Error as e:
+        logger.info(f"Video {cloud_path} inválido: {e}")
+        media_info = None
+    media_info = check_media_info(media_info)
+
+    # Se bloquea la subida hasta el fin de la transacción para que dos
+    # peticiones simultáneas no creen dos tareas
+    await session.execute(select(func.pg_advisory_xact_lock(func.hashtext(video_uuid))))
+    task = await get_upload_task(session, user, video_uuid)
+    if task:
+        return CreateTaskOutputSchema(
+            id=task.id, task_id=task.task_id, message="Tarea creada exitosamente"
+        )
     video = Video(
         title=f"""video {user.username} {datetime.now().strftime("%d_%m_%Y")}""",
         user_id=user.id,
-        filename=file.filename,
-        url=f"{video_uuid}/{file.filename}",
+        filename=filename,
+        url=cloud_path,
         score=None,
+        # El contenido no pasa por la API, por lo que no se calcula su hash
+        content_hash=None,
+        **media_info.model_dump(),
     )
     session.add(video)
-    session.flush()
-    # Crear tarea
-    task = Task(
-        task_id=video_uuid,
-        user_id=user.id,
-        original_video_id=video.id,
-        processed_video_id=None,
-    )
-    session.add(task)
-    session.flush()
-    session.commit()
-    logger.info(f"Registro de tarea creado {task.id}")
-    client = PubSubPublisher()
-    response = client.run(
-        data={"video_id": video.id, "task_id": task.id},
-        event_type=PubSubEvents.PROCESS_VIDEO,
-    )
-    # response = process_video.apply_async((video.id, task.id), task_id=task.task_id)
-    logger.info(f"Tarea creada {response}")
-    task.status = TaskStatusEnum.UPLOADED
-    session.commit()
-    return CreateTaskOutputSchema(
-        id=task.id,
-        task_id=task.task_id,
-        message="Tarea creada exitosamente",
-    )
+    await session.flush()
+    return await start_video_task(session, user, video, video_uuid)
 
 
 @router.delete(
@@ -259,23 +530,15 @@ async def create_task(
 )
 async def delete_task(
     task_id: int,
-    session: Session = Depends(get_db),
-    jwt_payload: dict = Depends(get_authorization_header),
+    session: AsyncSession = Depends(get_async_db),
+    user: CurrentUserSchema = Depends(get_current_user),
 ):
     """
     Permite eliminar una tarea en la aplicación. El usuario requiere
     autorización.
     """
-    query = select(User).where(User.id == jwt_payload["id"], User.is_active == True)
-    user = session.execute(query).scalars().first()
-    if not user:
-        raise CustomException(
-            error="error_user",
-            message="Usuario no encontrado",
-            status_code=404,
-        )
     query = select(Task).where(Task.user_id == user.id, Task.id == task_id)
-    task = session.execute(query).scalars().first()
+    task = (await session.execute(query)).scalars().first()
     if not task:
         raise CustomException(
             error="error_task",
@@ -289,7 +552,7 @@ async def delete_task(
             status_code=400,
         )
     task.is_active = False
-    session.commit()
+    await session.commit()
     return DeleteTaskOutputSchema(
         message="Tarea eliminada exitosamente",
         id=task.id,
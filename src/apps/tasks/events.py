@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import select
+import threading
+from collections import defaultdict
+from typing import AsyncIterator
+
+import psycopg2
+from fastapi import Request
+from sqlalchemy import Select, func, select
+
+from src.apps.tasks.models import Task
+from src.apps.tasks.schemas import GetTaskProgressOutputSchema, TaskEventSchema
+from src.settings.base import settings
+
+logger = logging.getLogger(__name__)
+
+# Canal de Postgres en el que se publican los cambios de las tareas
+TASK_EVENTS_CHANNEL = "task_events"
+
+
+def build_task_event(task: Task) -> TaskEventSchema:
+    return TaskEventSchema(
+        id=task.id,
+        task_id=task.task_id,
+        user_id=task.user_id,
+        status=task.status.value if task.status else None,
+        processed_video_id=task.processed_video_id,
+        progress=(
+            GetTaskProgressOutputSchema(
+                percent=task.progress,
+                stage=task.progress_stage,
+                eta=task.progress_eta,
+            )
+            if task.progress_stage
+            else None
+        ),
+    )
+
+
+def get_notify_statement(event: TaskEventSchema) -> Select:
+    """
+    Genera la consulta que publica el evento de una tarea con NOTIFY. Postgres
+    entrega la notificación solo cuando la transacción actual se confirma, por
+    lo que se debe ejecutar antes del commit que guarda el cambio.
+
+    Args:
+        event (TaskEventSchema): Evento de la tarea.
+
+    Returns:
+        Select: Consulta a ejecutar en la sesión o conexión de la transacción.
+    """
+    return select(func.pg_notify(TASK_EVENTS_CHANNEL, event.model_dump_json()))
+
+
+def notify_task_event(connection, event: TaskEventSchema) -> None:
+    """
+    Publica el evento de una tarea en una sesión o conexión síncrona. Las
+    sesiones asíncronas ejecutan `get_notify_statement` directamente.
+
+    Args:
+        connection: Sesión o conexión de SQLAlchemy.
+        event (TaskEventSchema): Evento de la tarea.
+    """
+    connection.execute(get_notify_statement(event))
+
+
+def get_listener_connection_args() -> dict:
+    return {
+        "host": settings.DB_SOCKET_DIR or settings.DB_HOST,
+        "port": settings.DB_PORT,
+        "user": settings.DB_USER,
+        "password": settings.DB_PASSWORD,
+        "dbname": settings.DB_NAME,
+    }
+
+
+class TaskEventHub:
+    """
+    Distribuye los eventos de las tareas a los clientes suscritos.
+
+    Una sola conexión por proceso escucha el canal de Postgres en un hilo y
+    entrega cada evento a las colas de los suscriptores del usuario dueño de
+    la tarea. El hilo inicia con el primer suscriptor. Las colas tienen un
+    tamaño máximo y, si un cliente no las consume, se descartan los eventos
+    más antiguos.
+    """
+
+    def __init__(self):
+        self.subscribers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+        self.lock = threading.Lock()
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+        self.stopped = threading.Event()
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=settings.TASK_EVENTS_QUEUE_SIZE)
+        with self.lock:
+            self.loop = asyncio.get_running_loop()
+            self.subscribers[user_id].add(queue)
+            if self.thread is None or not self.thread.is_alive():
+                self.stopped.clear()
+                self.thread = threading.Thread(
+                    target=self.listen, name="task-events", daemon=True
+                )
+                self.thread.start()
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        with self.lock:
+            self.subscribers[user_id].discard(queue)
+            if not self.subscribers[user_id]:
+                del self.subscribers[user_id]
+
+    def dispatch(self, payload: str) -> None:
+        """
+        Entrega un evento recibido del canal a los suscriptores de su usuario.
+        Se llama desde el hilo que escucha el canal.
+        """
+        try:
+            event = TaskEventSchema.model_validate_json(payload)
+        except ValueError as e:
+            logger.warning(f"Evento de tarea inválido: {e}")
+            return
+        with self.lock:
+            queues = list(self.subscribers.get(event.user_id, ()))
+            loop = self.loop
+        for queue in queues:
+            loop.call_soon_threadsafe(self.put, queue, event)
+
+    @staticmethod
+    def put(queue: asyncio.Queue, event: TaskEventSchema) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    def listen(self) -> None:
+        while not self.stopped.is_set():
+            connection = None
+            try:
+                connection = psycopg2.connect(**get_listener_connection_args())
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {TASK_EVENTS_CHANNEL}")
+                logger.info(f"Escuchando el canal {TASK_EVENTS_CHANNEL}")
+                while not self.stopped.is_set():
+                    # Se revisa periódicamente si el hub se detuvo
+                    if select.select([connection], [], [], 1) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self.dispatch(connection.notifies.pop(0).payload)
+            except Exception as e:
+                logger.error(f"Error en el canal {TASK_EVENTS_CHANNEL}: {e}")
+                self.stopped.wait(settings.TASK_EVENTS_RECONNECT_DELAY)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+
+
+task_event_hub = TaskEventHub()
+
+
+async def stream_task_events(request: Request, user_id: int) -> AsyncIterator[str]:
+    """
+    Genera los eventos de las tareas de un usuario en formato Server-Sent
+    Events hasta que el cliente se desconecta.
+
+    Args:
+        request (Request): Petición del cliente.
+        user_id (int): Id del usuario dueño de las tareas.
+
+    Yields:
+        str: Mensajes SSE con los eventos, o comentarios para mantener viva la
+        conexión cuando no hay eventos.
+    """
+    queue = task_event_hub.subscribe(user_id)
+    try:
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), timeout=settings.TASK_EVENTS_HEARTBEAT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: task\nid: {event.id}\ndata: {event.model_dump_json()}\n\n"
+    finally:
+        task_event_hub.unsubscribe(user_id, queue)
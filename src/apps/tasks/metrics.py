@@ -0,0 +1,56 @@
+import logging
+import resource
+import time
+from contextlib import contextmanager
+
+from src.apps.tasks.models import TaskMetric
+
+logger = logging.getLogger(__name__)
+
+
+def get_cpu_time() -> float:
+    """
+    Obtiene el tiempo de CPU (usuario y sistema) consumido por el proceso y
+    por los procesos hijos que ya terminaron, como ffmpeg.
+    """
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+class StageTimer:
+    """
+    Mide el tiempo real y el tiempo de CPU de cada etapa del procesamiento de
+    una tarea.
+    """
+
+    def __init__(self):
+        self.metrics: list[TaskMetric] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        wall_start = time.perf_counter()
+        cpu_start = get_cpu_time()
+        try:
+            yield
+        finally:
+            metric = TaskMetric(
+                stage=name,
+                wall_time=time.perf_counter() - wall_start,
+                cpu_time=get_cpu_time() - cpu_start,
+            )
+            logger.info(
+                f"Etapa {name}: {metric.wall_time:.3f} s reales, "
+                f"{metric.cpu_time:.3f} s de CPU"
+            )
+            self.metrics.append(metric)
+
+    def discard(self, name: str) -> None:
+        """
+        Descarta la última medición de una etapa, por ejemplo cuando la etapa
+        no se completó y el trabajo se repite de otra forma.
+        """
+        for index in range(len(self.metrics) - 1, -1, -1):
+            if self.metrics[index].stage == name:
+                del self.metrics[index]
+                return
@@ -1,3 +1,4 @@
+from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
@@ -17,25 +18,52 @@ if TYPE_CHECKING:
 class TaskStatusEnum(Enum):
     PENDING = "pending"
     UPLOADED = "uploaded"
+    PROCESSING = "processing"
     PROCESSED = "processed"
     FAILURE = "failure"
 
 
+# Estados de una tarea cuyo video está en cola o en proceso
+IN_FLIGHT_STATUSES = (TaskStatusEnum.UPLOADED, TaskStatusEnum.PROCESSING)
+
+
 class Task(IntegerIdMixin, TimestampMixin, IsActiveMixin, Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Listados de tareas activas de un usuario y de videos procesados,
+        # ordenados por id. El estado es un parámetro de la consulta, por lo
+        # que se indexa como columna y no como condición del índice parcial
+        sa.Index(
+            "ix_tasks_user_id_id_active",
+            "user_id",
+            "id",
+            postgresql_where=sa.text("is_active"),
+        ),
+        sa.Index(
+            "ix_tasks_status_id_active",
+            "status",
+            "id",
+            postgresql_where=sa.text("is_active"),
+        ),
+    )
     task_id: Mapped[Optional[str]]
     user_id: Mapped[int] = mapped_column(sa.ForeignKey("users.id"))
     user: Mapped["User"] = relationship(back_populates="tasks")
-    original_video_id: Mapped[Optional[int]] = mapped_column(sa.ForeignKey("videos.id"))
+    original_video_id: Mapped[Optional[int]] = mapped_column(
+        sa.ForeignKey("videos.id"), index=True
+    )
     original_video: Mapped["Video"] = relationship(
         "Video", foreign_keys=[original_video_id], back_populates="tasks_as_original"
     )
     processed_video_id: Mapped[Optional[int]] = mapped_column(
-        sa.ForeignKey("videos.id")
+        sa.ForeignKey("videos.id"), index=True
     )
     processed_video: Mapped["Video"] = relationship(
         "Video", foreign_keys=[processed_video_id], back_populates="tasks_as_processed"
     )
+    metrics: Mapped[list["TaskMetric"]] = relationship(
+        back_populates="task", order_by="TaskMetric.id"
+    )
     status: Mapped[TaskStatusEnum] = mapped_column(
         sa.Enum(
             TaskStatusEnum,
@@ -45,3 +73,47 @@ class Task(IntegerIdMixin, TimestampMixin, IsActiveMixin, Base):
         ),
         default=TaskStatusEnum.PENDING,
     )
+    # Progreso reportado por el worker: porcentaje de la etapa actual y
+    # tiempo restante estimado en segundos
+    progress: Mapped[Optional[float]]
+    progress_stage: Mapped[Optional[str]]
+    progress_eta: Mapped[Optional[float]]
+    # Última señal del worker que procesa la tarea, una tarea en proceso sin
+    # señales recientes se considera abandonada
+    heartbeat_at: Mapped[Optional[datetime]]
+
+
+class TaskMetric(IntegerIdMixin, TimestampMixin, Base):
+    __tablename__ = "task_metrics"
+    task_id: Mapped[int] = mapped_column(sa.ForeignKey("tasks.id"), index=True)
+    task: Mapped["Task"] = relationship(back_populates="metrics")
+    stage: Mapped[str]
+    # Tiempos en segundos, el tiempo de CPU incluye los procesos hijos (ffmpeg)
+    wall_time: Mapped[float]
+    cpu_time: Mapped[float]
+
+
+class TaskOutboxEvent(IntegerIdMixin, TimestampMixin, Base):
+    """
+    Eventos de Pub/Sub de las tareas pendientes de publicar. Se guardan en la
+    misma transacción que la tarea y el relay de la API los publica, de forma
+    que un evento no se pierde aunque el proceso termine antes de publicarlo.
+    """
+
+    __tablename__ = "task_outbox_events"
+    __table_args__ = (
+        # El relay solo consulta los eventos pendientes, en orden de creación
+        sa.Index(
+            "ix_task_outbox_events_id_pending",
+            "id",
+            postgresql_where=sa.text("published_at IS NULL"),
+        ),
+    )
+    task_id: Mapped[int] = mapped_column(sa.ForeignKey("tasks.id"), index=True)
+    event_type: Mapped[str]
+    payload: Mapped[Dict[str, Any]]
+    published_at: Mapped[Optional[datetime]]
+    attempts: Mapped[int] = mapped_column(default=0, server_default="0")
+    last_error: Mapped[Optional[str]]
+    # Un evento que falló no se reintenta antes de este momento
+    next_attempt_at: Mapped[Optional[datetime]]
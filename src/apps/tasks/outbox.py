@@ -0,0 +1,151 @@
+import logging
+import threading
+from concurrent.futures import Future
+from datetime import timedelta
+from typing import Callable
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from src.apps.tasks.models import IN_FLIGHT_STATUSES, Task, TaskOutboxEvent
+from src.apps.tasks.tasks import fail_task
+from src.core.database.base import session as session_factory
+from src.core.gcp.pubsub.publisher import PubSubPublisher
+from src.settings.base import settings
+
+logger = logging.getLogger(__name__)
+
+
+def publish_event(data: dict, event_type: str) -> Future:
+    return PubSubPublisher().publish(data, event_type)
+
+
+class TaskOutboxRelay:
+    """
+    Publica en Pub/Sub los eventos guardados en `task_outbox_events`.
+
+    Un hilo toma los eventos pendientes en lotes de TASK_OUTBOX_BATCH_SIZE,
+    los publica todos sin esperar y luego espera las confirmaciones, de forma
+    que el cliente de Pub/Sub los envía agrupados. Los eventos se bloquean con
+    `FOR UPDATE SKIP LOCKED`, por lo que varios procesos de la API pueden
+    correr el relay sin publicar dos veces el mismo lote. Un evento que falla
+    se reintenta después de TASK_OUTBOX_RETRY_DELAY segundos, duplicando la
+    espera en cada intento; tras TASK_OUTBOX_MAX_ATTEMPTS intentos se descarta
+    y su tarea se marca como fallida. Si el proceso termina después de
+    publicar y antes de confirmar, el evento se publica de nuevo, por lo que
+    la entrega es al menos una vez.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[dict, str], Future] = publish_event,
+        session_factory: Callable[[], Session] = session_factory,
+    ):
+        self.publish = publish
+        self.session_factory = session_factory
+        self.thread: threading.Thread | None = None
+        self.stopped = threading.Event()
+        self.pending = threading.Event()
+
+    def relay_batch(self, session: Session) -> int:
+        """
+        Publica un lote de eventos pendientes y confirma la transacción.
+
+        Args:
+            session (Session): Sesión de la base de datos.
+
+        Returns:
+            int: Cantidad de eventos publicados.
+        """
+        query = (
+            select(TaskOutboxEvent)
+            .where(
+                TaskOutboxEvent.published_at.is_(None),
+                TaskOutboxEvent.attempts < settings.TASK_OUTBOX_MAX_ATTEMPTS,
+                or_(
+                    TaskOutboxEvent.next_attempt_at.is_(None),
+                    TaskOutboxEvent.next_attempt_at <= func.now(),
+                ),
+            )
+            .order_by(TaskOutboxEvent.id)
+            .limit(settings.TASK_OUTBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        events = session.execute(query).scalars().all()
+        futures = []
+        for event in events:
+            try:
+                futures.append((event, self.publish(event.payload, event.event_type)))
+            except Exception as e:
+                self.mark_failed(session, event, e)
+        published = 0
+        for event, future in futures:
+            try:
+                future.result(timeout=settings.TASK_OUTBOX_PUBLISH_TIMEOUT)
+            except Exception as e:
+                self.mark_failed(session, event, e)
+                continue
+            event.published_at = func.now()
+            published += 1
+        session.commit()
+        if events:
+            logger.info(f"Publicados {published} de {len(events)} eventos de tareas")
+        return published
+
+    @staticmethod
+    def mark_failed(session: Session, event: TaskOutboxEvent, error: Exception) -> None:
+        """
+        Registra el error de un evento y programa su siguiente intento. Si se
+        agotaron los intentos, la tarea del evento y las tareas que la
+        esperaban se marcan como fallidas.
+        """
+        logger.warning(f"Error al publicar el evento {event.id}: {error}")
+        event.attempts += 1
+        event.last_error = str(error)
+        if event.attempts < settings.TASK_OUTBOX_MAX_ATTEMPTS:
+            delay = settings.TASK_OUTBOX_RETRY_DELAY * 2 ** (event.attempts - 1)
+            event.next_attempt_at = func.now() + timedelta(seconds=delay)
+            return
+        logger.error(f"Evento {event.id} descartado tras {event.attempts} intentos")
+        task = session.get(Task, event.task_id)
+        if task is None or task.status not in IN_FLIGHT_STATUSES:
+            return
+        fail_task(session, task)
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            self.pending.clear()
+            try:
+                with self.session_factory() as session:
+                    published = self.relay_batch(session)
+            except Exception as e:
+                logger.error(f"Error en el relay de eventos de tareas: {e}")
+                published = 0
+            # Si el lote estaba lleno quedan eventos pendientes, se continúa
+            # sin esperar
+            if published < settings.TASK_OUTBOX_BATCH_SIZE:
+                self.pending.wait(settings.TASK_OUTBOX_POLL_INTERVAL)
+
+    def wake(self) -> None:
+        """
+        Avisa al relay que hay eventos nuevos para publicarlos sin esperar al
+        siguiente intervalo de consulta.
+        """
+        self.pending.set()
+
+    def start(self) -> None:
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name="task-outbox", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.pending.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+
+
+task_outbox_relay = TaskOutboxRelay()
@@ -0,0 +1,933 @@
+import logging
+import os
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import BinaryIO, Callable, Iterable, Iterator
+
+from moviepy.editor import (
+    ColorClip,
+    CompositeVideoClip,
+    ImageClip,
+    VideoFileClip,
+    concatenate_videoclips,
+)
+from moviepy.video.fx.all import resize
+from proglog import ProgressBarLogger
+
+from src.core.gcp.cloud_storage.base import GCPCloudStorage
+from src.core.media.ffmpeg import get_keyframe_times, probe_media, run_ffmpeg
+from src.core.media.mp4 import HEAD_READ_SIZE, Mp4Error, get_faststart_header_size
+from src.core.media.schemas import MediaInfo
+from src.settings.base import settings
+
+logger = logging.getLogger(__name__)
+
+# Recibe la fracción (entre 0 y 1) de la edición completada
+ProgressCallback = Callable[[float], None]
+
+# Parámetros de la edición que se aplica a todos los videos
+TRIM_DURATION = 20
+FADE_OUT_DURATION = 0.5
+BUMPER_DURATION = 3
+LOGO_DURATION = 2
+BUMPER_FADE_IN_DURATION = 1
+OUTPUT_FPS = 24
+OUTPUT_AUDIO_SAMPLE_RATE = 44100
+LOGO_PATH = f"{os.getcwd()}/statics/logo_256.png"
+
+# Perfil de codificación compartido por el video y la pantalla negra, requerido
+# para unirlos sin recodificar
+ENCODING_PROFILE = (
+    f"libx264_high_yuv420p_{OUTPUT_FPS}fps_aac_{OUTPUT_AUDIO_SAMPLE_RATE}"
+)
+VIDEO_ENCODING_ARGS = [
+    "-c:v",
+    "libx264",
+    "-profile:v",
+    "high",
+    "-pix_fmt",
+    "yuv420p",
+    "-r",
+    str(OUTPUT_FPS),
+    "-video_track_timescale",
+    "12288",
+]
+AUDIO_ENCODING_ARGS = [
+    "-c:a",
+    "aac",
+    "-ar",
+    str(OUTPUT_AUDIO_SAMPLE_RATE),
+    "-ac",
+    "2",
+]
+ENCODING_ARGS = [*VIDEO_ENCODING_ARGS, *AUDIO_ENCODING_ARGS]
+AUDIO_FORMAT_FILTER = (
+    f"aformat=sample_fmts=fltp:sample_rates={OUTPUT_AUDIO_SAMPLE_RATE}"
+    ":channel_layouts=stereo"
+)
+
+
+class MoviepyProgressLogger(ProgressBarLogger):
+    """
+    Reporta el progreso de la escritura de los cuadros de moviepy.
+    """
+
+    def __init__(self, on_progress: ProgressCallback):
+        super().__init__()
+        self.on_progress = on_progress
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        # La barra "t" corresponde a los cuadros de video, "chunk" al audio
+        total = self.bars[bar].get("total")
+        if bar == "t" and attr == "index" and total:
+            self.on_progress(min(value / total, 1.0))
+
+
+def render_with_moviepy(
+    source_path: str,
+    destination_path: str,
+    info: MediaInfo | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> None:
+    """
+    Edita el video decodificando cada cuadro en Python con moviepy.
+
+    Args:
+        source_path (str): Ruta del video original.
+        destination_path (str): Ruta donde se escribe el video procesado.
+        info (MediaInfo | None): No se usa, moviepy obtiene la información del
+            video al abrirlo.
+        on_progress (ProgressCallback | None): Recibe la fracción de cuadros
+            escritos.
+    """
+    video = VideoFileClip(source_path)
+    # Recortar video a 20 segundos
+    video = video.subclip(0, TRIM_DURATION)
+    # Redimensionar video a un formato de 16:9
+    video = resize(video, height=video.w * 9 / 16)
+    # Crear una pantalla negra (ColorClip) con la misma resolución que el video
+    black_screen = ColorClip(size=video.size, color=(0, 0, 0), duration=BUMPER_DURATION)
+    # Cargar el logo
+    logo = ImageClip(LOGO_PATH, duration=LOGO_DURATION)
+    # Colocar el logo en el centro de la pantalla negra
+    logo_on_black = CompositeVideoClip([black_screen, logo.set_position("center")])
+    # Aplica una transición de fadeout de 0.5 segundo al video
+    video_with_transition = video.crossfadeout(FADE_OUT_DURATION)
+    # Aplica una transición de fadein de 1 segundo a la pantalla negra con el logo
+    logo_on_black_with_transition = logo_on_black.crossfadein(BUMPER_FADE_IN_DURATION)
+    # Combinar el video recortado con la pantalla negra y el logo
+    final_clip = concatenate_videoclips(
+        [video_with_transition, logo_on_black_with_transition], method="compose"
+    )
+    final_clip.write_videofile(
+        destination_path,
+        codec="libx264",
+        fps=OUTPUT_FPS,
+        logger=MoviepyProgressLogger(on_progress) if on_progress else "bar",
+    )
+
+
+def get_ffmpeg_progress(
+    on_progress: ProgressCallback | None, duration: float
+) -> Callable[[float], None] | None:
+    """
+    Convierte el progreso de ffmpeg, en segundos de salida escritos, a la
+    fracción de un video de la duración indicada.
+    """
+    if on_progress is None:
+        return None
+    return lambda seconds: on_progress(min(seconds / duration, 1.0))
+
+
+def get_output_size(width: int, height: int) -> tuple[int, int]:
+    """
+    Calcula la resolución de salida replicando el redimensionamiento de
+    moviepy (alto igual a 9/16 del ancho conservando la proporción), ajustada
+    a valores pares como lo exige el formato yuv420p.
+
+    Args:
+        width (int): Ancho del video original.
+        height (int): Alto del video original.
+
+    Returns:
+        tuple[int, int]: Ancho y alto del video procesado.
+    """
+    output_height = width * 9 / 16
+    output_width = width * output_height / height
+    return max(int(output_width) // 2 * 2, 2), max(int(output_height) // 2 * 2, 2)
+
+
+def build_main_video_filter(
+    width: int, height: int, fade_start: float | None, input_label: str = "0:v"
+) -> str:
+    """
+    Construye el filtro que redimensiona el video original y aplica la
+    transición de salida. El resultado queda en la salida `[main]`.
+
+    Args:
+        width (int): Ancho del video procesado.
+        height (int): Alto del video procesado.
+        fade_start (float | None): Segundo en el que inicia la transición de
+            salida, o None si el segmento no la incluye.
+        input_label (str): Etiqueta de la entrada de video.
+
+    Returns:
+        str: Filtro del filtergraph.
+    """
+    fade = (
+        f"fade=t=out:st={fade_start}:d={FADE_OUT_DURATION},"
+        if fade_start is not None
+        else ""
+    )
+    return (
+        f"[{input_label}]setpts=PTS-STARTPTS,scale={width}:{height},setsar=1,"
+        f"fps={OUTPUT_FPS},{fade}format=yuv420p[main]"
+    )
+
+
+def build_main_audio_filter(
+    duration: float, has_audio: bool, input_label: str = "0:a"
+) -> str:
+    """
+    Construye el filtro del audio del video original, o de un silencio si el
+    video no tiene audio. El resultado queda en la salida `[main_audio]`.
+
+    Args:
+        duration (float): Duración del segmento recortado del video original.
+        has_audio (bool): Indica si el video original tiene audio.
+        input_label (str): Etiqueta de la entrada de audio.
+
+    Returns:
+        str: Filtro del filtergraph.
+    """
+    if has_audio:
+        return (
+            f"[{input_label}]asetpts=PTS-STARTPTS,{AUDIO_FORMAT_FILTER},"
+            f"apad,atrim=duration={duration}[main_audio]"
+        )
+    return (
+        f"anullsrc=r={OUTPUT_AUDIO_SAMPLE_RATE}:cl=stereo,"
+        f"atrim=duration={duration},{AUDIO_FORMAT_FILTER}[main_audio]"
+    )
+
+
+def build_main_filters(
+    width: int, height: int, duration: float, has_audio: bool
+) -> list[str]:
+    """
+    Construye los filtros que recortan, redimensionan y aplican la transición
+    de salida al video original (entrada 0, ya recortada con `-t`). El
+    resultado queda en las salidas `[main]` y `[main_audio]`.
+
+    Args:
+        width (int): Ancho del video procesado.
+        height (int): Alto del video procesado.
+        duration (float): Duración del segmento recortado del video original.
+        has_audio (bool): Indica si el video original tiene audio.
+
+    Returns:
+        list[str]: Filtros del filtergraph.
+    """
+    fade_start = max(duration - FADE_OUT_DURATION, 0)
+    return [
+        build_main_video_filter(width, height, fade_start),
+        build_main_audio_filter(duration, has_audio),
+    ]
+
+
+def build_bumper_filters(width: int, height: int, logo_input: str) -> list[str]:
+    """
+    Construye los filtros de la pantalla negra con el logo centrado y su
+    transición de entrada. El resultado queda en las salidas `[bumper]` y
+    `[bumper_audio]`.
+
+    Args:
+        width (int): Ancho del video procesado.
+        height (int): Alto del video procesado.
+        logo_input (str): Etiqueta de la entrada del logo, por ejemplo `1:v`.
+
+    Returns:
+        list[str]: Filtros del filtergraph.
+    """
+    return [
+        f"color=c=black:s={width}x{height}:r={OUTPUT_FPS}:d={BUMPER_DURATION}"
+        "[black]",
+        f"[black][{logo_input}]overlay=x=(W-w)/2:y=(H-h)/2:eof_action=pass,"
+        f"fade=t=in:st=0:d={BUMPER_FADE_IN_DURATION},setsar=1,format=yuv420p"
+        "[bumper]",
+        f"anullsrc=r={OUTPUT_AUDIO_SAMPLE_RATE}:cl=stereo,"
+        f"atrim=duration={BUMPER_DURATION},{AUDIO_FORMAT_FILTER}[bumper_audio]",
+    ]
+
+
+def build_ffmpeg_filtergraph(
+    width: int, height: int, duration: float, has_audio: bool
+) -> str:
+    """
+    Construye el filtergraph de ffmpeg equivalente a la edición de moviepy.
+
+    La entrada 0 es el video original (ya recortado con `-t`) y la entrada 1
+    es el logo. El resultado queda en las salidas `[v]` y `[a]`.
+
+    Args:
+        width (int): Ancho del video procesado.
+        height (int): Alto del video procesado.
+        duration (float): Duración del segmento recortado del video original.
+        has_audio (bool): Indica si el video original tiene audio.
+
+    Returns:
+        str: Filtergraph para el argumento `-filter_complex`.
+    """
+    filters = [
+        *build_main_filters(width, height, duration, has_audio),
+        *build_bumper_filters(width, height, logo_input="1:v"),
+        "[main][main_audio][bumper][bumper_audio]concat=n=2:v=1:a=1[v][a]",
+    ]
+    return ";".join(filters)
+
+
+def get_logo_input_args() -> list[str]:
+    return [
+        "-loop",
+        "1",
+        "-framerate",
+        str(OUTPUT_FPS),
+        "-t",
+        str(LOGO_DURATION),
+        "-i",
+        LOGO_PATH,
+    ]
+
+
+def get_bumper_cache_dir() -> str:
+    return settings.VIDEO_BUMPER_CACHE_DIR or os.path.join(
+        tempfile.gettempdir(), "video_bumpers"
+    )
+
+
+def render_bumper(width: int, height: int, destination_path: str) -> None:
+    """
+    Codifica la pantalla negra con el logo con el mismo perfil de codificación
+    del video principal, de forma que ambos se puedan unir sin recodificar.
+
+    Args:
+        width (int): Ancho del video procesado.
+        height (int): Alto del video procesado.
+        destination_path (str): Ruta donde se escribe la pantalla negra.
+    """
+    filtergraph = ";".join(build_bumper_filters(width, height, logo_input="0:v"))
+    run_ffmpeg(
+        [
+            *get_logo_input_args(),
+            "-filter_complex",
+            filtergraph,
+            "-map",
+            "[bumper]",
+            "-map",
+            "[bumper_audio]",
+            *ENCODING_ARGS,
+            destination_path,
+        ]
+    )
+
+
+def get_bumper(width: int, height: int) -> str:
+    """
+    Obtiene la pantalla negra con el logo para una resolución. Se busca
+    primero en el caché local, luego en el bucket y, si no existe, se
+    codifica y se guarda en ambos. Un error con el bucket no detiene el
+    procesamiento, la pantalla negra se codifica localmente.
+
+    Args:
+        width (int): Ancho del video procesado.
+        height (int): Alto del video procesado.
+
+    Returns:
+        str: Ruta local de la pantalla negra codificada.
+    """
+    filename = f"bumper_{width}x{height}_{ENCODING_PROFILE}.mp4"
+    cache_dir = get_bumper_cache_dir()
+    bumper_path = os.path.join(cache_dir, filename)
+    if os.path.exists(bumper_path):
+        return bumper_path
+    os.makedirs(cache_dir, exist_ok=True)
+    # Se escribe en un archivo temporal para que otros procesos nunca lean
+    # una pantalla negra incompleta
+    temp_path = os.path.join(cache_dir, f".{uuid.uuid4()}_{filename}")
+    bucket_path = f"{settings.VIDEO_BUMPER_BUCKET_PREFIX}/{filename}"
+    client = None
+    downloaded = False
+    try:
+        try:
+            client = GCPCloudStorage()
+            if client.file_exists(
+                bucket_name=settings.VIDEOS_BUCKET, source_path=bucket_path
+            ):
+                logger.info(f"Descargando pantalla negra {bucket_path}")
+                client.download_file(
+                    bucket_name=settings.VIDEOS_BUCKET,
+                    source_path=bucket_path,
+                    destination_path=temp_path,
+                )
+                downloaded = True
+        except Exception as e:
+            logger.warning(f"Error al obtener la pantalla negra {bucket_path}: {e}")
+        if not downloaded:
+            logger.info(f"Generando pantalla negra {filename}")
+            render_bumper(width, height, temp_path)
+            if client:
+                try:
+                    client.upload_file(
+                        bucket_name=settings.VIDEOS_BUCKET,
+                        destination_path=bucket_path,
+                        file_path=temp_path,
+                    )
+                except Exception as e:
+                    # El caché local sigue disponible para este proceso
+                    logger.warning(
+                        f"Error al guardar la pantalla negra {bucket_path}: {e}"
+                    )
+        os.replace(temp_path, bumper_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return bumper_path
+
+
+def get_segment_bumper(width: int, height: int, destination_path: str) -> str:
+    """
+    Obtiene la pantalla negra que se une al segmento principal. Si el caché
+    está deshabilitado se codifica en `<destination_path>.bumper.mp4`, que se
+    debe eliminar al terminar.
+
+    Args:
+        width (int): Ancho del video procesado.
+        height (int): Alto del video procesado.
+        destination_path (str): Ruta del video procesado.
+
+    Returns:
+        str: Ruta local de la pantalla negra codificada.
+    """
+    if settings.VIDEO_BUMPER_CACHE_ENABLED:
+        return get_bumper(width, height)
+    bumper_path = f"{destination_path}.bumper.mp4"
+    render_bumper(width, height, bumper_path)
+    return bumper_path
+
+
+def concat_segments(segment_paths: list[str], destination_path: str) -> None:
+    """
+    Une segmentos codificados con el mismo perfil copiando los streams, sin
+    recodificar.
+
+    Args:
+        segment_paths (list[str]): Rutas de los segmentos en orden.
+        destination_path (str): Ruta del video resultante.
+    """
+    list_path = f"{destination_path}.txt"
+    with open(list_path, "w") as list_file:
+        for segment_path in segment_paths:
+            list_file.write(f"file '{os.path.abspath(segment_path)}'\n")
+    try:
+        run_ffmpeg(
+            [
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                list_path,
+                "-c",
+                "copy",
+                "-movflags",
+                "+faststart",
+                destination_path,
+            ]
+        )
+    finally:
+        os.remove(list_path)
+
+
+def get_cpu_budget() -> int:
+    """
+    Obtiene la cantidad de CPUs disponibles para un trabajo, considerando que
+    el worker procesa hasta PUBSUB_MAX_CONCURRENT_JOBS trabajos a la vez.
+    """
+    jobs = max(settings.PUBSUB_MAX_CONCURRENT_JOBS, 1)
+    return max((os.cpu_count() or 1) // jobs, 1)
+
+
+def get_encoding_workers() -> int:
+    return settings.VIDEO_ENCODING_WORKERS or get_cpu_budget()
+
+
+def plan_chunks(keyframes: list[float], duration: float) -> list[tuple[float, float]]:
+    """
+    Divide el segmento recortado en tramos que inician en un keyframe, de
+    forma que cada tramo se pueda codificar de forma independiente.
+
+    Args:
+        keyframes (list[float]): Tiempos de los keyframes del video original.
+        duration (float): Duración del segmento recortado.
+
+    Returns:
+        list[tuple[float, float]]: Inicio y fin de cada tramo.
+    """
+    target = max(duration / get_encoding_workers(), settings.VIDEO_MIN_CHUNK_DURATION)
+    boundaries = [0.0]
+    for keyframe in sorted(keyframes):
+        if (
+            keyframe - boundaries[-1] >= target
+            and duration - keyframe >= settings.VIDEO_MIN_CHUNK_DURATION
+        ):
+            boundaries.append(keyframe)
+    boundaries.append(duration)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def encode_chunk(
+    source_path: str,
+    destination_path: str,
+    start: float,
+    end: float,
+    width: int,
+    height: int,
+    fade_start: float | None,
+    threads: int,
+) -> None:
+    run_ffmpeg(
+        [
+            "-ss",
+            str(start),
+            "-t",
+            str(end - start),
+            "-i",
+            source_path,
+            "-filter_complex",
+            build_main_video_filter(width, height, fade_start),
+            "-map",
+            "[main]",
+            "-an",
+            *VIDEO_ENCODING_ARGS,
+            "-threads",
+            str(threads),
+            destination_path,
+        ]
+    )
+
+
+def encode_main_segment_chunked(
+    source_path: str,
+    destination_path: str,
+    chunks: list[tuple[float, float]],
+    width: int,
+    height: int,
+    duration: float,
+    has_audio: bool,
+    on_progress: ProgressCallback | None = None,
+) -> None:
+    """
+    Codifica en paralelo los tramos de video del segmento recortado, los une
+    sin recodificar y agrega el audio, que se codifica en un solo paso.
+
+    Args:
+        source_path (str): Ruta del video original.
+        destination_path (str): Ruta del segmento codificado.
+        chunks (list[tuple[float, float]]): Tramos alineados a keyframes.
+        width (int): Ancho del video procesado.
+        height (int): Alto del video procesado.
+        duration (float): Duración del segmento recortado.
+        has_audio (bool): Indica si el video original tiene audio.
+        on_progress (ProgressCallback | None): Recibe la fracción del
+            segmento codificada al terminar cada tramo.
+    """
+    workers = min(get_encoding_workers(), len(chunks))
+    threads = max(get_cpu_budget() // workers, 1)
+    fade_start = max(duration - FADE_OUT_DURATION, 0)
+    chunk_paths = [f"{destination_path}.{index}.mp4" for index in range(len(chunks))]
+    logger.info(f"Codificando {len(chunks)} tramos con {workers} procesos")
+    try:
+        # Cada tramo se codifica en su propio proceso de ffmpeg, los hilos
+        # solo esperan a que terminen
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    encode_chunk,
+                    source_path,
+                    chunk_path,
+                    start,
+                    end,
+                    width,
+                    height,
+                    # La transición de salida solo aplica al último tramo
+                    fade_start - start if end == duration else None,
+                    threads,
+                ): end
+                - start
+                for chunk_path, (start, end) in zip(chunk_paths, chunks)
+            }
+            encoded = 0
+            for future in as_completed(futures):
+                future.result()
+                encoded += futures[future]
+                if on_progress:
+                    on_progress(min(encoded / duration, 1.0))
+        list_path = f"{destination_path}.txt"
+        with open(list_path, "w") as list_file:
+            for chunk_path in chunk_paths:
+                list_file.write(f"file '{os.path.abspath(chunk_path)}'\n")
+        run_ffmpeg(
+            [
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                list_path,
+                "-t",
+                str(duration),
+                "-i",
+                source_path,
+                "-filter_complex",
+                build_main_audio_filter(duration, has_audio, input_label="1:a"),
+                "-map",
+                "0:v",
+                "-map",
+                "[main_audio]",
+                "-c:v",
+                "copy",
+                *AUDIO_ENCODING_ARGS,
+                destination_path,
+            ]
+        )
+    finally:
+        for path in [*chunk_paths, f"{destination_path}.txt"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def encode_main_segment(
+    source_path: str,
+    destination_path: str,
+    width: int,
+    height: int,
+    duration: float,
+    has_audio: bool,
+    input_chunks: Iterable[bytes] | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> None:
+    filtergraph = ";".join(build_main_filters(width, height, duration, has_audio))
+    run_ffmpeg(
+        [
+            "-t",
+            str(duration),
+            "-i",
+            source_path,
+            "-filter_complex",
+            filtergraph,
+            "-map",
+            "[main]",
+            "-map",
+            "[main_audio]",
+            *ENCODING_ARGS,
+            destination_path,
+        ],
+        input_chunks=input_chunks,
+        on_progress=get_ffmpeg_progress(on_progress, duration),
+    )
+
+
+def can_remux(info: MediaInfo, width: int, height: int) -> bool:
+    """
+    Indica si el video original ya cumple el formato de salida (H.264 perfil
+    High yuv420p a 24 fps, 16:9 y máximo 20 segundos), en cuyo caso su
+    stream de video se puede copiar sin recodificar. Los videos con rotación
+    se recodifican: sus cuadros tienen otras dimensiones que los de la
+    pantalla negra y la rotación aplicaría a toda la pista.
+
+    Args:
+        info (MediaInfo): Información del video original.
+        width (int): Ancho del video procesado.
+        height (int): Alto del video procesado.
+
+    Returns:
+        bool: True si el video se puede copiar.
+    """
+    return (
+        settings.VIDEO_REMUX_ENABLED
+        and info.video_codec == "h264"
+        and info.video_profile == "High"
+        and info.pixel_format == "yuv420p"
+        and not info.is_rotated
+        and info.fps is not None
+        and abs(info.fps - OUTPUT_FPS) < 0.01
+        and (info.width, info.height) == (width, height)
+        and info.duration is not None
+        and info.duration <= TRIM_DURATION
+    )
+
+
+def remux_main_segment(
+    source_path: str,
+    destination_path: str,
+    info: MediaInfo,
+    input_chunks: Iterable[bytes] | None = None,
+) -> None:
+    """
+    Copia el stream de video original sin recodificar. El audio se codifica,
+    o se genera un silencio si el video no tiene audio, recortado o
+    completado a la duración del video para que quede alineado con la
+    pantalla negra al unirlos.
+
+    Args:
+        source_path (str): Ruta del video original, o `pipe:0` si se lee de
+            `input_chunks`.
+        destination_path (str): Ruta del segmento resultante.
+        info (MediaInfo): Información del video original.
+        input_chunks (Iterable[bytes] | None): Bloques del video original que
+            se escriben en la entrada estándar de ffmpeg.
+    """
+    audio_filter = build_main_audio_filter(info.duration, info.has_audio)
+    run_ffmpeg(
+        [
+            "-i",
+            source_path,
+            "-map",
+            "0:v:0",
+            "-c:v",
+            "copy",
+            "-filter_complex",
+            audio_filter,
+            "-map",
+            "[main_audio]",
+            *AUDIO_ENCODING_ARGS,
+            "-video_track_timescale",
+            "12288",
+            destination_path,
+        ],
+        input_chunks=input_chunks,
+    )
+
+
+def render_probed_with_ffmpeg(
+    source_path: str,
+    destination_path: str,
+    info: MediaInfo,
+    input_chunks: Iterable[bytes] | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> None:
+    """
+    Edita con ffmpeg un video del que ya se conoce su información.
+
+    Si el video ya cumple el formato de salida se copia sin recodificar. Si
+    el caché de la pantalla negra está habilitado solo se codifica el
+    segmento del video original y se une con la pantalla negra
+    precodificada. Con la codificación por tramos habilitada el segmento se
+    divide en keyframes y los tramos se codifican en paralelo. En estos casos,
+    sin el caché, la pantalla negra se codifica para este video. En otro caso
+    toda la edición se hace en una sola invocación de ffmpeg.
+
+    Args:
+        source_path (str): Ruta del video original, o `pipe:0` si se lee de
+            `input_chunks`.
+        destination_path (str): Ruta donde se escribe el video procesado.
+        info (MediaInfo): Información del video original.
+        input_chunks (Iterable[bytes] | None): Bloques del video original que
+            se escriben en la entrada estándar de ffmpeg. Como la entrada no
+            se puede leer dos veces, se omite la codificación por tramos.
+        on_progress (ProgressCallback | None): Recibe la fracción de la
+            edición completada.
+    """
+    if not info.has_video or not info.width or not info.height:
+        raise ValueError("El archivo no contiene un stream de video")
+    duration = min(info.duration or TRIM_DURATION, TRIM_DURATION)
+    width, height = get_output_size(info.width, info.height)
+    if can_remux(info, width, height):
+        # El video ya cumple el formato de salida, solo se une con la
+        # pantalla negra. Se omite la transición de salida, que requeriría
+        # recodificar el video
+        logger.info("El video cumple el formato de salida, se copia sin recodificar")
+        main_path = f"{destination_path}.main.mp4"
+        try:
+            bumper_path = get_segment_bumper(width, height, destination_path)
+            remux_main_segment(source_path, main_path, info, input_chunks)
+            concat_segments([main_path, bumper_path], destination_path)
+            if on_progress:
+                on_progress(1.0)
+        finally:
+            for path in [main_path, f"{destination_path}.bumper.mp4"]:
+                if os.path.exists(path):
+                    os.remove(path)
+        return
+    chunks = []
+    if settings.VIDEO_CHUNKED_ENCODING_ENABLED and input_chunks is None:
+        chunks = plan_chunks(get_keyframe_times(source_path, duration), duration)
+    if len(chunks) < 2 and not settings.VIDEO_BUMPER_CACHE_ENABLED:
+        filtergraph = build_ffmpeg_filtergraph(width, height, duration, info.has_audio)
+        run_ffmpeg(
+            [
+                "-t",
+                str(duration),
+                "-i",
+                source_path,
+                *get_logo_input_args(),
+                "-filter_complex",
+                filtergraph,
+                "-map",
+                "[v]",
+                "-map",
+                "[a]",
+                *ENCODING_ARGS,
+                "-movflags",
+                "+faststart",
+                destination_path,
+            ],
+            input_chunks=input_chunks,
+            on_progress=get_ffmpeg_progress(on_progress, duration + BUMPER_DURATION),
+        )
+        return
+    main_path = f"{destination_path}.main.mp4"
+    try:
+        bumper_path = get_segment_bumper(width, height, destination_path)
+        if len(chunks) > 1:
+            encode_main_segment_chunked(
+                source_path,
+                main_path,
+                chunks,
+                width,
+                height,
+                duration,
+                info.has_audio,
+                on_progress=on_progress,
+            )
+        else:
+            encode_main_segment(
+                source_path,
+                main_path,
+                width,
+                height,
+                duration,
+                info.has_audio,
+                input_chunks=input_chunks,
+                on_progress=on_progress,
+            )
+        concat_segments([main_path, bumper_path], destination_path)
+    finally:
+        for path in [main_path, f"{destination_path}.bumper.mp4"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def render_with_ffmpeg(
+    source_path: str,
+    destination_path: str,
+    info: MediaInfo | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> None:
+    """
+    Edita el video con ffmpeg, sin pasar los cuadros por Python.
+
+    Args:
+        source_path (str): Ruta del video original.
+        destination_path (str): Ruta donde se escribe el video procesado.
+        info (MediaInfo | None): Información del video original. Si no se
+            indica se obtiene con ffmpeg.
+        on_progress (ProgressCallback | None): Recibe la fracción de la
+            edición completada.
+    """
+    info = info or probe_media(source_path)
+    render_probed_with_ffmpeg(source_path, destination_path, info, None, on_progress)
+
+
+def iter_reader_chunks(reader: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    while chunk := reader.read(chunk_size):
+        yield chunk
+
+
+def render_stream_with_ffmpeg(
+    reader: BinaryIO,
+    destination_path: str,
+    info: MediaInfo | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> bool:
+    """
+    Edita el video con ffmpeg leyéndolo por bloques desde un objeto tipo
+    archivo (por ejemplo, un archivo abierto en el bucket), de forma que la
+    decodificación inicia con el primer bloque y no se escribe el video
+    original en disco. Solo aplica a archivos MP4 con faststart, cuyos
+    metadatos están antes de las muestras.
+
+    Args:
+        reader (BinaryIO): Video original, debe permitir `seek`.
+        destination_path (str): Ruta donde se escribe el video procesado.
+        info (MediaInfo | None): Información del video original. Si no se
+            indica se obtiene de los metadatos al inicio del archivo.
+        on_progress (ProgressCallback | None): Recibe la fracción de la
+            edición completada.
+
+    Returns:
+        bool: False si el video no se puede procesar como un flujo continuo y
+        se debe descargar, True si se procesó.
+    """
+    if settings.VIDEO_PROCESSING_ENGINE != "ffmpeg":
+        return False
+
+    def read_range(start: int, end: int) -> bytes:
+        reader.seek(start)
+        return reader.read(end - start)
+
+    file_size = reader.seek(0, os.SEEK_END)
+    try:
+        header_size = get_faststart_header_size(read_range, file_size)
+    except Mp4Error as e:
+        logger.info(f"El video no se puede leer como flujo continuo ({e})")
+        return False
+    # Los metadatos y el inicio de las muestras permiten obtener la
+    # información de los streams sin descargar el resto del archivo
+    head = read_range(0, min(header_size + HEAD_READ_SIZE, file_size))
+    info = info or probe_media("pipe:0", data=head)
+
+    def input_chunks() -> Iterator[bytes]:
+        yield head
+        reader.seek(len(head))
+        yield from iter_reader_chunks(reader, settings.VIDEO_STREAM_CHUNK_SIZE)
+
+    render_probed_with_ffmpeg(
+        "pipe:0", destination_path, info, input_chunks(), on_progress
+    )
+    return True
+
+
+ENGINES: dict = {
+    "moviepy": render_with_moviepy,
+    "ffmpeg": render_with_ffmpeg,
+}
+
+
+def render_video(
+    source_path: str,
+    destination_path: str,
+    engine: str | None = None,
+    info: MediaInfo | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> None:
+    """
+    Aplica la edición estándar (recorte a 20 segundos, formato 16:9,
+    transición y pantalla negra con el logo) usando el motor configurado.
+
+    Args:
+        source_path (str): Ruta del video original.
+        destination_path (str): Ruta donde se escribe el video procesado.
+        engine (str | None): Motor a utilizar. Por defecto se usa
+            VIDEO_PROCESSING_ENGINE.
+        info (MediaInfo | None): Información del video original, si ya se
+            conoce.
+        on_progress (ProgressCallback | None): Recibe la fracción de la
+            edición completada.
+    """
+    engine = engine or settings.VIDEO_PROCESSING_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Motor de procesamiento {engine} no soportado")
+    logger.info(f"Procesando video con el motor {engine}")
+    ENGINES[engine](source_path, destination_path, info, on_progress)
@@ -0,0 +1,130 @@
+import logging
+import threading
+import time
+
+from sqlalchemy import func, update
+
+from src.apps.tasks.events import notify_task_event
+from src.apps.tasks.models import Task, TaskStatusEnum
+from src.apps.tasks.schemas import GetTaskProgressOutputSchema, TaskEventSchema
+from src.core.database.base import engine
+from src.settings.base import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TaskProgress:
+    """
+    Reporta en la base de datos la etapa, el porcentaje completado y el
+    tiempo restante estimado del procesamiento de una tarea.
+
+    Las actualizaciones del porcentaje se limitan a una cada
+    TASK_PROGRESS_INTERVAL segundos. Cada actualización usa su propia
+    transacción, de forma que se puede llamar desde los hilos de ffmpeg sin
+    compartir la sesión del worker, y se notifica a los clientes suscritos a
+    los eventos de la tarea.
+    """
+
+    def __init__(self, task: Task, interval: float | None = None):
+        self.task_id = task.id
+        self.event = TaskEventSchema(
+            id=task.id,
+            task_id=task.task_id,
+            user_id=task.user_id,
+            status=task.status.value if task.status else None,
+        )
+        self.interval = (
+            settings.TASK_PROGRESS_INTERVAL if interval is None else interval
+        )
+        self.lock = threading.Lock()
+        self.stage: str | None = None
+        self.stage_started_at = time.monotonic()
+        self.updated_at = 0.0
+
+    def set_stage(self, stage: str, percent: float = 0.0) -> None:
+        with self.lock:
+            self.stage = stage
+            self.stage_started_at = time.monotonic()
+            self.updated_at = self.stage_started_at
+        self.save(stage, percent, None)
+
+    def update(self, fraction: float) -> None:
+        """
+        Actualiza el porcentaje completado de la etapa actual.
+
+        Args:
+            fraction (float): Fracción completada, entre 0 y 1.
+        """
+        now = time.monotonic()
+        with self.lock:
+            if now - self.updated_at < self.interval:
+                return
+            self.updated_at = now
+            stage = self.stage
+            elapsed = now - self.stage_started_at
+        # Se asume una velocidad constante durante la etapa
+        eta = elapsed * (1 - fraction) / fraction if fraction > 0 else None
+        self.save(stage, round(fraction * 100, 1), eta)
+
+    def save(self, stage: str | None, percent: float, eta: float | None) -> None:
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    update(Task)
+                    .where(Task.id == self.task_id)
+                    .values(progress=percent, progress_stage=stage, progress_eta=eta)
+                )
+                progress = GetTaskProgressOutputSchema(
+                    percent=percent, stage=stage, eta=eta
+                )
+                notify_task_event(
+                    connection, self.event.model_copy(update={"progress": progress})
+                )
+        except Exception as e:
+            # El progreso es informativo, un error no debe detener la tarea
+            logger.exception(e)
+
+
+class TaskHeartbeat:
+    """
+    Actualiza cada TASK_HEARTBEAT_INTERVAL segundos la última señal
+    (heartbeat_at) de una tarea en proceso desde un hilo en segundo plano, de
+    forma que otra entrega del evento no la tome mientras el worker siga
+    activo. Al terminar el proceso del worker las señales se detienen y la
+    tarea se puede tomar de nuevo después de TASK_PROCESSING_TIMEOUT
+    segundos.
+    """
+
+    def __init__(self, task_id: int, interval: float | None = None):
+        self.task_id = task_id
+        self.interval = (
+            settings.TASK_HEARTBEAT_INTERVAL if interval is None else interval
+        )
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.beat()
+
+    def beat(self) -> None:
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    update(Task)
+                    .where(
+                        Task.id == self.task_id,
+                        Task.status == TaskStatusEnum.PROCESSING,
+                    )
+                    .values(heartbeat_at=func.now())
+                )
+        except Exception as e:
+            # Una señal que no se guarda no debe detener la tarea
+            logger.exception(e)
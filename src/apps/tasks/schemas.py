@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 
 
 class CreateTaskOutputSchema(BaseModel):
@@ -9,6 +9,20 @@ class CreateTaskOutputSchema(BaseModel):
     task_id: str
 
 
+class CreateUploadInputSchema(BaseModel):
+    filename: str
+    size: int | None = Field(default=None, gt=0)
+
+
+class CreateUploadOutputSchema(BaseModel):
+    video_uuid: str
+    upload_url: str
+
+
+class FinalizeUploadInputSchema(BaseModel):
+    filename: str
+
+
 class GetAllTaskOutputSchema(BaseModel):
     id: int
     task_id: str
@@ -36,12 +50,26 @@ class GetTaskVideoOutputSchema(BaseModel):
     score: float | None
 
 
+class GetTaskMetricOutputSchema(BaseModel):
+    stage: str
+    wall_time: float
+    cpu_time: float
+
+
+class GetTaskProgressOutputSchema(BaseModel):
+    percent: float | None
+    stage: str | None
+    eta: float | None
+
+
 class GetTaskOutputSchema(BaseModel):
     id: int
     task_id: str
     user_id: int
     original_video: GetTaskVideoOutputSchema | None
     processed_video: GetTaskVideoOutputSchema | None
+    metrics: list[GetTaskMetricOutputSchema] = []
+    progress: GetTaskProgressOutputSchema | None = None
     status: str
     created_at: datetime | str | None
     updated_at: datetime | str | None
@@ -60,3 +88,12 @@ class DeleteTaskOutputSchema(BaseModel):
     id: int
     task_id: str
     is_active: bool
+
+
+class TaskEventSchema(BaseModel):
+    id: int
+    task_id: str | None
+    user_id: int
+    status: str | None
+    processed_video_id: int | None = None
+    progress: GetTaskProgressOutputSchema | None = None
@@ -1,30 +1,44 @@
 import logging
 import os
+import shutil
 import tempfile
-from datetime import datetime
-
-from moviepy.editor import (
-    ColorClip,
-    CompositeVideoClip,
-    ImageClip,
-    VideoFileClip,
-    concatenate_videoclips,
-)
-from moviepy.video.fx.all import resize
-from sqlalchemy import select
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, exists, func, or_, select, update
 from sqlalchemy.orm import Session
 
-from src.apps.tasks.models import Task, TaskStatusEnum
+from src.apps.tasks.events import build_task_event, notify_task_event
+from src.apps.tasks.metrics import StageTimer
+from src.apps.tasks.models import (
+    IN_FLIGHT_STATUSES,
+    Task,
+    TaskOutboxEvent,
+    TaskStatusEnum,
+)
+from src.apps.tasks.processing import (
+    TRIM_DURATION,
+    render_stream_with_ffmpeg,
+    render_video,
+)
+from src.apps.tasks.progress import TaskHeartbeat, TaskProgress
 from src.apps.users.models import User
 from src.apps.videos.models import Video
+from src.apps.videos.utils import get_content_hash, get_media_info
 from src.celery_worker import celery
 from src.core.database.dependencies import get_db
 from src.core.gcp.cloud_storage.base import GCPCloudStorage
+from src.core.media.ffmpeg import FFmpegError, probe_media
 from src.settings.base import settings
 
 logger = logging.getLogger(__name__)
 
 
+class TaskInProgressError(Exception):
+    """
+    La tarea la está procesando otro worker, que sigue enviando señales.
+    """
+
+
 # @celery.task
 def process_video(video_id, task_id) -> None:
     logger.info(f"Procesando video {video_id} asociado a la tarea {task_id}")
@@ -36,86 +50,292 @@ def process_video(video_id, task_id) -> None:
         logger.exception(e)
         return
     logger.info("Conexión exitosa con la base de datos")
+    timer = StageTimer()
     # Recupera registros de video y tarea de la base de datos
-    query = select(Video).where(Video.id == video_id)
-    original_video = session.execute(query).scalars().first()
-    query = select(Task).where(Task.id == task_id)
-    task = session.execute(query).scalars().first()
+    with timer.stage("fetch"):
+        query = select(Video).where(Video.id == video_id)
+        original_video = session.execute(query).scalars().first()
+        query = select(Task).where(Task.id == task_id)
+        task = session.execute(query).scalars().first()
     # Validar que existan los registros
     if not original_video or not task:
         logger.info("Video no encontrado")
         return
     logger.info(f"Video encontrado {original_video.id}")
     logger.info(f"Task encontrado {task.id}")
+    # El evento se entrega al menos una vez, una entrega repetida no procesa
+    # de nuevo la tarea
+    if not claim_task(session, task):
+        # Si la tarea sigue en proceso, el evento se debe entregar de nuevo en
+        # caso de que el otro worker no la complete
+        if task.status == TaskStatusEnum.PROCESSING:
+            raise TaskInProgressError(f"La tarea {task.id} se está procesando")
+        logger.info(f"La tarea {task.id} ya fue procesada")
+        return
     # Iniciar procesamiento
-    client = GCPCloudStorage()
+    progress = TaskProgress(task)
+    # Mientras el trabajo avance la tarea no se considera abandonada, aunque
+    # una etapa tarde más que TASK_PROCESSING_TIMEOUT
+    heartbeat = TaskHeartbeat(task.id)
+    file = None
+    temp_dir = tempfile.mkdtemp()
+    heartbeat.start()
     try:
-        logger.info(f"Descargando video {original_video.url}")
-        file = client.download_file(
-            bucket_name=settings.VIDEOS_BUCKET, source_path=original_video.url
-        )
-        logger.info(f"Video descargado {file}")
-        # Obtener video original
-        logger.info("Procesando video")
-        video = VideoFileClip(file)
-        # Recortar video a 20 segundos
-        video = video.subclip(0, 20)
-        # Redimensionar video a un formato de 16:9
-        video = resize(video, height=video.w * 9 / 16)
-        # Crear una pantalla negra (ColorClip) con la misma resolución que el video
-        black_screen = ColorClip(
-            size=video.size, color=(0, 0, 0), duration=3
-        )  # Black screen for 2 seconds
-        # Cargar el logo y redimensionarlo si es necesario
-        logo = ImageClip(
-            f"{os.getcwd()}/statics/logo_256.png", duration=2
-        )  # Cambia el tamaño según sea necesario
-        # Colocar el logo en el centro de la pantalla negra
-        logo_on_black = CompositeVideoClip([black_screen, logo.set_position("center")])
-        # Aplica una transición de fadeout de 0.5 segundo al video y a la pantalla negra con el logo
-        video_with_transition = video.crossfadeout(0.5)
-        # Aplica una transición de fadein de 1 segundo a la pantalla negra con el logo
-        logo_on_black_with_transition = logo_on_black.crossfadein(1)
-        # Combinar el video recortado con la pantalla negra y el logo, con transición de 1 segundo
-        final_clip = concatenate_videoclips(
-            [video_with_transition, logo_on_black_with_transition], method="compose"
-        )
-        logger.info("Video procesado")
-        # Almacenar video procesado
-        temp_dir = tempfile.mkdtemp()
+        client = GCPCloudStorage()
+        # Información obtenida al subir el video, evita analizarlo de nuevo
+        media_info = get_media_info(original_video)
         processed_video_path = os.path.join(
             temp_dir, f"processed_{original_video.filename}"
         )
-
-        final_clip.write_videofile(
-            processed_video_path,
-            codec="libx264",
-            fps=24,
-        )
-        logger.info(f"Video procesado guardado en {processed_video_path}")
-        destination_blob_name = f"{task.task_id}/processed_{original_video.filename}"
-        client.upload_file(
-            bucket_name=settings.VIDEOS_BUCKET,
-            destination_path=destination_blob_name,
-            file_path=processed_video_path,
-        )
-        logger.info(f"Video procesado guardado en {destination_blob_name}")
-        # Generar registro de video procesado
-        processed_video = Video(
-            title=f"""video {task.user.username} {datetime.now().strftime("%d_%m_%Y")}""",
-            user_id=task.user.id,
-            filename=f"processed_{original_video.filename}",
-            url=destination_blob_name,
-            score=None,
-        )
+        streamed = False
+        if settings.VIDEO_STREAMING_INPUT_ENABLED:
+            logger.info(f"Procesando video {original_video.url} por bloques")
+            progress.set_stage("encoding")
+            # La descarga y la edición ocurren al mismo tiempo, se miden como
+            # una sola etapa
+            try:
+                with timer.stage("download_render"), client.open_file(
+                    bucket_name=settings.VIDEOS_BUCKET, source_path=original_video.url
+                ) as reader:
+                    streamed = render_stream_with_ffmpeg(
+                        reader,
+                        processed_video_path,
+                        info=media_info,
+                        on_progress=progress.update,
+                    )
+            except FFmpegError as e:
+                # Algunos videos solo se pueden decodificar buscando posiciones
+                # en el archivo, se procesan descargándolos
+                logger.warning(f"Error al procesar el video por bloques: {e}")
+                streamed = False
+            if not streamed:
+                # Solo se registra la etapa si el video se procesó por bloques
+                timer.discard("download_render")
+        if not streamed:
+            logger.info(f"Descargando video {original_video.url}")
+            progress.set_stage("downloading")
+            with timer.stage("download"):
+                if settings.VIDEO_PARTIAL_DOWNLOAD_ENABLED:
+                    file = client.download_partial_file(
+                        bucket_name=settings.VIDEOS_BUCKET,
+                        source_path=original_video.url,
+                        duration=TRIM_DURATION,
+                    )
+                else:
+                    file = client.download_file(
+                        bucket_name=settings.VIDEOS_BUCKET,
+                        source_path=original_video.url,
+                    )
+            logger.info(f"Video descargado {file}")
+            logger.info("Procesando video")
+            # La decodificación, la composición y la codificación ocurren en
+            # el mismo proceso de ffmpeg o en el mismo ciclo de moviepy
+            progress.set_stage("encoding")
+            with timer.stage("render"):
+                render_video(
+                    file,
+                    processed_video_path,
+                    info=media_info,
+                    on_progress=progress.update,
+                )
+        logger.info("Video procesado")
+        with timer.stage("hash"):
+            with open(processed_video_path, "rb") as processed_file:
+                content_hash = get_content_hash(processed_file)
+            # Reutilizar un video procesado idéntico del usuario, si existe
+            query = (
+                select(Video)
+                .join(Task, Task.processed_video_id == Video.id)
+                .where(
+                    Video.user_id == task.user.id,
+                    Video.content_hash == content_hash,
+                    Video.is_active == True,
+                )
+                .order_by(Video.id.desc())
+            )
+            processed_video = session.execute(query).scalars().first()
+        if processed_video:
+            logger.info(f"Video procesado repetido {processed_video.id}")
+        else:
+            # Almacenar video procesado
+            logger.info(f"Video procesado guardado en {processed_video_path}")
+            destination_blob_name = (
+                f"{task.task_id}/processed_{original_video.filename}"
+            )
+            progress.set_stage("uploading")
+            with timer.stage("upload"):
+                client.upload_file(
+                    bucket_name=settings.VIDEOS_BUCKET,
+                    destination_path=destination_blob_name,
+                    file_path=processed_video_path,
+                )
+            logger.info(f"Video procesado guardado en {destination_blob_name}")
+            # Generar registro de video procesado
+            processed_video = Video(
+                title=f"""video {task.user.username} {datetime.now().strftime("%d_%m_%Y")}""",
+                user_id=task.user.id,
+                filename=f"processed_{original_video.filename}",
+                url=destination_blob_name,
+                score=None,
+                content_hash=content_hash,
+                **probe_media(processed_video_path).model_dump(),
+            )
     except Exception as e:
         logger.exception(e)
-        task.status = TaskStatusEnum.FAILURE
+        fail_task(session, task)
         session.commit()
+        save_metrics(session, task, timer)
         return
+    finally:
+        heartbeat.stop()
+        # Eliminar el video descargado y el video procesado del disco
+        if file and os.path.exists(file):
+            os.remove(file)
+        shutil.rmtree(temp_dir, ignore_errors=True)
     # Actualizar tarea con video procesado
-    session.add(processed_video)
-    session.flush()
-    task.status = TaskStatusEnum.PROCESSED
-    task.processed_video_id = processed_video.id
+    with timer.stage("commit"):
+        session.add(processed_video)
+        session.flush()
+        task.status = TaskStatusEnum.PROCESSED
+        task.processed_video_id = processed_video.id
+        task.progress = 100
+        task.progress_stage = "completed"
+        task.progress_eta = 0
+        notify_task_event(session, build_task_event(task))
+        # Las tareas creadas con el mismo video mientras se procesaba usan el
+        # mismo video procesado
+        for waiting_task in get_waiting_tasks(session, task):
+            waiting_task.status = TaskStatusEnum.PROCESSED
+            waiting_task.processed_video_id = processed_video.id
+            notify_task_event(session, build_task_event(waiting_task))
+            logger.info(f"Tarea {waiting_task.id} completada con la tarea {task.id}")
+        session.commit()
+    save_metrics(session, task, timer)
+
+
+def claim_task(session: Session, task: Task) -> bool:
+    """
+    Toma una tarea para procesarla, cambiando su estado a PROCESSING de forma
+    atómica. Solo se toman las tareas en cola o las que están en proceso sin
+    señales del worker (heartbeat_at) en TASK_PROCESSING_TIMEOUT segundos,
+    que se consideran abandonadas. El cambio se confirma y se notifica a los
+    clientes.
+
+    Args:
+        session (Session): Sesión de la base de datos.
+        task (Task): Tarea a procesar.
+
+    Returns:
+        bool: True si la tarea se tomó.
+    """
+    stale_at = func.now() - timedelta(seconds=settings.TASK_PROCESSING_TIMEOUT)
+    query = (
+        update(Task)
+        .where(
+            Task.id == task.id,
+            or_(
+                Task.status == TaskStatusEnum.UPLOADED,
+                and_(
+                    Task.status == TaskStatusEnum.PROCESSING,
+                    or_(Task.heartbeat_at.is_(None), Task.heartbeat_at < stale_at),
+                ),
+            ),
+        )
+        .values(status=TaskStatusEnum.PROCESSING, heartbeat_at=func.now())
+        .returning(Task.id)
+    )
+    if session.execute(query).scalar() is None:
+        session.rollback()
+        return False
+    session.refresh(task)
+    notify_task_event(session, build_task_event(task))
+    session.commit()
+    return True
+
+
+def release_task(session: Session, task_id: int) -> bool:
+    """
+    Devuelve a la cola una tarea en proceso cuyo trabajo terminó sin
+    completarla, por ejemplo porque el proceso del worker terminó de forma
+    abrupta, para que la siguiente entrega del evento la tome de nuevo. El
+    cambio se confirma y se notifica a los clientes.
+
+    Args:
+        session (Session): Sesión de la base de datos.
+        task_id (int): Id de la tarea.
+
+    Returns:
+        bool: True si la tarea estaba en proceso y volvió a la cola.
+    """
+    query = (
+        update(Task)
+        .where(Task.id == task_id, Task.status == TaskStatusEnum.PROCESSING)
+        .values(status=TaskStatusEnum.UPLOADED, heartbeat_at=None)
+        .returning(Task.id)
+    )
+    if session.execute(query).scalar() is None:
+        session.rollback()
+        return False
+    task = session.get(Task, task_id, populate_existing=True)
+    notify_task_event(session, build_task_event(task))
     session.commit()
+    return True
+
+
+def fail_task(session: Session, task: Task) -> None:
+    """
+    Marca como fallidas una tarea y las tareas que esperaban a que se
+    procesara su video, con la etapa de progreso "failed", y notifica a los
+    clientes al confirmar la transacción.
+
+    Args:
+        session (Session): Sesión de la base de datos.
+        task (Task): Tarea que falló.
+    """
+    for failed_task in [task, *get_waiting_tasks(session, task, linked_only=True)]:
+        failed_task.status = TaskStatusEnum.FAILURE
+        failed_task.progress_stage = "failed"
+        failed_task.progress_eta = None
+        notify_task_event(session, build_task_event(failed_task))
+
+
+def get_waiting_tasks(
+    session: Session, task: Task, linked_only: bool = False
+) -> list[Task]:
+    """
+    Obtiene las tareas en cola o en proceso del mismo video original de una
+    tarea.
+
+    Args:
+        session (Session): Sesión de la base de datos.
+        task (Task): Tarea procesada.
+        linked_only (bool): Si es True, solo las tareas que no tienen su
+            propio evento de procesamiento, es decir, que esperan a que otra
+            tarea procese el video.
+
+    Returns:
+        list[Task]: Tareas encontradas.
+    """
+    query = select(Task).where(
+        Task.original_video_id == task.original_video_id,
+        Task.status.in_(IN_FLIGHT_STATUSES),
+        Task.id != task.id,
+    )
+    if linked_only:
+        query = query.where(~exists().where(TaskOutboxEvent.task_id == Task.id))
+    return list(session.execute(query).scalars().all())
+
+
+def save_metrics(session: Session, task: Task, timer: StageTimer) -> None:
+    """
+    Guarda los tiempos de las etapas del procesamiento de una tarea. Un error
+    al guardarlos no afecta el resultado de la tarea.
+    """
+    try:
+        for metric in timer.metrics:
+            metric.task_id = task.id
+        session.add_all(timer.metrics)
+        session.commit()
+    except Exception as e:
+        logger.exception(e)
+        session.rollback()
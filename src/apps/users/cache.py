@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import threading
+
+import redis
+from cachetools import TTLCache
+from redis import asyncio as async_redis
+from sqlalchemy import event
+
+from src.apps.users.models import User
+from src.apps.users.schemas import CurrentUserSchema
+from src.settings.base import settings
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache:
+    """
+    Caché de los usuarios activos que hacen peticiones autenticadas.
+
+    Cada proceso mantiene un caché en memoria con tiempo de expiración y, si
+    se configura USER_CACHE_REDIS_URL, se consulta Redis antes de ir a la base
+    de datos para compartir los usuarios entre procesos. Las consultas a Redis
+    son asíncronas para no bloquear el event loop. Un error de Redis no
+    interrumpe la petición, solo se omite ese nivel.
+    """
+
+    def __init__(self):
+        self.local = TTLCache(
+            maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL
+        )
+        self.lock = threading.Lock()
+        self.redis = (
+            async_redis.Redis.from_url(
+                settings.USER_CACHE_REDIS_URL, socket_timeout=0.5
+            )
+            if settings.USER_CACHE_REDIS_URL
+            else None
+        )
+        # Las invalidaciones llegan desde los eventos síncronos del ORM, que
+        # pueden ocurrir fuera de un event loop
+        self.sync_redis = (
+            redis.Redis.from_url(settings.USER_CACHE_REDIS_URL, socket_timeout=0.5)
+            if settings.USER_CACHE_REDIS_URL
+            else None
+        )
+        self.pending: set[asyncio.Task] = set()
+
+    @staticmethod
+    def get_key(user_id: int) -> str:
+        return f"users:{user_id}"
+
+    async def get(self, user_id: int) -> CurrentUserSchema | None:
+        with self.lock:
+            user = self.local.get(user_id)
+        if user is not None or self.redis is None:
+            return user
+        try:
+            data = await self.redis.get(self.get_key(user_id))
+        except redis.RedisError as e:
+            logger.warning(f"Error al consultar el usuario en Redis: {e}")
+            return None
+        if data is None:
+            return None
+        user = CurrentUserSchema.model_validate_json(data)
+        with self.lock:
+            self.local[user_id] = user
+        return user
+
+    async def set(self, user: CurrentUserSchema) -> None:
+        with self.lock:
+            self.local[user.id] = user
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(
+                self.get_key(user.id),
+                user.model_dump_json(),
+                ex=max(int(settings.USER_CACHE_TTL), 1),
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Error al guardar el usuario en Redis: {e}")
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Elimina un usuario del caché, por ejemplo al desactivarlo. Los demás
+        procesos lo eliminan de su caché en memoria al expirar. Dentro de un
+        event loop la eliminación en Redis se programa como una tarea para
+        no bloquearlo.
+        """
+        with self.lock:
+            self.local.pop(user_id, None)
+        if self.redis is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                self.sync_redis.delete(self.get_key(user_id))
+            except redis.RedisError as e:
+                logger.warning(f"Error al eliminar el usuario de Redis: {e}")
+            return
+        task = loop.create_task(self.delete(user_id))
+        # Se guarda una referencia hasta que termine la tarea
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+
+    async def delete(self, user_id: int) -> None:
+        try:
+            await self.redis.delete(self.get_key(user_id))
+        except redis.RedisError as e:
+            logger.warning(f"Error al eliminar el usuario de Redis: {e}")
+
+    def clear(self) -> None:
+        with self.lock:
+            self.local.clear()
+
+
+user_cache = UserCache()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_user(mapper, connection, target: User) -> None:
+    # Cualquier cambio del usuario desde el ORM, como su desactivación,
+    # invalida el caché. Las actualizaciones masivas con update() no pasan por
+    # aquí y deben llamar a user_cache.invalidate()
+    user_cache.invalidate(target.id)
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class CurrentUserSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    username: str
+    email: str
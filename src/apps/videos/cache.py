@@ -0,0 +1,62 @@
+import threading
+import time
+from typing import Callable
+
+from cachetools import TTLCache
+
+from src.core.gcp.executor import AsyncCloudStorage
+from src.settings.base import settings
+
+
+class SignedUrlCache:
+    """
+    Caché en memoria de las URLs firmadas de descarga de los videos.
+
+    Firmar una URL requiere una firma RSA con la cuenta de servicio, por lo
+    que cada URL se reutiliza hasta VIDEO_SIGNED_URL_CACHE_MARGIN segundos
+    antes de que expire; así el cliente siempre recibe una URL con al menos
+    ese margen de validez.
+    """
+
+    def __init__(self, timer: Callable[[], float] = time.monotonic):
+        self.expiration = settings.VIDEO_SIGNED_URL_EXPIRATION
+        self.local = TTLCache(
+            maxsize=settings.VIDEO_SIGNED_URL_CACHE_MAX_SIZE,
+            ttl=max(self.expiration - settings.VIDEO_SIGNED_URL_CACHE_MARGIN, 1),
+            timer=timer,
+        )
+        self.lock = threading.Lock()
+
+    async def get_url(
+        self, client: AsyncCloudStorage, bucket_name: str, file_path: str
+    ) -> str:
+        """
+        Obtiene la URL firmada de un archivo, firmándola solo si no está en
+        caché o está por expirar.
+
+        Args:
+            client (AsyncCloudStorage): Cliente con el que se firma la URL.
+            bucket_name (str): Nombre del bucket.
+            file_path (str): Ruta del archivo en el bucket.
+
+        Returns:
+            str: URL firmada.
+        """
+        key = (bucket_name, file_path)
+        with self.lock:
+            url = self.local.get(key)
+        if url is not None:
+            return url
+        url = await client.get_public_url(
+            bucket_name=bucket_name, file_path=file_path, expiration=self.expiration
+        )
+        with self.lock:
+            self.local[key] = url
+        return url
+
+    def clear(self) -> None:
+        with self.lock:
+            self.local.clear()
+
+
+signed_url_cache = SignedUrlCache()
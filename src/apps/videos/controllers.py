@@ -1,20 +1,25 @@
 import logging
 import os
+from email.utils import format_datetime
 
-from fastapi import APIRouter, Depends
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from src.apps.auth.utils import get_authorization_header
+from src.apps.auth.utils import get_current_user
 from src.apps.commons.exceptions import CustomException
+from src.apps.commons.pagination import paginate
 from src.apps.commons.schemas import BaseErrorSchema, UnexpectedErrorSchema
 from src.apps.tasks.models import Task, TaskStatusEnum
-from src.apps.users.models import User
+from src.apps.users.schemas import CurrentUserSchema
+from src.apps.videos.cache import signed_url_cache
 from src.apps.videos.models import Video
 from src.apps.videos.schemas import GetVideoOutputSchema
-from src.core.database.dependencies import get_db
-from src.core.gcp.cloud_storage.base import GCPCloudStorage
+from src.apps.videos.utils import RangeNotSatisfiableError, parse_range
+from src.core.database.dependencies import get_async_db
+from src.core.gcp.executor import AsyncCloudStorage
 from src.settings.base import settings
 
 logger = logging.getLogger(__name__)
@@ -39,32 +44,27 @@ METADATA = {
     },
 )
 async def get_videos(
+    request: Request,
+    response: Response,
     max: int = 10,
     order: int = 0,
-    session: Session = Depends(get_db),
-    jwt_payload: dict = Depends(get_authorization_header),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_async_db),
+    user: CurrentUserSchema = Depends(get_current_user),
 ):
     """
     Permite consultar la información de todos los vídeos disponibles en la
-    aplicación.
+    aplicación. Las páginas siguiente y anterior se obtienen con los enlaces
+    del header `Link`.
     """
-    query = select(User).where(User.id == jwt_payload["id"], User.is_active == True)
-    user = session.execute(query).scalars().first()
-    if not user:
-        raise CustomException(
-            error="error_user",
-            message="Usuario no encontrado",
-            status_code=404,
-        )
-    query = select(Task).where(
-        Task.is_active == True, Task.status == TaskStatusEnum.PROCESSED
+    query = (
+        select(Task)
+        .where(Task.is_active == True, Task.status == TaskStatusEnum.PROCESSED)
+        .options(joinedload(Task.processed_video))
+    )
+    tasks = await paginate(
+        session, query, Task.id, request, response, max, order, cursor
     )
-    if order == 0:
-        query = query.order_by(Task.id.asc())
-    else:
-        query = query.order_by(Task.id.desc())
-    query = query.limit(max)
-    tasks = session.execute(query).scalars().all()
     return [
         GetVideoOutputSchema(
             id=task.processed_video.id,
@@ -81,7 +81,10 @@ async def get_videos(
 @router.get(
     "/download/{video_id}",
     responses={
+        206: {"description": "Partial content response"},
+        302: {"description": "Redirect to a signed download URL"},
         404: {"description": "Not found response", "model": BaseErrorSchema},
+        416: {"description": "Range not satisfiable response"},
         500: {
             "description": "Unexpected error response",
             "model": UnexpectedErrorSchema,
@@ -90,27 +93,44 @@ async def get_videos(
 )
 async def download_video(
     video_id: int,
-    session: Session = Depends(get_db),
+    request: Request,
+    session: AsyncSession = Depends(get_async_db),
 ):
     """
-    Permite descargar un video en formato mp4.
+    Permite descargar un video en formato mp4. Admite los headers `Range` e
+    `If-Range` para descargar solo una parte del video (respuesta 206), y el
+    contenido se envía por bloques leídos de Cloud Storage a medida que el
+    cliente los consume.
+
+    Si VIDEO_DOWNLOAD_MODE es `redirect`, responde con una redirección a una
+    URL firmada de Cloud Storage y el video se descarga sin pasar por la API.
     """
     query = select(Video).where(Video.id == video_id)
-    video = session.execute(query).scalars().first()
+    video = (await session.execute(query)).scalars().first()
     if not video:
         raise CustomException(
             error="error_video",
             message="Video no encontrado",
             status_code=404,
         )
-    client = GCPCloudStorage()
+    client = AsyncCloudStorage()
     bucket_name = settings.VIDEOS_BUCKET
     cloud_path = video.url
 
+    if settings.VIDEO_DOWNLOAD_MODE == "redirect":
+        try:
+            url = await signed_url_cache.get_url(client, bucket_name, cloud_path)
+        except Exception as e:
+            logger.exception(e)
+            raise CustomException(
+                error="error_video",
+                message="Error al generar la URL de descarga del video",
+                status_code=500,
+            ) from e
+        return RedirectResponse(url, status_code=302)
+
     try:
-        video_bytes = client.download_file_as_bytes(
-            bucket_name=bucket_name, source_path=cloud_path
-        )
+        blob = await client.get_file(bucket_name=bucket_name, source_path=cloud_path)
     except Exception as e:
         logger.exception(e)
         raise CustomException(
@@ -118,5 +138,45 @@ async def download_video(
             message="Error al descargar el video desde Cloud Storage",
             status_code=500,
         ) from e
+    if blob is None:
+        raise CustomException(
+            error="error_video",
+            message="Video no encontrado",
+            status_code=404,
+        )
 
-    return StreamingResponse(iter([video_bytes]), media_type="video/mp4")
+    size = blob.size
+    etag = f'"{blob.generation}"'
+    headers = {"Accept-Ranges": "bytes", "ETag": etag}
+    if blob.updated:
+        headers["Last-Modified"] = format_datetime(blob.updated, usegmt=True)
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except RangeNotSatisfiableError:
+        headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+    # Si el video cambió desde que el cliente obtuvo la parte que ya tiene,
+    # se ignora el rango y se envía el video completo
+    if_range = request.headers.get("if-range")
+    if byte_range and if_range and if_range not in (etag, headers.get("Last-Modified")):
+        byte_range = None
+
+    status_code = 200
+    start, end = 0, size
+    if byte_range:
+        status_code = 206
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    headers["Content-Length"] = str(end - start)
+    return StreamingResponse(
+        client.iter_range(
+            bucket_name=bucket_name,
+            source_path=cloud_path,
+            start=start,
+            end=end,
+            generation=blob.generation,
+        ),
+        status_code=status_code,
+        headers=headers,
+        media_type="video/mp4",
+    )
@@ -15,6 +15,9 @@ if TYPE_CHECKING:
 
 class Video(IntegerIdMixin, TimestampMixin, IsActiveMixin, Base):
     __tablename__ = "videos"
+    __table_args__ = (
+        sa.Index("ix_videos_user_id_content_hash", "user_id", "content_hash"),
+    )
     title: Mapped[str]
     user_id: Mapped[int] = mapped_column(sa.ForeignKey("users.id"))
     user: Mapped["User"] = relationship("User", back_populates="videos")
@@ -29,3 +32,18 @@ class Video(IntegerIdMixin, TimestampMixin, IsActiveMixin, Base):
     filename: Mapped[str]
     url: Mapped[str]
     score: Mapped[Optional[float]]
+    # SHA-256 del contenido del archivo, permite detectar videos repetidos
+    content_hash: Mapped[Optional[str]] = mapped_column(sa.String(64))
+    # Información obtenida de la cabecera del archivo al subirlo
+    duration: Mapped[Optional[float]]
+    width: Mapped[Optional[int]]
+    height: Mapped[Optional[int]]
+    fps: Mapped[Optional[float]]
+    rotation: Mapped[Optional[int]]
+    bitrate: Mapped[Optional[int]]
+    video_codec: Mapped[Optional[str]]
+    video_profile: Mapped[Optional[str]]
+    pixel_format: Mapped[Optional[str]]
+    audio_codec: Mapped[Optional[str]]
+    audio_sample_rate: Mapped[Optional[int]]
+    audio_channels: Mapped[Optional[int]]
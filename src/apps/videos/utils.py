@@ -0,0 +1,171 @@
+import hashlib
+import logging
+import os
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+from src.apps.commons.exceptions import CustomException
+from src.apps.videos.models import Video
+from src.core.media.mp4 import Mp4Error, probe_mp4
+from src.core.media.schemas import MediaInfo
+from src.settings.base import settings
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def probe_upload(file: UploadFile) -> MediaInfo:
+    """
+    Obtiene la información de un video subido leyendo solo la cabecera del
+    contenedor, como máximo VIDEO_PROBE_MAX_BYTES bytes. Al terminar el
+    archivo queda en su posición inicial.
+
+    Args:
+        file (UploadFile): Video subido.
+
+    Returns:
+        MediaInfo: Información del video.
+
+    Raises:
+        CustomException: Si el archivo no es un video MP4 válido.
+    """
+
+    def read_range(start: int, end: int) -> bytes:
+        file.file.seek(start)
+        return file.file.read(end - start)
+
+    file_size = file.file.seek(0, os.SEEK_END)
+    try:
+        info = probe_mp4(read_range, file_size, settings.VIDEO_PROBE_MAX_BYTES)
+    except Mp4Error as e:
+        logger.info(f"Video {file.filename} inválido: {e}")
+        info = None
+    finally:
+        file.file.seek(0)
+    return check_media_info(info)
+
+
+def check_media_info(info: MediaInfo | None) -> MediaInfo:
+    """
+    Valida que la información obtenida de un archivo corresponda a un video.
+    La duración puede faltar, por ejemplo en los MP4 fragmentados; en ese caso
+    el worker la obtiene al procesar el video.
+
+    Args:
+        info (MediaInfo | None): Información del archivo, o None si no se pudo
+            interpretar.
+
+    Returns:
+        MediaInfo: Información del video.
+
+    Raises:
+        CustomException: Si el archivo no es un video válido.
+    """
+    if not info or not info.has_video:
+        raise CustomException(
+            error="error_video",
+            message="El archivo no es un video válido",
+            status_code=400,
+        )
+    return info
+
+
+def check_video_filename(filename: str) -> None:
+    """
+    Valida la extensión del nombre de un video.
+
+    Raises:
+        CustomException: Si el nombre no tiene extensión o no es mp4.
+    """
+    valid_extensions = ["mp4"]
+    file_extension = filename.split(".")[-1]
+    if not file_extension:
+        raise CustomException(
+            error="error_video",
+            message="Extension de video no encontrada",
+            status_code=400,
+        )
+    if file_extension not in valid_extensions:
+        raise CustomException(
+            error="error_video",
+            message="Formato de video no permitido",
+            status_code=400,
+        )
+
+
+def get_media_info(video: Video) -> MediaInfo | None:
+    """
+    Construye la información de un video a partir de los datos almacenados
+    al subirlo, o None si el video no los tiene.
+    """
+    if video.duration is None:
+        return None
+    return MediaInfo(
+        **{field: getattr(video, field) for field in MediaInfo.model_fields}
+    )
+
+
+def get_content_hash(file: BinaryIO) -> str:
+    """
+    Calcula el SHA-256 del contenido de un archivo leyéndolo por bloques. Al
+    terminar el archivo queda en su posición inicial.
+
+    Args:
+        file (BinaryIO): Archivo abierto en modo binario.
+
+    Returns:
+        str: Hash en hexadecimal.
+    """
+    digest = hashlib.sha256()
+    file.seek(0)
+    while chunk := file.read(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+class RangeNotSatisfiableError(Exception):
+    pass
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Interpreta el header `Range` de una petición sobre un archivo. Solo se
+    atienden rangos únicos en bytes (`bytes=inicio-fin`, `bytes=inicio-` y
+    `bytes=-sufijo`); un header ausente, mal formado o con varios rangos se
+    ignora y se responde el archivo completo.
+
+    Args:
+        header (str | None): Valor del header `Range`.
+        size (int): Tamaño del archivo en bytes.
+
+    Returns:
+        tuple[int, int] | None: Posición inicial y final (no incluida) del
+        rango, o None si se debe responder el archivo completo.
+
+    Raises:
+        RangeNotSatisfiableError: Si el rango está fuera del archivo.
+    """
+    if not header:
+        return None
+    unit, _, ranges = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    first, dash, last = ranges.strip().partition("-")
+    if not dash or not (first or last):
+        return None
+    if not all(value.isdigit() for value in (first, last) if value):
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiableError(header)
+        return max(size - suffix, 0), size
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(header)
+    return start, min(int(last) + 1, size) if last else size
@@ -5,6 +5,12 @@ from typing import Any, Dict
 import sqlalchemy as sa
 from sqlalchemy import Engine, create_engine
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 from sqlalchemy_json import mutable_json_type
 
@@ -24,6 +30,29 @@ session: sessionmaker[Session] = sessionmaker(
     autocommit=False, autoflush=False, bind=engine
 )
 
+# Motor asíncrono para los controladores de FastAPI, el motor síncrono se
+# mantiene para los workers y las migraciones
+async_engine: AsyncEngine = create_async_engine(
+    sa.engine.url.URL.create(
+        drivername=settings.DB_ASYNC_DRIVER,
+        username=settings.DB_USER,
+        password=settings.DB_PASSWORD,
+        database=settings.DB_NAME,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        query={"host": settings.DB_SOCKET_DIR} if settings.DB_SOCKET_DIR else {},
+    ),
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+)
+
+# Los objetos no se expiran al confirmar, ya que en una sesión asíncrona no
+# se pueden recargar sus atributos de forma implícita
+async_session: async_sessionmaker[AsyncSession] = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 class Base(DeclarativeBase):
     type_annotation_map = {
@@ -1,9 +1,10 @@
 import logging
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.core.database.base import session
+from src.core.database.base import async_session, session
 
 logger = logging.getLogger(__name__)
 
@@ -19,3 +20,16 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         logger.info("Closing database session")
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    logger.info("Generating async database session")
+    async with async_session() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Error while using async database session {e}")
+            await db.rollback()
+            raise
+        finally:
+            logger.info("Closing async database session")
@@ -0,0 +1,155 @@
+import base64
+import json
+import logging
+import os
+import threading
+import time
+
+import grpc
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import pubsub_v1, storage  # type: ignore
+from google.oauth2.service_account import Credentials  # type: ignore
+from requests.adapters import HTTPAdapter
+
+from src.settings.base import settings
+
+logger = logging.getLogger(__name__)
+
+# Clientes compartidos por todo el proceso. Se crean la primera vez que se
+# usan (o al iniciar la API con `warm_up_clients`) y se reutilizan, con sus
+# credenciales, tokens y conexiones, en todas las peticiones
+_lock = threading.Lock()
+_credentials: Credentials | None = None
+_storage_client: storage.Client | None = None
+_publisher_client: pubsub_v1.PublisherClient | None = None
+
+
+def _reset_clients() -> None:
+    # Los canales de gRPC y las conexiones abiertas no sobreviven a un fork,
+    # el proceso hijo crea sus propios clientes
+    global _lock, _credentials, _storage_client, _publisher_client
+    _lock = threading.Lock()
+    _credentials = None
+    _storage_client = None
+    _publisher_client = None
+
+
+os.register_at_fork(after_in_child=_reset_clients)
+
+
+def get_credentials() -> Credentials:
+    """
+    Obtiene las credenciales de la cuenta de servicio configurada en
+    GCP_CREDENTIALS_BASE64, interpretándolas una sola vez por proceso.
+
+    Raises:
+        ValueError: Si no hay credenciales configuradas.
+    """
+    global _credentials
+    if _credentials is None:
+        with _lock:
+            if _credentials is None:
+                string_credentials = settings.GCP_CREDENTIALS_BASE64.replace('"', "")
+                if not string_credentials:
+                    raise ValueError("GCP credentials not found")
+                account_info = json.loads(base64.b64decode(string_credentials))
+                _credentials = Credentials.from_service_account_info(account_info)
+    return _credentials
+
+
+def get_storage_client() -> storage.Client:
+    """
+    Obtiene el cliente de Cloud Storage del proceso. Su sesión HTTP mantiene
+    hasta GCP_HTTP_POOL_SIZE conexiones abiertas, suficientes para todos los
+    hilos del pool de GCP.
+    """
+    global _storage_client
+    if _storage_client is None:
+        credentials = get_credentials()
+        with _lock:
+            if _storage_client is None:
+                session = AuthorizedSession(credentials)
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=settings.GCP_HTTP_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                _storage_client = storage.Client(
+                    project=settings.GCP_PROJECT_ID,
+                    credentials=credentials,
+                    _http=session,
+                )
+                logger.info("Cliente de Google Cloud Storage creado")
+    return _storage_client
+
+
+def get_publisher_client() -> pubsub_v1.PublisherClient:
+    """
+    Obtiene el cliente de publicación de Pub/Sub del proceso, que mantiene un
+    único canal de gRPC para todas las publicaciones y las agrupa en lotes de
+    hasta PUBSUB_BATCH_MAX_MESSAGES mensajes o PUBSUB_BATCH_MAX_LATENCY
+    segundos.
+    """
+    global _publisher_client
+    if _publisher_client is None:
+        credentials = get_credentials()
+        with _lock:
+            if _publisher_client is None:
+                _publisher_client = pubsub_v1.PublisherClient(
+                    batch_settings=pubsub_v1.types.BatchSettings(
+                        max_messages=settings.PUBSUB_BATCH_MAX_MESSAGES,
+                        max_latency=settings.PUBSUB_BATCH_MAX_LATENCY,
+                    ),
+                    credentials=credentials,
+                )
+                logger.info("Cliente de Pub/Sub creado")
+    return _publisher_client
+
+
+def warm_up_clients() -> dict[str, float]:
+    """
+    Crea los clientes de Cloud Storage y Pub/Sub y abre sus conexiones antes
+    de recibir peticiones, para que la primera petición no pague la lectura
+    de las credenciales, la obtención del token y el handshake TLS.
+
+    Returns:
+        dict[str, float]: Tiempo en segundos de cada paso.
+    """
+    timings = {}
+    start = time.perf_counter()
+    client = get_storage_client()
+    timings["storage_client"] = time.perf_counter() - start
+
+    # Una consulta de metadatos obtiene el token de acceso y deja abierta una
+    # conexión con Cloud Storage; que el archivo no exista no importa
+    start = time.perf_counter()
+    client.bucket(settings.VIDEOS_BUCKET).blob(".warm-up").exists(
+        timeout=settings.GCP_WARM_UP_TIMEOUT, retry=None
+    )
+    timings["storage_connection"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    publisher = get_publisher_client()
+    timings["publisher_client"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    grpc.channel_ready_future(publisher.transport.grpc_channel).result(
+        timeout=settings.GCP_WARM_UP_TIMEOUT
+    )
+    timings["publisher_channel"] = time.perf_counter() - start
+    return timings
+
+
+def close_clients() -> None:
+    """
+    Cierra los clientes del proceso. Las publicaciones pendientes de Pub/Sub
+    se envían antes de cerrar el canal.
+    """
+    global _storage_client, _publisher_client
+    with _lock:
+        if _storage_client is not None:
+            _storage_client.close()
+            _storage_client = None
+        if _publisher_client is not None:
+            _publisher_client.stop()
+            _publisher_client.transport.close()
+            _publisher_client = None
@@ -1,12 +1,13 @@
-import base64
-import json
 import logging
 import tempfile
+from datetime import timedelta
 from typing import Any
 
 from google.cloud import storage
-from google.oauth2 import service_account
 
+from src.core.gcp.clients import get_storage_client
+from src.core.media.mp4 import Mp4Error, plan_partial_download, probe_mp4
+from src.core.media.schemas import MediaInfo
 from src.settings.base import settings
 
 logger = logging.getLogger(__name__)
@@ -14,19 +15,9 @@ logger = logging.getLogger(__name__)
 
 class GCPCloudStorage:
     def __init__(self):
-        string_credentials = settings.GCP_CREDENTIALS_BASE64.replace('"', "")
-        logger.info(f"GCP Credentials: {string_credentials}")
-        gcp_json_credentials_dict = json.loads(
-            base64.b64decode(string_credentials).decode("utf-8")
-        )
-        credentials = service_account.Credentials.from_service_account_info(
-            gcp_json_credentials_dict
-        )
-        logger.info(f"GCP Project ID: {settings.GCP_PROJECT_ID}")
-        self.client = storage.Client(
-            project=settings.GCP_PROJECT_ID, credentials=credentials
-        )
-        logger.info("Conexión a Google Cloud Storage exitosa")
+        # El cliente es compartido por el proceso, crear la clase no abre
+        # nuevas conexiones
+        self.client = get_storage_client()
 
     def upload_file(
         self,
@@ -51,24 +42,224 @@ class GCPCloudStorage:
             raise ValueError("Debe proporcionar un archivo o una ruta de archivo")
         return blob.public_url
 
-    def download_file(self, bucket_name: str, source_path: str):
+    def download_file(
+        self, bucket_name: str, source_path: str, destination_path: str = None
+    ):
         bucket = self.client.bucket(bucket_name)
         blob = bucket.blob(source_path)
+        if not destination_path:
+            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
+            temp_file.close()
+            destination_path = temp_file.name
+        blob.download_to_filename(destination_path)
+        return destination_path
+
+    def download_partial_file(
+        self, bucket_name: str, source_path: str, duration: float
+    ) -> str:
+        """
+        Descarga solo las partes de un video MP4 necesarias para decodificar
+        sus primeros segundos. El archivo local conserva el tamaño y las
+        posiciones del original, pero las partes no descargadas quedan como
+        huecos de un archivo disperso que no ocupan espacio en disco. Si el
+        archivo no es un MP4 soportado se descarga completo.
+
+        Args:
+            bucket_name (str): Nombre del bucket.
+            source_path (str): Ruta del video en el bucket.
+            duration (float): Segundos iniciales del video que se requieren.
+
+        Returns:
+            str: Ruta del archivo descargado.
+        """
+        bucket = self.client.bucket(bucket_name)
+        blob = bucket.get_blob(source_path)
+        if blob is None:
+            raise ValueError(f"Archivo {source_path} no encontrado")
+
+        def read_range(start: int, end: int) -> bytes:
+            return blob.download_as_bytes(start=start, end=end - 1, checksum=None)
+
+        try:
+            known, ranges = plan_partial_download(read_range, blob.size, duration)
+        except Mp4Error as e:
+            logger.info(f"Descarga parcial no soportada ({e}), descargando completo")
+            return self.download_file(bucket_name, source_path)
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
-        temp_file.close()
-        blob.download_to_filename(temp_file.name)
+        with temp_file:
+            temp_file.truncate(blob.size)
+            for offset, data in known.items():
+                temp_file.seek(offset)
+                temp_file.write(data)
+            for start, end in ranges:
+                temp_file.seek(start)
+                temp_file.write(read_range(start, end))
+        downloaded = sum(len(data) for data in known.values())
+        downloaded += sum(end - start for start, end in ranges)
+        logger.info(f"Descargados {downloaded} de {blob.size} bytes de {source_path}")
         return temp_file.name
 
+    def open_file(self, bucket_name: str, source_path: str, chunk_size: int = None):
+        """
+        Abre un archivo del bucket para leerlo por bloques sin descargarlo
+        completo. Cada lectura descarga solo el siguiente bloque del archivo y
+        se puede cambiar de posición con `seek`.
+
+        Args:
+            bucket_name (str): Nombre del bucket.
+            source_path (str): Ruta del archivo en el bucket.
+            chunk_size (int): Tamaño de cada bloque descargado. Por defecto se
+                usa VIDEO_STREAM_CHUNK_SIZE.
+
+        Returns:
+            BlobReader: Objeto tipo archivo de solo lectura.
+        """
+        bucket = self.client.bucket(bucket_name)
+        blob = bucket.blob(source_path)
+        return blob.open(
+            "rb", chunk_size=chunk_size or settings.VIDEO_STREAM_CHUNK_SIZE
+        )
+
+    def get_file(self, bucket_name: str, source_path: str) -> storage.Blob | None:
+        """
+        Obtiene los metadatos de un archivo del bucket (tamaño, generación,
+        fecha de modificación) sin descargar su contenido.
+
+        Args:
+            bucket_name (str): Nombre del bucket.
+            source_path (str): Ruta del archivo en el bucket.
+
+        Returns:
+            Blob | None: Archivo con sus metadatos, o None si no existe.
+        """
+        bucket = self.client.bucket(bucket_name)
+        return bucket.get_blob(source_path)
+
+    def download_range(
+        self,
+        bucket_name: str,
+        source_path: str,
+        start: int,
+        end: int,
+        generation: int | None = None,
+    ) -> bytes:
+        """
+        Descarga un rango de bytes de un archivo del bucket.
+
+        Args:
+            bucket_name (str): Nombre del bucket.
+            source_path (str): Ruta del archivo en el bucket.
+            start (int): Posición inicial del rango.
+            end (int): Posición final del rango, no incluida.
+            generation (int | None): Generación del archivo que se lee, para
+                que todos los rangos provengan de la misma versión.
+
+        Returns:
+            bytes: Contenido del rango.
+        """
+        bucket = self.client.bucket(bucket_name)
+        blob = bucket.blob(source_path, generation=generation)
+        return blob.download_as_bytes(start=start, end=end - 1, checksum=None)
+
+    def create_upload_session(
+        self,
+        bucket_name: str,
+        destination_path: str,
+        content_type: str,
+        size: int | None = None,
+        origin: str | None = None,
+        metadata: dict[str, str] | None = None,
+    ) -> str:
+        """
+        Inicia una subida reanudable de un archivo al bucket y obtiene la URL
+        de la sesión, con la que el cliente sube el contenido directamente a
+        Cloud Storage.
+
+        Args:
+            bucket_name (str): Nombre del bucket.
+            destination_path (str): Ruta del archivo en el bucket.
+            content_type (str): Tipo de contenido del archivo.
+            size (int | None): Tamaño del archivo; si se indica, Cloud Storage
+                rechaza una subida de otro tamaño.
+            origin (str | None): Origen del navegador que sube el archivo,
+                necesario para las peticiones CORS.
+            metadata (dict[str, str] | None): Metadatos del archivo, que el
+                cliente no puede modificar.
+
+        Returns:
+            str: URL de la sesión de subida.
+        """
+        bucket = self.client.bucket(bucket_name)
+        blob = bucket.blob(destination_path)
+        blob.metadata = metadata
+        return blob.create_resumable_upload_session(
+            content_type=content_type, size=size, origin=origin
+        )
+
+    def probe_file(
+        self,
+        bucket_name: str,
+        source_path: str,
+        size: int,
+        generation: int | None = None,
+        max_size: int | None = None,
+    ) -> MediaInfo:
+        """
+        Obtiene la información de un video MP4 del bucket descargando solo
+        sus cabeceras.
+
+        Args:
+            bucket_name (str): Nombre del bucket.
+            source_path (str): Ruta del video en el bucket.
+            size (int): Tamaño del video.
+            generation (int | None): Generación del archivo que se lee.
+            max_size (int | None): Tamaño máximo permitido de la caja moov.
+
+        Returns:
+            MediaInfo: Información del video.
+
+        Raises:
+            Mp4Error: Si el archivo no es un MP4 válido.
+        """
+
+        def read_range(start: int, end: int) -> bytes:
+            return self.download_range(
+                bucket_name, source_path, start, end, generation=generation
+            )
+
+        return probe_mp4(read_range, size, max_size)
+
     def download_file_as_bytes(self, bucket_name: str, source_path: str):
         bucket = self.client.bucket(bucket_name)
         blob = bucket.blob(source_path)
         return blob.download_as_bytes()
 
+    def file_exists(self, bucket_name: str, source_path: str) -> bool:
+        bucket = self.client.bucket(bucket_name)
+        return bucket.blob(source_path).exists()
+
     def list_files(self, bucket_name: str):
         bucket = self.client.bucket(bucket_name)
         return [blob.name for blob in bucket.list_blobs()]
 
-    def get_public_url(self, bucket_name: str, file_path: str):
+    def get_public_url(
+        self, bucket_name: str, file_path: str, expiration: int = 3600
+    ) -> str:
+        """
+        Genera una URL firmada (V4) para descargar un archivo del bucket sin
+        pasar por la API.
+
+        Args:
+            bucket_name (str): Nombre del bucket.
+            file_path (str): Ruta del archivo en el bucket.
+            expiration (int): Segundos de validez de la URL.
+
+        Returns:
+            str: URL firmada.
+        """
         bucket = self.client.bucket(bucket_name)
         blob = bucket.blob(file_path)
-        return blob.generate_signed_url(expiration=3600)
+        # Un entero se interpretaría como un timestamp absoluto
+        return blob.generate_signed_url(
+            version="v4", expiration=timedelta(seconds=expiration), method="GET"
+        )
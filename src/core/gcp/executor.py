@@ -0,0 +1,291 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable
+
+from google.cloud.storage import Blob
+
+from src.apps.commons.exceptions import CustomException
+from src.core.gcp.clients import warm_up_clients
+from src.core.gcp.cloud_storage.base import GCPCloudStorage
+from src.core.gcp.pubsub.publisher import PubSubPublisher
+from src.core.media.schemas import MediaInfo
+from src.settings.base import settings
+
+logger = logging.getLogger(__name__)
+
+
+class GCPExecutor:
+    """
+    Pool de hilos dedicado a las llamadas bloqueantes de los SDK de Google
+    Cloud (Cloud Storage y Pub/Sub), para ejecutarlas desde los handlers
+    async sin bloquear el event loop.
+
+    El pool tiene GCP_EXECUTOR_WORKERS hilos y admite hasta
+    GCP_EXECUTOR_MAX_PENDING llamadas en curso o en espera; por encima de ese
+    límite las llamadas se rechazan de inmediato con un error 503. Las
+    llamadas de una operación ya admitida, como los bloques de una descarga
+    cuya respuesta ya comenzó, se ejecutan con `run_admitted` y no se
+    rechazan.
+    """
+
+    def __init__(self, workers: int | None = None, max_pending: int | None = None):
+        self.workers = workers or settings.GCP_EXECUTOR_WORKERS
+        self.max_pending = max_pending or settings.GCP_EXECUTOR_MAX_PENDING
+        self.executor: ThreadPoolExecutor | None = None
+        # Los contadores solo se modifican desde el event loop, salvo
+        # `active`, que se modifica desde los hilos del pool
+        self.pending = 0
+        self.active = 0
+        self.lock = threading.Lock()
+        self.stats = {
+            "calls": 0,
+            "errors": 0,
+            "rejected": 0,
+            "peak_pending": 0,
+            "wait_time": 0.0,
+            "run_time": 0.0,
+        }
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="gcp"
+            )
+        return self.executor
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Ejecuta una llamada bloqueante en el pool.
+
+        Args:
+            func (Callable): Función o método del SDK.
+            *args: Argumentos posicionales de la función.
+            **kwargs: Argumentos por nombre de la función.
+
+        Returns:
+            Any: Resultado de la función.
+
+        Raises:
+            CustomException: Si el pool está saturado.
+        """
+        if self.pending >= self.max_pending:
+            self.stats["rejected"] += 1
+            logger.warning(f"Pool de GCP saturado, se rechaza {func.__qualname__}")
+            raise CustomException(
+                error="error_busy",
+                message="El servidor está ocupado, intente nuevamente",
+                status_code=503,
+            )
+        return await self.run_admitted(func, *args, **kwargs)
+
+    async def run_admitted(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Ejecuta una llamada bloqueante en el pool sin verificar si está
+        saturado. La llamada cuenta en `pending`, por lo que las llamadas
+        nuevas se siguen rechazando mientras el pool esté saturado.
+
+        Args:
+            func (Callable): Función o método del SDK.
+            *args: Argumentos posicionales de la función.
+            **kwargs: Argumentos por nombre de la función.
+
+        Returns:
+            Any: Resultado de la función.
+        """
+        self.pending += 1
+        self.stats["peak_pending"] = max(self.stats["peak_pending"], self.pending)
+        queued_at = time.perf_counter()
+        started_at = None
+
+        def call():
+            nonlocal started_at
+            started_at = time.perf_counter()
+            with self.lock:
+                self.active += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.active -= 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.get_executor(), call)
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self.pending -= 1
+            finished_at = time.perf_counter()
+            self.stats["calls"] += 1
+            if started_at is not None:
+                self.stats["wait_time"] += started_at - queued_at
+                self.stats["run_time"] += finished_at - started_at
+                logger.debug(
+                    f"{func.__qualname__}: espera {started_at - queued_at:.3f} s, "
+                    f"ejecución {finished_at - started_at:.3f} s"
+                )
+
+    def get_stats(self) -> dict:
+        """
+        Obtiene las métricas del pool. `pending` incluye las llamadas en curso
+        (`active`) y las que esperan un hilo libre; si `pending` supera a
+        `workers` el pool está saturado.
+
+        Returns:
+            dict: Métricas actuales y acumuladas del pool, con los tiempos en
+            segundos.
+        """
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "active": self.active,
+            **self.stats,
+        }
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+
+gcp_executor = GCPExecutor()
+
+
+async def warm_up_gcp_clients() -> None:
+    """
+    Crea y conecta los clientes de Cloud Storage y Pub/Sub en el pool de GCP
+    al iniciar la API. Si no hay credenciales configuradas o la conexión
+    falla, los clientes se crean con la primera petición que los use.
+    """
+    if not settings.GCP_CREDENTIALS_BASE64:
+        logger.info("Sin credenciales de GCP, se omite la inicialización de clientes")
+        return
+    start = time.perf_counter()
+    try:
+        timings = await gcp_executor.run(warm_up_clients)
+    except Exception as e:
+        logger.warning(f"Error al inicializar los clientes de GCP: {e}")
+        return
+    steps = ", ".join(f"{step} {value:.3f} s" for step, value in timings.items())
+    logger.info(
+        f"Clientes de GCP inicializados en {time.perf_counter() - start:.3f} s "
+        f"({steps})"
+    )
+
+
+class AsyncCloudStorage:
+    """
+    Fachada asíncrona de GCPCloudStorage: cada método ejecuta la llamada del
+    cliente síncrono en el pool de GCP y se puede esperar con await.
+    """
+
+    def __init__(self, executor: GCPExecutor | None = None):
+        self.executor = executor or gcp_executor
+        self.storage: GCPCloudStorage | None = None
+
+    async def get_storage(self) -> GCPCloudStorage:
+        # La primera vez se crea el cliente del proceso, que es bloqueante
+        if self.storage is None:
+            self.storage = await self.executor.run(GCPCloudStorage)
+        return self.storage
+
+    async def upload_file(self, **kwargs) -> Any:
+        storage = await self.get_storage()
+        return await self.executor.run(storage.upload_file, **kwargs)
+
+    async def download_file_as_bytes(self, bucket_name: str, source_path: str) -> bytes:
+        storage = await self.get_storage()
+        return await self.executor.run(
+            storage.download_file_as_bytes,
+            bucket_name=bucket_name,
+            source_path=source_path,
+        )
+
+    async def get_file(self, bucket_name: str, source_path: str) -> Blob | None:
+        storage = await self.get_storage()
+        return await self.executor.run(
+            storage.get_file, bucket_name=bucket_name, source_path=source_path
+        )
+
+    async def iter_range(
+        self,
+        bucket_name: str,
+        source_path: str,
+        start: int,
+        end: int,
+        generation: int | None = None,
+        chunk_size: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Lee un rango de un archivo del bucket por bloques de tamaño fijo, de
+        forma que en memoria solo se mantiene el bloque que se está enviando.
+        La descarga se admite al obtener el archivo, antes de enviar la
+        respuesta, por lo que los bloques no se rechazan aunque el pool esté
+        saturado: un error a mitad de la respuesta dejaría el video cortado.
+
+        Args:
+            bucket_name (str): Nombre del bucket.
+            source_path (str): Ruta del archivo en el bucket.
+            start (int): Posición inicial del rango.
+            end (int): Posición final del rango, no incluida.
+            generation (int | None): Generación del archivo que se lee.
+            chunk_size (int | None): Tamaño de cada bloque. Por defecto se usa
+                VIDEO_DOWNLOAD_CHUNK_SIZE.
+
+        Yields:
+            bytes: Bloques consecutivos del rango.
+        """
+        storage = await self.get_storage()
+        chunk_size = chunk_size or settings.VIDEO_DOWNLOAD_CHUNK_SIZE
+        for offset in range(start, end, chunk_size):
+            yield await self.executor.run_admitted(
+                storage.download_range,
+                bucket_name=bucket_name,
+                source_path=source_path,
+                start=offset,
+                end=min(offset + chunk_size, end),
+                generation=generation,
+            )
+
+    async def create_upload_session(self, **kwargs) -> str:
+        storage = await self.get_storage()
+        return await self.executor.run(storage.create_upload_session, **kwargs)
+
+    async def probe_file(self, **kwargs) -> MediaInfo:
+        storage = await self.get_storage()
+        return await self.executor.run(storage.probe_file, **kwargs)
+
+    async def get_public_url(
+        self, bucket_name: str, file_path: str, expiration: int
+    ) -> str:
+        storage = await self.get_storage()
+        return await self.executor.run(
+            storage.get_public_url,
+            bucket_name=bucket_name,
+            file_path=file_path,
+            expiration=expiration,
+        )
+
+    async def file_exists(self, bucket_name: str, source_path: str) -> bool:
+        storage = await self.get_storage()
+        return await self.executor.run(
+            storage.file_exists, bucket_name=bucket_name, source_path=source_path
+        )
+
+
+class AsyncPubSubPublisher:
+    """
+    Fachada asíncrona de PubSubPublisher. La publicación espera la
+    confirmación de Pub/Sub (`future.result()`) dentro del pool de GCP.
+    """
+
+    def __init__(self, executor: GCPExecutor | None = None):
+        self.executor = executor or gcp_executor
+
+    async def run(self, data: dict[str, Any], event_type: str) -> str:
+        return await self.executor.run(PubSubPublisher().run, data, event_type)
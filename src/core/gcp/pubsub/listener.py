@@ -1,50 +1,208 @@
 import base64
+import functools
 import json
 import logging
+import multiprocessing
+import queue
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from google.cloud import pubsub_v1  # type: ignore
 from google.cloud.pubsub_v1.subscriber.message import Message  # type: ignore
+from google.cloud.pubsub_v1.subscriber.scheduler import ThreadScheduler  # type: ignore
 from google.cloud.pubsub_v1.types import FlowControl  # type: ignore
 from google.oauth2.service_account import Credentials  # type: ignore
 
-from src.apps.tasks.tasks import process_video
+from src.apps.tasks.models import IN_FLIGHT_STATUSES, Task
+from src.apps.tasks.tasks import (
+    TaskInProgressError,
+    fail_task,
+    process_video,
+    release_task,
+)
+from src.core.database.base import session as session_factory
 from src.core.database.dependencies import get_db
 from src.core.gcp.pubsub.schemas import PubSubEventMessage
+from src.core.logger.base import setup_logging
 from src.settings.base import settings
 
 logger = logging.getLogger(__name__)
 
 
-def callback(message: Message, *args, **kwargs):
+def init_job_process():
     """
-    Ejecuta el procesamiento asíncrono del mensaje y reconoce el mensaje.
+    Inicializa cada proceso del pool. Los procesos ignoran SIGINT: al
+    presionar Ctrl+C la señal llega a todo el grupo de procesos, y es el
+    suscriptor el que deja de recibir mensajes y espera a que los trabajos en
+    curso terminen.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    setup_logging()
+
+
+class JobExecutor:
+    """
+    Pool acotado de procesos en el que se ejecutan los trabajos recibidos por
+    el suscriptor.
+
+    Cada trabajo corre en un proceso independiente (iniciado con spawn para no
+    heredar las conexiones ni los hilos del suscriptor), tomado de uno de
+    `max_workers` pools de un solo proceso. Si un proceso termina de forma
+    abrupta, por ejemplo por falta de memoria, solo falla el trabajo que
+    ejecutaba: los trabajos de los demás procesos continúan, y el pool del
+    proceso caído se reemplaza por uno nuevo para los siguientes trabajos.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executors: queue.SimpleQueue[ProcessPoolExecutor] = queue.SimpleQueue()
+        for _ in range(max_workers):
+            self._executors.put(self._create_executor())
+        self._crashes: dict[str, int] = {}
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_job_process,
+        )
+
+    def record_crash(self, message_id: str) -> int:
+        """
+        Registra que el trabajo de un mensaje terminó de forma abrupta.
+
+        Returns:
+            int: Cantidad de caídas del trabajo del mensaje.
+        """
+        with self._lock:
+            self._crashes[message_id] = self._crashes.get(message_id, 0) + 1
+            return self._crashes[message_id]
+
+    def clear_crashes(self, message_id: str) -> None:
+        with self._lock:
+            self._crashes.pop(message_id, None)
+
+    def run(self, fn, **kwargs):
+        """
+        Ejecuta un trabajo en un proceso libre y espera su resultado.
+
+        Raises:
+            BrokenProcessPool: Si el proceso terminó de forma abrupta durante
+                este trabajo.
+        """
+        executor = self._executors.get()
+        try:
+            return executor.submit(fn, **kwargs).result()
+        except BrokenProcessPool:
+            logger.info("Job process died, creating a new one...")
+            executor.shutdown(wait=False)
+            executor = self._create_executor()
+            raise
+        finally:
+            self._executors.put(executor)
+
+    def shutdown(self):
+        for _ in range(self.max_workers):
+            self._executors.get().shutdown(wait=True)
+
+
+def callback(message: Message, *args, executor: JobExecutor | None = None, **kwargs):
+    """
+    Ejecuta el procesamiento del mensaje y reconoce el mensaje.
 
-    Esta función intenta obtener el event lopp actual o crear uno nuevo si
-    no existe. Luego, ejecuta la función de callback asíncrona utilizando el event
-    loop. Si ocurre un error durante el procesamiento del mensaje, se captura
-    y se registra en el log. Finalmente, una vez la funcion es procesadareconoce
-    el mensaje.
+    Si se suministra un pool de procesos el trabajo se ejecuta en él y el hilo
+    del suscriptor espera a que termine, de forma que el control de flujo del
+    suscriptor limita la cantidad de trabajos simultáneos. Si ocurre un error
+    durante el procesamiento del mensaje, se captura y se registra en el log.
+    Finalmente, una vez la funcion es procesada reconoce el mensaje.
+
+    Si el proceso que ejecutaba el trabajo termina de forma abrupta, la tarea
+    vuelve a la cola y el mensaje se rechaza para que Pub/Sub lo entregue de
+    nuevo, hasta PUBSUB_MAX_JOB_CRASHES veces; después el mensaje se reconoce
+    y la tarea se marca como fallida, para que un video que siempre hace caer
+    el proceso no se reintente indefinidamente. Si la tarea la está
+    procesando otro worker el mensaje también se rechaza, para que se
+    entregue de nuevo si ese worker no la completa.
 
     Args:
         message (Message): El mensaje recibido de Pub/Sub.
+        executor (JobExecutor | None): Pool de procesos donde se ejecuta el
+            trabajo. Si no se suministra se ejecuta en el hilo actual.
     """
     try:
         raw_message = json.loads(message.data.decode("utf-8"))
         logger.info(f"Received message: {raw_message}")
         processed_message = PubSubEventMessage(**raw_message)
         logger.info(f"Processing message: {processed_message}")
-        process_video(
-            video_id=processed_message.data["video_id"],
-            task_id=processed_message.data["task_id"],
-        )
+        job_kwargs = {
+            "video_id": processed_message.data["video_id"],
+            "task_id": processed_message.data["task_id"],
+        }
+        if executor:
+            executor.run(process_video, **job_kwargs)
+        else:
+            process_video(**job_kwargs)
         logger.info("Message processed successfully")
+    except TaskInProgressError as e:
+        logger.info(f"{e}, message will be redelivered")
+        message.nack()
+        return
+    except BrokenProcessPool as e:
+        logger.exception(e)
+        # Si la suscripción tiene política de dead letter, Pub/Sub cuenta los
+        # intentos de entrega; si no, se cuentan las caídas en este proceso
+        crashes = max(
+            executor.record_crash(message.message_id),
+            message.delivery_attempt or 0,
+        )
+        if crashes < settings.PUBSUB_MAX_JOB_CRASHES:
+            logger.info(f"Job process died ({crashes}), message will be redelivered")
+            requeue_job(job_kwargs["task_id"])
+            message.nack()
+            return
+        logger.error(f"Job process died {crashes} times, discarding message")
+        discard_job(job_kwargs["task_id"])
     except Exception as e:
         logger.info("Error processing message")
         logger.exception(e)
+    if executor:
+        executor.clear_crashes(message.message_id)
     message.ack()
     logger.info("Message acknowledged...")
 
 
+def requeue_job(task_id: int) -> None:
+    """
+    Devuelve a la cola la tarea de un trabajo cuyo proceso terminó de forma
+    abrupta, para que la siguiente entrega del mensaje la tome. Si no se
+    puede, la tarea se toma de nuevo cuando deja de recibir señales del
+    worker (TASK_PROCESSING_TIMEOUT).
+    """
+    try:
+        with session_factory() as session:
+            release_task(session, task_id)
+    except Exception as e:
+        logger.exception(e)
+
+
+def discard_job(task_id: int) -> None:
+    """
+    Marca como fallida la tarea de un trabajo que se descarta, si aún no
+    terminó.
+    """
+    try:
+        with session_factory() as session:
+            task = session.get(Task, task_id)
+            if task and task.status in IN_FLIGHT_STATUSES:
+                fail_task(session, task)
+                session.commit()
+    except Exception as e:
+        logger.exception(e)
+
+
 def get_pubsub_credentials():
     """
     Obtiene las credenciales de Pub/Sub desde una cadena codificada en base64.
@@ -67,23 +225,43 @@ def run_pubsub_subscriber():
 
     Esta función crea un cliente suscriptor de Pub/Sub utilizando las credenciales
     obtenidas, se suscribe a un tópico especificado y procesa los mensajes entrantes.
-    También maneja la cancelación en caso de una interrupción del teclado (Ctrl+C).
+    Hasta PUBSUB_MAX_CONCURRENT_JOBS trabajos se ejecutan en paralelo en un pool
+    de procesos; el control de flujo evita recibir más mensajes de los que el
+    pool puede atender. Ante una interrupción del teclado (Ctrl+C) o una señal
+    SIGTERM deja de recibir mensajes y espera a que terminen los trabajos en
+    curso antes de salir; los procesos del pool ignoran SIGINT para que
+    Ctrl+C no interrumpa esos trabajos.
     """
+    max_jobs = settings.PUBSUB_MAX_CONCURRENT_JOBS
+    executor = JobExecutor(max_workers=max_jobs)
+    shutdown = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: shutdown.set())
     with pubsub_v1.SubscriberClient(credentials=get_pubsub_credentials()) as subscriber:
         logger.info(f"Subscribing to topic {settings.PUBSUB_SUBSCRIPTION_ID}...")
         subscription_path = subscriber.subscription_path(
             settings.GCP_PROJECT_ID, settings.PUBSUB_SUBSCRIPTION_ID
         )
         # max_messages especifica el número máximo de mensajes que el subscriptor
-        # puede manejar simultáneamente.
+        # puede manejar simultáneamente. Cada callback ocupa un hilo mientras su
+        # trabajo se ejecuta en el pool de procesos.
         future = subscriber.subscribe(
             subscription_path,
-            callback=callback,
-            flow_control=FlowControl(max_messages=1),
+            callback=functools.partial(callback, executor=executor),
+            flow_control=FlowControl(max_messages=max_jobs),
+            scheduler=ThreadScheduler(
+                executor=ThreadPoolExecutor(max_workers=max_jobs)
+            ),
+            await_callbacks_on_shutdown=True,
         )
+        logger.info(f"Processing up to {max_jobs} jobs concurrently")
         try:
-            future.result()
+            while not shutdown.wait(timeout=1):
+                if future.done():
+                    future.result()
         except KeyboardInterrupt:
-            logger.info("Shutting down...")
-            future.cancel()
-            future.result()
+            pass
+        logger.info("Shutting down, waiting for in-flight jobs...")
+        future.cancel()
+        future.result()
+    executor.shutdown()
+    logger.info("Subscriber stopped")
@@ -1,11 +1,9 @@
-import base64
 import json
 import logging
+from concurrent.futures import Future
 from typing import Any
 
-from google.cloud import pubsub_v1  # type: ignore
-from google.oauth2.service_account import Credentials  # type: ignore
-
+from src.core.gcp.clients import get_publisher_client
 from src.core.gcp.pubsub.handlers import PubSubEvents
 from src.core.gcp.pubsub.schemas import PubSubEventMessage
 from src.settings.base import settings
@@ -24,12 +22,16 @@ class PubSubPublisher:
     Métodos:
     --------
     __start_publisher():
-        Inicializa el cliente de publicación de Pub/Sub con las credenciales
-        proporcionadas en la configuración.
+        Obtiene el cliente de publicación de Pub/Sub del proceso, creado con
+        las credenciales proporcionadas en la configuración.
 
     __send_message():
         Envía un mensaje al tópico de Pub/Sub con los datos del evento.
 
+    publish(data: dict[str, Any], event_type: str):
+        Agrega el mensaje al lote de publicación y retorna su Future sin
+        esperar la confirmación.
+
     run(data: dict[str, Any], event_type: str):
         Ejecuta el proceso completo de publicación de un evento, incluyendo
         la inicialización del servicio, el registro del evento y el envío del
@@ -57,9 +59,8 @@ class PubSubPublisher:
             raise ValueError("GCP project ID not found")
         if not settings.PUBSUB_TOPIC_ID:
             raise ValueError("Pub/Sub topic ID not found")
-        account_info = json.loads(base64.b64decode(settings.GCP_CREDENTIALS_BASE64))
-        credentials = Credentials.from_service_account_info(account_info)
-        self.publisher = pubsub_v1.PublisherClient(credentials=credentials)
+        # El cliente es compartido por el proceso y reutiliza su canal de gRPC
+        self.publisher = get_publisher_client()
 
     def __send_message(self):
         topic_path = self.publisher.topic_path(
@@ -69,7 +70,15 @@ class PubSubPublisher:
         message = json.dumps(data.model_dump()).encode("utf-8")
         self.future = self.publisher.publish(topic_path, message)
 
-    def run(self, data: dict[str, Any], event_type: str):
+    def publish(self, data: dict[str, Any], event_type: str) -> Future:
+        """
+        Agrega el mensaje al lote del cliente sin esperar la confirmación de
+        Pub/Sub. El cliente envía el lote según PUBSUB_BATCH_MAX_MESSAGES y
+        PUBSUB_BATCH_MAX_LATENCY.
+
+        Returns:
+            Future: Resultado de la publicación, con el id del mensaje.
+        """
         self.data = data
         self.event_type = event_type
 
@@ -83,4 +92,7 @@ class PubSubPublisher:
             logger.error(e)
             raise e
 
-        return self.future.result()
+        return self.future
+
+    def run(self, data: dict[str, Any], event_type: str):
+        return self.publish(data, event_type).result()
@@ -0,0 +1,253 @@
+import logging
+import re
+import subprocess
+import threading
+from typing import Callable, Iterable
+
+from imageio_ffmpeg import get_ffmpeg_exe
+
+from src.core.media.schemas import MediaInfo
+from src.settings.base import settings
+
+logger = logging.getLogger(__name__)
+
+AUDIO_CHANNELS = {"mono": 1, "stereo": 2, "2.1": 3, "quad": 4, "5.1": 6, "7.1": 8}
+
+
+class FFmpegError(Exception):
+    pass
+
+
+def get_ffmpeg_binary() -> str:
+    """
+    Obtiene la ruta del ejecutable de ffmpeg.
+
+    Usa el ejecutable configurado en FFMPEG_BINARY o, en su defecto, el que se
+    distribuye con imageio-ffmpeg (dependencia de moviepy).
+
+    Returns:
+        str: Ruta del ejecutable de ffmpeg.
+    """
+    return settings.FFMPEG_BINARY or get_ffmpeg_exe()
+
+
+def run_ffmpeg(
+    args: list[str],
+    input_chunks: Iterable[bytes] | None = None,
+    on_progress: Callable[[float], None] | None = None,
+) -> str:
+    """
+    Ejecuta ffmpeg con los argumentos indicados.
+
+    Args:
+        args (list[str]): Argumentos de entrada, filtros y salida de ffmpeg.
+        input_chunks (Iterable[bytes] | None): Si se indica, los bloques se
+            escriben en la entrada estándar de ffmpeg (entrada `pipe:0`)
+            mientras se procesan. Cuando ffmpeg deja de leer la entrada, por
+            ejemplo al completar el recorte con `-t`, se dejan de consumir.
+        on_progress (Callable[[float], None] | None): Si se indica, se llama
+            con los segundos de salida escritos cada vez que ffmpeg reporta
+            su progreso.
+
+    Returns:
+        str: Salida de error de ffmpeg, donde se reportan los logs.
+
+    Raises:
+        FFmpegError: Si ffmpeg termina con un código de salida distinto de 0.
+    """
+    progress_args = ["-progress", "pipe:1", "-nostats"] if on_progress else []
+    command = [
+        get_ffmpeg_binary(),
+        "-hide_banner",
+        "-nostdin",
+        "-y",
+        *progress_args,
+        *args,
+    ]
+    logger.debug(f"Ejecutando {' '.join(command)}")
+    if input_chunks is None and on_progress is None:
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise FFmpegError(result.stderr.strip()[-2000:])
+        return result.stderr
+
+    # -nostdin solo desactiva la interacción por teclado, la entrada estándar
+    # se sigue usando como entrada de datos con pipe:0
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL if input_chunks is None else subprocess.PIPE,
+        stdout=subprocess.PIPE if on_progress else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    errors = []
+    stderr = []
+
+    def write_input() -> None:
+        try:
+            for chunk in input_chunks:
+                process.stdin.write(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            # ffmpeg cerró la entrada porque ya no requiere más datos
+            pass
+        except Exception as e:
+            errors.append(e)
+            process.kill()
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    def read_stderr() -> None:
+        stderr.append(process.stderr.read().decode("utf-8", errors="replace"))
+
+    threads = [threading.Thread(target=read_stderr, daemon=True)]
+    if input_chunks is not None:
+        threads.append(threading.Thread(target=write_input, daemon=True))
+    for thread in threads:
+        thread.start()
+    if on_progress:
+        # El progreso se reporta en bloques de líneas clave=valor, el tiempo
+        # de salida está en microsegundos (out_time_ms también lo está)
+        for line in process.stdout:
+            key, _, value = line.decode("utf-8", errors="replace").partition("=")
+            if key in ("out_time_us", "out_time_ms") and value.strip().isdigit():
+                try:
+                    on_progress(int(value) / 1_000_000)
+                except Exception as e:
+                    logger.exception(e)
+    process.wait()
+    for thread in threads:
+        thread.join()
+    # Un error al leer la entrada se reporta aunque ffmpeg haya terminado, ya
+    # que el resultado estaría incompleto
+    if errors:
+        raise errors[0]
+    if process.returncode != 0:
+        raise FFmpegError(stderr[0].strip()[-2000:])
+    return stderr[0]
+
+
+def get_keyframe_times(source: str, duration: float | None = None) -> list[float]:
+    """
+    Obtiene los tiempos de los keyframes de un video decodificando solo los
+    keyframes.
+
+    Args:
+        source (str): Ruta del video.
+        duration (float | None): Si se indica, solo se analizan los primeros
+            segundos del video.
+
+    Returns:
+        list[float]: Tiempos en segundos de los keyframes.
+    """
+    limit = ["-t", str(duration)] if duration else []
+    output = run_ffmpeg(
+        [
+            "-skip_frame",
+            "nokey",
+            *limit,
+            "-i",
+            source,
+            "-map",
+            "0:v:0",
+            "-vf",
+            "showinfo",
+            "-f",
+            "null",
+            "-",
+        ]
+    )
+    return [float(time) for time in re.findall(r"pts_time:(-?\d+(?:\.\d+)?)", output)]
+
+
+def probe_media(source: str, data: bytes | None = None) -> MediaInfo:
+    """
+    Obtiene la información de un archivo multimedia a partir de la cabecera
+    que reporta `ffmpeg -i`, sin decodificar el contenido.
+
+    Args:
+        source (str): Ruta o URL del archivo multimedia.
+        data (bytes | None): Si se indica, se analizan estos bytes (por
+            ejemplo, el inicio de un archivo) en lugar de `source`.
+
+    Returns:
+        MediaInfo: Duración, bitrate y parámetros de los streams de video y
+        audio encontrados.
+
+    Raises:
+        FFmpegError: Si ffmpeg no reconoce el archivo.
+    """
+    if data is not None:
+        source = "pipe:0"
+    command = [get_ffmpeg_binary(), "-hide_banner", "-i", source]
+    result = subprocess.run(
+        command,
+        input=data,
+        stdin=subprocess.DEVNULL if data is None else None,
+        capture_output=True,
+    )
+    return parse_media_info(result.stderr.decode("utf-8", errors="replace"))
+
+
+def parse_media_info(output: str) -> MediaInfo:
+    """
+    Interpreta la salida de `ffmpeg -i`.
+
+    Args:
+        output (str): Salida de error de ffmpeg.
+
+    Returns:
+        MediaInfo: Información del archivo multimedia.
+
+    Raises:
+        FFmpegError: Si la salida no contiene la descripción de un archivo.
+    """
+    if not re.search(r"^Input #0", output, re.MULTILINE):
+        raise FFmpegError(output.strip()[-2000:] or "Archivo no reconocido")
+    info = MediaInfo()
+    duration = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", output)
+    if duration:
+        hours, minutes, seconds = duration.groups()
+        info.duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    bitrate = re.search(r"bitrate: (\d+) kb/s", output)
+    if bitrate:
+        info.bitrate = int(bitrate.group(1)) * 1000
+    video = re.search(r"Stream #\d+:\d+.*?: Video: (.*)", output)
+    if video:
+        line = video.group(1)
+        info.video_codec = line.split(" ")[0].strip(",")
+        profile = re.match(r"\S+ \(([^)/]+)\)", line)
+        if profile:
+            info.video_profile = profile.group(1)
+        pixel_format = re.match(r"[^,]+, (\w+)", line)
+        if pixel_format:
+            info.pixel_format = pixel_format.group(1)
+        size = re.search(r", (\d+)x(\d+)", line)
+        if size:
+            info.width, info.height = int(size.group(1)), int(size.group(2))
+        # Los videos grabados en vertical indican una rotación que ffmpeg
+        # aplica al decodificarlos. La matriz de transformación indica los
+        # grados en sentido antihorario y la etiqueta rotate en sentido
+        # horario
+        display_matrix = re.search(r"rotation of (-?\d+(?:\.\d+)?) degrees", output)
+        rotate = re.search(r"rotate\s*: (-?\d+)", output)
+        if display_matrix:
+            info.rotation = round(-float(display_matrix.group(1))) % 360 or None
+        elif rotate:
+            info.rotation = int(rotate.group(1)) % 360 or None
+        # Se reportan las dimensiones ya rotadas
+        if size and info.rotation is not None and info.rotation % 180 == 90:
+            info.width, info.height = info.height, info.width
+        fps = re.search(r", (\d+(?:\.\d+)?) fps", line)
+        if fps:
+            info.fps = float(fps.group(1))
+    audio = re.search(r"Stream #\d+:\d+.*?: Audio: (.*)", output)
+    if audio:
+        line = audio.group(1)
+        info.audio_codec = line.split(" ")[0].strip(",")
+        sample_rate = re.search(r", (\d+) Hz, ([\w.]+)", line)
+        if sample_rate:
+            info.audio_sample_rate = int(sample_rate.group(1))
+            info.audio_channels = AUDIO_CHANNELS.get(sample_rate.group(2))
+    return info
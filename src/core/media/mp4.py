@@ -0,0 +1,591 @@
+import logging
+import math
+import struct
+from typing import Callable
+
+from src.core.media.schemas import MediaInfo
+
+logger = logging.getLogger(__name__)
+
+# Tamaño del primer bloque que se lee, suficiente para las cajas iniciales y
+# para el moov de la mayoría de archivos con faststart
+HEAD_READ_SIZE = 64 * 1024
+# Rangos de bytes separados por menos de esta distancia se descargan juntos
+RANGE_MERGE_GAP = 256 * 1024
+# Cantidad máxima de cajas del primer nivel que se recorren, cada cabecera
+# fuera del primer bloque cuesta una lectura
+MAX_TOP_LEVEL_BOXES = 256
+
+# Nombres de los codecs según el tipo de entrada de la caja stsd, con la
+# nomenclatura que usa ffmpeg
+CODECS = {
+    b"avc1": "h264",
+    b"avc3": "h264",
+    b"hvc1": "hevc",
+    b"hev1": "hevc",
+    b"mp4v": "mpeg4",
+    b"av01": "av1",
+    b"vp09": "vp9",
+    b"mp4a": "aac",
+    b".mp3": "mp3",
+    b"ac-3": "ac3",
+    b"ec-3": "eac3",
+    b"Opus": "opus",
+    b"fLaC": "flac",
+}
+# Tipos de objeto de MPEG-4 que corresponden a MP3 dentro de una entrada mp4a
+MP3_OBJECT_TYPES = {0x69, 0x6B}
+# Formato de pixel de los perfiles de H.264 que solo admiten un formato
+H264_PIXEL_FORMATS = {66: "yuv420p", 77: "yuv420p", 88: "yuv420p", 100: "yuv420p"}
+# Nombres de los perfiles de H.264 como los reporta ffmpeg
+H264_PROFILES = {
+    66: "Baseline",
+    77: "Main",
+    88: "Extended",
+    100: "High",
+    110: "High 10",
+    122: "High 4:2:2",
+    244: "High 4:4:4 Predictive",
+}
+
+# Recibe el inicio y el fin (exclusivo) del rango y retorna los bytes
+RangeReader = Callable[[int, int], bytes]
+
+
+class Mp4Error(Exception):
+    pass
+
+
+def parse_box_header(data: bytes, offset: int, limit: int) -> tuple[bytes, int, int]:
+    """
+    Interpreta la cabecera de una caja MP4.
+
+    Args:
+        data (bytes): Bytes que contienen la caja.
+        offset (int): Posición de la caja dentro de `data`.
+        limit (int): Posición donde termina la caja contenedora, usada para las
+            cajas que se extienden hasta el final.
+
+    Returns:
+        tuple[bytes, int, int]: Tipo de la caja, tamaño total y tamaño de la
+        cabecera.
+    """
+    if offset + 8 > len(data):
+        raise Mp4Error("Cabecera de caja incompleta")
+    size, box_type = struct.unpack(">I4s", data[offset : offset + 8])
+    header_size = 8
+    if size == 1:
+        if offset + 16 > len(data):
+            raise Mp4Error("Cabecera de caja incompleta")
+        size = struct.unpack(">Q", data[offset + 8 : offset + 16])[0]
+        header_size = 16
+    elif size == 0:
+        size = limit - offset
+    if size < header_size:
+        raise Mp4Error(f"Tamaño de caja {box_type!r} inválido")
+    return box_type, size, header_size
+
+
+def build_box_header(box_type: bytes, size: int) -> bytes:
+    """
+    Construye la cabecera de una caja, con el tamaño extendido de 64 bits si
+    no cabe en 32 bits.
+    """
+    if size > 0xFFFFFFFF:
+        return struct.pack(">I4sQ", 1, box_type, size)
+    return struct.pack(">I4s", size, box_type)
+
+
+def iter_boxes(data: bytes, start: int, end: int):
+    """
+    Recorre las cajas contenidas entre `start` y `end`.
+
+    Yields:
+        tuple[bytes, int, int]: Tipo de la caja, inicio y fin de su contenido.
+    """
+    offset = start
+    while offset + 8 <= end:
+        box_type, size, header_size = parse_box_header(data, offset, end)
+        yield box_type, offset + header_size, min(offset + size, end)
+        offset += size
+
+
+def find_child(data: bytes, start: int, end: int, path: list[bytes]):
+    for box_type, child_start, child_end in iter_boxes(data, start, end):
+        if box_type == path[0]:
+            if len(path) == 1:
+                return child_start, child_end
+            return find_child(data, child_start, child_end, path[1:])
+    return None
+
+
+def read_top_level_boxes(
+    read_range: RangeReader, file_size: int
+) -> tuple[list[tuple[bytes, int, int]], bytes]:
+    """
+    Obtiene las cajas del primer nivel del archivo leyendo solo sus cabeceras.
+    El recorrido termina en la primera caja moof (archivo fragmentado) o en la
+    primera caja mdat posterior a la caja moov, ya que las cajas siguientes no
+    se requieren para decodificar el archivo.
+
+    Args:
+        read_range (RangeReader): Función que lee un rango de bytes del archivo.
+        file_size (int): Tamaño del archivo.
+
+    Returns:
+        tuple[list[tuple[bytes, int, int]], bytes]: Tipo, inicio y tamaño de
+        cada caja, incluida la caja en la que termina el recorrido, y los
+        primeros bytes leídos del archivo.
+
+    Raises:
+        Mp4Error: Si una cabecera es inválida o el archivo tiene más de
+            MAX_TOP_LEVEL_BOXES cajas antes de la caja moov.
+    """
+    head = read_range(0, min(HEAD_READ_SIZE, file_size))
+    boxes = []
+    offset = 0
+    has_moov = False
+    while offset < file_size:
+        if len(boxes) >= MAX_TOP_LEVEL_BOXES:
+            raise Mp4Error("El archivo tiene demasiadas cajas")
+        if offset + 16 <= len(head):
+            header = head[offset : offset + 16]
+        else:
+            header = read_range(offset, min(offset + 16, file_size))
+        box_type, size, _ = parse_box_header(header, 0, file_size - offset)
+        boxes.append((box_type, offset, size))
+        if box_type == b"moof" or (box_type == b"mdat" and has_moov):
+            break
+        has_moov = has_moov or box_type == b"moov"
+        offset += size
+    return boxes, head
+
+
+def read_moov(
+    read_range: RangeReader, file_size: int, max_size: int | None = None
+) -> tuple[bytes, list]:
+    """
+    Obtiene la caja moov del archivo, ya sea que esté al inicio (faststart) o
+    al final del archivo. En los archivos fragmentados la caja moov precede a
+    los fragmentos.
+
+    Args:
+        read_range (RangeReader): Función que lee un rango de bytes del archivo.
+        file_size (int): Tamaño del archivo.
+        max_size (int | None): Tamaño máximo permitido de la caja moov.
+
+    Returns:
+        tuple[bytes, list]: Bytes de la caja moov y las cajas del primer nivel.
+    """
+    boxes, head = read_top_level_boxes(read_range, file_size)
+    moov = next((box for box in boxes if box[0] == b"moov"), None)
+    if not moov:
+        raise Mp4Error("El archivo no contiene la caja moov")
+    _, offset, size = moov
+    if max_size is not None and size > max_size:
+        raise Mp4Error("La caja moov excede el tamaño máximo permitido")
+    if offset + size <= len(head):
+        return head[offset : offset + size], boxes
+    return read_range(offset, offset + size), boxes
+
+
+def is_fragmented(moov: bytes, boxes: list) -> bool:
+    """
+    Indica si el archivo es un MP4 fragmentado: tiene cajas moof o la caja
+    moov declara fragmentos con una caja mvex.
+    """
+    if any(box_type == b"moof" for box_type, _, _ in boxes):
+        return True
+    _, _, header_size = parse_box_header(moov, 0, len(moov))
+    return find_child(moov, header_size, len(moov), [b"mvex"]) is not None
+
+
+def read_mdhd(data: bytes, start: int) -> tuple[int, int]:
+    """
+    Obtiene la escala de tiempo (unidades por segundo) y la duración de una
+    pista a partir del contenido de su caja mdhd.
+    """
+    if data[start] == 1:
+        return struct.unpack(">IQ", data[start + 20 : start + 32])
+    return struct.unpack(">II", data[start + 12 : start + 20])
+
+
+def get_faststart_header_size(read_range: RangeReader, file_size: int) -> int:
+    """
+    Obtiene la cantidad de bytes iniciales que contienen los metadatos de un
+    archivo con faststart, es decir, con la caja moov antes de los datos de
+    las muestras. Solo estos archivos se pueden decodificar como un flujo
+    continuo sin buscar posiciones en el archivo.
+
+    Args:
+        read_range (RangeReader): Función que lee un rango de bytes del archivo.
+        file_size (int): Tamaño del archivo.
+
+    Returns:
+        int: Posición donde termina la caja moov.
+
+    Raises:
+        Mp4Error: Si el archivo no es un MP4 con faststart.
+    """
+    boxes, _ = read_top_level_boxes(read_range, file_size)
+    for box_type, offset, size in boxes:
+        if box_type in (b"moof", b"mdat"):
+            break
+        if box_type == b"moov":
+            return offset + size
+    raise Mp4Error("La caja moov no está al inicio del archivo")
+
+
+def get_track_sample_ranges(
+    data: bytes, start: int, end: int, duration: float
+) -> list[tuple[int, int]]:
+    """
+    Calcula los rangos de bytes de las muestras de una pista cuyo tiempo de
+    decodificación es menor a `duration`.
+
+    Args:
+        data (bytes): Bytes de la caja moov.
+        start (int): Inicio del contenido de la caja trak.
+        end (int): Fin del contenido de la caja trak.
+        duration (float): Segundos iniciales del archivo que se requieren.
+
+    Returns:
+        list[tuple[int, int]]: Rangos de bytes (fin exclusivo).
+    """
+    mdhd = find_child(data, start, end, [b"mdia", b"mdhd"])
+    stbl = find_child(data, start, end, [b"mdia", b"minf", b"stbl"])
+    if not mdhd or not stbl:
+        return []
+    timescale, _ = read_mdhd(data, mdhd[0])
+    tables = {
+        box_type: (box_start, box_end)
+        for box_type, box_start, box_end in iter_boxes(data, *stbl)
+    }
+    if b"stz2" in tables:
+        raise Mp4Error("La caja stz2 no está soportada")
+    if b"stts" not in tables or b"stsc" not in tables or b"stsz" not in tables:
+        raise Mp4Error("Tabla de muestras incompleta")
+
+    # Cantidad de muestras que se decodifican antes del tiempo límite
+    limit = duration * timescale
+    stts_start = tables[b"stts"][0]
+    (entry_count,) = struct.unpack(">I", data[stts_start + 4 : stts_start + 8])
+    elapsed = 0
+    needed_samples = 0
+    for index in range(entry_count):
+        entry = stts_start + 8 + index * 8
+        sample_count, sample_delta = struct.unpack(">II", data[entry : entry + 8])
+        if sample_delta == 0 or elapsed + sample_count * sample_delta < limit:
+            needed_samples += sample_count
+            elapsed += sample_count * sample_delta
+            continue
+        needed_samples += int((limit - elapsed) // sample_delta) + 1
+        break
+
+    stsz_start = tables[b"stsz"][0]
+    sample_size, sample_count = struct.unpack(
+        ">II", data[stsz_start + 4 : stsz_start + 12]
+    )
+    needed_samples = min(needed_samples, sample_count)
+
+    def get_sample_size(sample: int) -> int:
+        if sample_size:
+            return sample_size
+        entry = stsz_start + 12 + sample * 4
+        return struct.unpack(">I", data[entry : entry + 4])[0]
+
+    if b"stco" in tables:
+        offsets_start, offset_format, offset_size = tables[b"stco"][0], ">I", 4
+    elif b"co64" in tables:
+        offsets_start, offset_format, offset_size = tables[b"co64"][0], ">Q", 8
+    else:
+        raise Mp4Error("Tabla de chunks no encontrada")
+    (chunk_count,) = struct.unpack(">I", data[offsets_start + 4 : offsets_start + 8])
+
+    stsc_start = tables[b"stsc"][0]
+    (stsc_count,) = struct.unpack(">I", data[stsc_start + 4 : stsc_start + 8])
+    stsc = [
+        struct.unpack(">III", data[entry : entry + 12])[:2]
+        for entry in range(stsc_start + 8, stsc_start + 8 + stsc_count * 12, 12)
+    ]
+
+    ranges = []
+    sample = 0
+    for index, (first_chunk, samples_per_chunk) in enumerate(stsc):
+        last_chunk = stsc[index + 1][0] - 1 if index + 1 < len(stsc) else chunk_count
+        for chunk in range(first_chunk, last_chunk + 1):
+            if sample >= needed_samples:
+                return ranges
+            entry = offsets_start + 8 + (chunk - 1) * offset_size
+            (chunk_offset,) = struct.unpack(
+                offset_format, data[entry : entry + offset_size]
+            )
+            samples = range(sample, min(sample + samples_per_chunk, needed_samples))
+            chunk_size = sum(get_sample_size(item) for item in samples)
+            ranges.append((chunk_offset, chunk_offset + chunk_size))
+            sample += samples_per_chunk
+    return ranges
+
+
+def merge_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start - merged[-1][1] <= RANGE_MERGE_GAP:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def plan_partial_download(
+    read_range: RangeReader, file_size: int, duration: float, margin: float = 1.0
+) -> tuple[dict[int, bytes], list[tuple[int, int]]]:
+    """
+    Determina qué partes de un archivo MP4 se requieren para decodificar sus
+    primeros segundos: las cajas de metadatos y los rangos de muestras de
+    cada pista que se decodifican antes del tiempo límite.
+
+    Args:
+        read_range (RangeReader): Función que lee un rango de bytes del archivo.
+        file_size (int): Tamaño del archivo.
+        duration (float): Segundos iniciales del archivo que se requieren.
+        margin (float): Segundos adicionales que se descargan para cubrir el
+            reordenamiento de cuadros y las listas de edición.
+
+    Returns:
+        tuple[dict[int, bytes], list[tuple[int, int]]]: Bytes ya leídos por
+        posición y rangos de bytes (fin exclusivo) que faltan por descargar.
+
+    Raises:
+        Mp4Error: Si el archivo no es un MP4 soportado o sus tablas de
+            muestras son inválidas.
+    """
+    moov, boxes = read_moov(read_range, file_size)
+    if is_fragmented(moov, boxes):
+        raise Mp4Error("Los archivos MP4 fragmentados no están soportados")
+    known = {}
+    ranges = []
+    for box_type, offset, size in boxes:
+        if box_type == b"moov":
+            known[offset] = moov
+        elif box_type in (b"mdat", b"free", b"skip"):
+            # Solo se requiere la cabecera para recorrer las cajas del archivo
+            known[offset] = build_box_header(box_type, size)
+        else:
+            ranges.append((offset, offset + size))
+    _, _, header_size = parse_box_header(moov, 0, len(moov))
+    try:
+        for box_type, start, end in iter_boxes(moov, header_size, len(moov)):
+            if box_type == b"trak":
+                ranges.extend(
+                    get_track_sample_ranges(moov, start, end, duration + margin)
+                )
+    except (struct.error, IndexError) as e:
+        raise Mp4Error(f"Tabla de muestras inválida ({e})")
+    ranges = merge_ranges(ranges)
+    if any(start < 0 or end > file_size for start, end in ranges):
+        raise Mp4Error("Rango de muestras fuera del archivo")
+    return known, ranges
+
+
+def read_descriptor(data: bytes, offset: int) -> tuple[int, int, int]:
+    """
+    Interpreta la cabecera de un descriptor MPEG-4 de la caja esds.
+
+    Returns:
+        tuple[int, int, int]: Etiqueta, inicio y fin del contenido.
+    """
+    tag = data[offset]
+    size = 0
+    offset += 1
+    # El tamaño ocupa hasta 4 bytes, cada uno indica en su bit más alto si
+    # continúa en el siguiente
+    for _ in range(4):
+        byte = data[offset]
+        offset += 1
+        size = (size << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            break
+    return tag, offset, offset + size
+
+
+def read_esds(data: bytes, start: int) -> tuple[int, int | None]:
+    """
+    Obtiene el tipo de objeto (codec) y la cantidad de canales de la caja
+    esds de una pista de audio MPEG-4.
+
+    Args:
+        data (bytes): Bytes de la caja moov.
+        start (int): Inicio del contenido de la caja esds.
+
+    Returns:
+        tuple[int, int | None]: Tipo de objeto y cantidad de canales, None si
+        no se encuentra la configuración del audio.
+    """
+    tag, offset, _ = read_descriptor(data, start + 4)
+    if tag != 0x03:
+        raise Mp4Error("Descriptor de stream inválido")
+    flags = data[offset + 2]
+    offset += 3
+    if flags & 0x80:
+        offset += 2
+    if flags & 0x40:
+        offset += 1 + data[offset]
+    if flags & 0x20:
+        offset += 2
+    tag, offset, _ = read_descriptor(data, offset)
+    if tag != 0x04:
+        raise Mp4Error("Descriptor de decodificador inválido")
+    object_type = data[offset]
+    tag, offset, end = read_descriptor(data, offset + 13)
+    if tag != 0x05 or end - offset < 2:
+        return object_type, None
+    # La configuración de AAC inicia con 5 bits del tipo de objeto y 4 bits
+    # del índice de frecuencia, seguidos de 4 bits de la configuración de
+    # canales. Un índice 15 indica una frecuencia explícita de 24 bits
+    config = int.from_bytes(data[offset : min(end, offset + 5)], "big")
+    bits = (min(end, offset + 5) - offset) * 8
+    shift = 9 if (config >> (bits - 9)) & 0x0F != 0x0F else 33
+    channels = (config >> (bits - shift - 4)) & 0x0F
+    # Las configuraciones 1 a 6 corresponden a la cantidad de canales, la 7
+    # a 7.1 (8 canales)
+    return object_type, {7: 8}.get(channels, channels) or None
+
+
+def read_track_info(data: bytes, start: int, end: int, info: MediaInfo) -> None:
+    """
+    Completa la información del stream de video o de audio a partir de la
+    caja trak de una pista. Solo se considera la primera pista de cada tipo.
+
+    Args:
+        data (bytes): Bytes de la caja moov.
+        start (int): Inicio del contenido de la caja trak.
+        end (int): Fin del contenido de la caja trak.
+        info (MediaInfo): Información que se completa.
+    """
+    hdlr = find_child(data, start, end, [b"mdia", b"hdlr"])
+    mdhd = find_child(data, start, end, [b"mdia", b"mdhd"])
+    stbl = find_child(data, start, end, [b"mdia", b"minf", b"stbl"])
+    if not hdlr or not mdhd or not stbl:
+        return
+    handler = data[hdlr[0] + 8 : hdlr[0] + 12]
+    stsd = find_child(data, *stbl, [b"stsd"])
+    if not stsd:
+        raise Mp4Error("Tabla de descripción de muestras no encontrada")
+    entry_type, entry_size, _ = parse_box_header(data, stsd[0] + 8, stsd[1])
+    entry = stsd[0] + 8
+    if entry + min(entry_size, 36) > stsd[1]:
+        raise Mp4Error("Descripción de muestras incompleta")
+    codec = CODECS.get(entry_type, entry_type.decode("latin-1").strip())
+    if handler == b"vide" and info.video_codec is None:
+        info.video_codec = codec
+        info.width, info.height = struct.unpack(">HH", data[entry + 32 : entry + 36])
+        tkhd = find_child(data, start, end, [b"tkhd"])
+        if tkhd:
+            # La matriz de transformación inicia después de los tiempos de la
+            # pista, de 64 bits en la versión 1. La rotación se obtiene de
+            # los dos primeros coeficientes, en sentido horario como la
+            # etiqueta rotate de ffmpeg. Como ffmpeg la aplica al decodificar
+            # se reportan las dimensiones ya rotadas
+            matrix = tkhd[0] + (52 if data[tkhd[0]] == 1 else 40)
+            a, b = struct.unpack(">ii", data[matrix : matrix + 8])
+            if a or b:
+                info.rotation = round(math.degrees(math.atan2(b, a))) % 360 or None
+            if info.rotation is not None and info.rotation % 180 == 90:
+                info.width, info.height = info.height, info.width
+        # Las cajas de configuración inician después de los 78 bytes de la
+        # descripción visual
+        avcc = find_child(data, entry + 86, min(entry + entry_size, stsd[1]), [b"avcC"])
+        if codec == "h264" and avcc:
+            info.pixel_format = H264_PIXEL_FORMATS.get(data[avcc[0] + 1])
+            info.video_profile = H264_PROFILES.get(data[avcc[0] + 1])
+            # Baseline con constraint_set1_flag
+            if data[avcc[0] + 1] == 66 and data[avcc[0] + 2] & 0x40:
+                info.video_profile = "Constrained Baseline"
+        timescale, _ = read_mdhd(data, mdhd[0])
+        stts = find_child(data, *stbl, [b"stts"])
+        if stts and timescale:
+            (entry_count,) = struct.unpack(">I", data[stts[0] + 4 : stts[0] + 8])
+            samples = 0
+            elapsed = 0
+            for index in range(entry_count):
+                item = stts[0] + 8 + index * 8
+                sample_count, sample_delta = struct.unpack(">II", data[item : item + 8])
+                samples += sample_count
+                elapsed += sample_count * sample_delta
+            if elapsed:
+                info.fps = round(samples * timescale / elapsed, 2)
+    elif handler == b"soun" and info.audio_codec is None:
+        info.audio_codec = codec
+        version, channels = struct.unpack(">H6xH", data[entry + 16 : entry + 26])
+        info.audio_channels = channels
+        # En MP4 la cantidad de canales de la descripción es fija, la real se
+        # indica en la configuración del decodificador
+        esds = find_child(data, entry + 36, min(entry + entry_size, stsd[1]), [b"esds"])
+        if entry_type == b"mp4a" and esds and version == 0:
+            object_type, esds_channels = read_esds(data, esds[0])
+            if object_type in MP3_OBJECT_TYPES:
+                info.audio_codec = "mp3"
+            elif esds_channels:
+                info.audio_channels = esds_channels
+        # La frecuencia de muestreo es un valor de punto fijo 16.16, que no
+        # aplica a las descripciones de QuickTime versión 2
+        if version < 2:
+            info.audio_sample_rate = struct.unpack(">H", data[entry + 32 : entry + 34])[
+                0
+            ]
+
+
+def probe_mp4(
+    read_range: RangeReader, file_size: int, max_size: int | None = None
+) -> MediaInfo:
+    """
+    Obtiene la información de un archivo MP4 leyendo solo las cabeceras de
+    las cajas del primer nivel y la caja moov, sin leer las muestras. En los
+    archivos fragmentados la duración se obtiene de la caja mehd; si no la
+    tienen, la duración, el bitrate y los cuadros por segundo quedan sin
+    definir.
+
+    Args:
+        read_range (RangeReader): Función que lee un rango de bytes del archivo.
+        file_size (int): Tamaño del archivo.
+        max_size (int | None): Tamaño máximo permitido de la caja moov.
+
+    Returns:
+        MediaInfo: Duración, bitrate y parámetros de los streams de video y
+        audio encontrados.
+
+    Raises:
+        Mp4Error: Si el archivo no es un MP4 válido.
+    """
+    moov, boxes = read_moov(read_range, file_size, max_size)
+    _, _, header_size = parse_box_header(moov, 0, len(moov))
+    info = MediaInfo()
+    try:
+        mvhd = find_child(moov, header_size, len(moov), [b"mvhd"])
+        if not mvhd:
+            raise Mp4Error("El archivo no contiene la caja mvhd")
+        if moov[mvhd[0]] == 1:
+            timescale, duration = struct.unpack(
+                ">IQ", moov[mvhd[0] + 20 : mvhd[0] + 32]
+            )
+        else:
+            timescale, duration = struct.unpack(
+                ">II", moov[mvhd[0] + 12 : mvhd[0] + 20]
+            )
+        mehd = find_child(moov, header_size, len(moov), [b"mvex", b"mehd"])
+        if mehd and is_fragmented(moov, boxes):
+            # Duración total de los fragmentos, en la escala de tiempo de mvhd
+            if moov[mehd[0]] == 1:
+                (duration,) = struct.unpack(">Q", moov[mehd[0] + 4 : mehd[0] + 12])
+            else:
+                (duration,) = struct.unpack(">I", moov[mehd[0] + 4 : mehd[0] + 8])
+        if timescale and duration:
+            info.duration = duration / timescale
+            info.bitrate = int(file_size * 8 / info.duration)
+        for box_type, start, end in iter_boxes(moov, header_size, len(moov)):
+            if box_type == b"trak":
+                read_track_info(moov, start, end, info)
+    except (struct.error, IndexError) as e:
+        raise Mp4Error(f"Caja moov inválida ({e})")
+    return info
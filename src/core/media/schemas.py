@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+
+
+class MediaInfo(BaseModel):
+    duration: float | None = None
+    bitrate: int | None = None
+    video_codec: str | None = None
+    # Perfil del codec de video, por ejemplo "High" en H.264
+    video_profile: str | None = None
+    pixel_format: str | None = None
+    # Dimensiones con las que se muestra el video, ya rotadas
+    width: int | None = None
+    height: int | None = None
+    fps: float | None = None
+    # Rotación en grados, en sentido horario, que se aplica al mostrar los
+    # cuadros del video
+    rotation: int | None = None
+    audio_codec: str | None = None
+    audio_sample_rate: int | None = None
+    audio_channels: int | None = None
+
+    @property
+    def has_video(self) -> bool:
+        return self.video_codec is not None
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio_codec is not None
+
+    @property
+    def is_rotated(self) -> bool:
+        return bool(self.rotation)
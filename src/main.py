@@ -3,22 +3,29 @@ import traceback
 from contextlib import asynccontextmanager
 from datetime import datetime
 
-from fastapi import FastAPI, Request, Depends
+from fastapi import Depends, FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import text
 
 from src.apps.auth.controllers import METADATA as auth_metadata
+from src.apps.auth.hashing import password_hashing_pool
 from src.apps.commons.exceptions import CustomException
 from src.apps.commons.schemas import BaseErrorSchema, UnexpectedErrorSchema
 from src.apps.dummy.controllers import METADATA as dummy_metadata
 from src.apps.tasks.controllers import METADATA as tasks_metadata
+from src.apps.tasks.events import task_event_hub
+from src.apps.tasks.outbox import task_outbox_relay
 from src.apps.videos.controllers import METADATA as videos_metadata
+from src.core.database.base import async_engine
+from src.core.database.dependencies import get_async_db, get_db
+from src.core.gcp.clients import close_clients
+from src.core.gcp.executor import gcp_executor, warm_up_gcp_clients
 from src.core.logger.base import setup_logging
 from src.routes import router
 from src.settings.base import settings
-from src.core.database.dependencies import get_db
-from sqlalchemy.orm import Session
-from sqlalchemy.sql import text
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +33,17 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging()
+    await warm_up_gcp_clients()
+    # Sin credenciales de GCP los eventos quedan pendientes en la tabla
+    if settings.GCP_CREDENTIALS_BASE64:
+        task_outbox_relay.start()
     yield
+    task_event_hub.stop()
+    task_outbox_relay.stop()
+    password_hashing_pool.shutdown()
+    gcp_executor.shutdown()
+    close_clients()
+    await async_engine.dispose()
 
 
 _openapi = FastAPI.openapi
@@ -66,15 +83,17 @@ async def root(request: Request, session: Session = Depends(get_db)):
         "db": settings.DB_URL,
     }
 
+
 @app.get("/health")
-async def root(request: Request, session: Session = Depends(get_db)):
+async def root(request: Request, session: AsyncSession = Depends(get_async_db)):
     try:
-        db = session.execute(text("SELECT 1"))
+        db = await session.execute(text("SELECT 1"))
     except Exception as e:
         logger.error(f"Error al consultar la base de datos: {e}")
         db = None
     return {
         "db_status": "OK" if db else "ERROR",
+        "gcp_executor": gcp_executor.get_stats(),
     }
 
 
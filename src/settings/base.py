@@ -1,3 +1,4 @@
+import os
 from typing import Literal
 
 from pydantic_settings import BaseSettings
@@ -18,7 +19,10 @@ class Settings(BaseSettings):
     DB_PORT: int = 5432
     DB_NAME: str = "cloud_db"
     DB_DRIVER: str = "postgresql+pg8000"
+    DB_ASYNC_DRIVER: str = "postgresql+asyncpg"
     DB_URL_SOCKET: str = ""
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
 
     DB_USER_TEST: str = "postgres"
     DB_PASSWORD_TEST: str = "postgres"
@@ -26,19 +30,69 @@ class Settings(BaseSettings):
     DB_PORT_TEST: int = 5432
     DB_NAME_TEST: str = "cloud_db_test"
     DB_DRIVER_TEST: str = "postgresql+psycopg2"
+    DB_ASYNC_DRIVER_TEST: str = "postgresql+asyncpg"
 
     CELERY_BROKER_HOST: str = "localhost"
     CELERY_BROKER_PORT: int = 6379
 
     PUBSUB_TOPIC_ID: str = "videos"
     PUBSUB_SUBSCRIPTION_ID: str = "videos-sub"
+    PUBSUB_MAX_CONCURRENT_JOBS: int = 1
+    PUBSUB_MAX_JOB_CRASHES: int = 3
+    PUBSUB_BATCH_MAX_MESSAGES: int = 100
+    PUBSUB_BATCH_MAX_LATENCY: float = 0.05
+    TASK_OUTBOX_BATCH_SIZE: int = 100
+    TASK_OUTBOX_POLL_INTERVAL: float = 1.0
+    TASK_OUTBOX_PUBLISH_TIMEOUT: float = 30.0
+    TASK_OUTBOX_MAX_ATTEMPTS: int = 10
+    TASK_OUTBOX_RETRY_DELAY: float = 1.0
+    TASK_PROGRESS_INTERVAL: float = 2.0
+    TASK_PROCESSING_TIMEOUT: float = 300.0
+    TASK_HEARTBEAT_INTERVAL: float = 30.0
+    TASK_EVENTS_QUEUE_SIZE: int = 100
+    TASK_EVENTS_HEARTBEAT_INTERVAL: float = 15.0
+    TASK_EVENTS_RECONNECT_DELAY: float = 5.0
 
     GCP_PROJECT_ID: str = ""
     GCP_CREDENTIALS_BASE64: str = ""
+    GCP_EXECUTOR_WORKERS: int = 8
+    GCP_EXECUTOR_MAX_PENDING: int = 64
+    GCP_HTTP_POOL_SIZE: int = 16
+    GCP_WARM_UP_TIMEOUT: float = 10.0
 
     VIDEOS_BUCKET: str = "videos-api"
 
+    VIDEO_PROCESSING_ENGINE: Literal["moviepy", "ffmpeg"] = "moviepy"
+    FFMPEG_BINARY: str = ""
+    VIDEO_BUMPER_CACHE_ENABLED: bool = True
+    VIDEO_BUMPER_CACHE_DIR: str = ""
+    VIDEO_BUMPER_BUCKET_PREFIX: str = "bumpers"
+    VIDEO_CHUNKED_ENCODING_ENABLED: bool = False
+    VIDEO_ENCODING_WORKERS: int = 0
+    VIDEO_MIN_CHUNK_DURATION: float = 2.0
+    VIDEO_PARTIAL_DOWNLOAD_ENABLED: bool = True
+    VIDEO_STREAMING_INPUT_ENABLED: bool = True
+    VIDEO_STREAM_CHUNK_SIZE: int = 4 * 1024 * 1024
+    VIDEO_REMUX_ENABLED: bool = True
+    VIDEO_PROBE_MAX_BYTES: int = 16 * 1024 * 1024
+    VIDEO_DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024
+    VIDEO_DOWNLOAD_MODE: Literal["stream", "redirect"] = "stream"
+    VIDEO_SIGNED_URL_EXPIRATION: int = 900
+    VIDEO_SIGNED_URL_CACHE_MARGIN: int = 120
+    VIDEO_SIGNED_URL_CACHE_MAX_SIZE: int = 10000
+
+    PAGINATION_MAX_PAGE_SIZE: int = 100
+
+    USER_CACHE_TTL: float = 60.0
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_REDIS_URL: str = ""
+
+    PASSWORD_HASHING_WORKERS: int = 0
+    PASSWORD_HASHING_MAX_PENDING: int = 32
+
     SECRET_KEY: str = "mysecret"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
 
     @property
     def DB_URL(self) -> str:
@@ -47,10 +101,21 @@ class Settings(BaseSettings):
         else:
             return f"{self.DB_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def DB_SOCKET_DIR(self) -> str:
+        # pg8000 recibe la ruta del socket, psycopg2 y asyncpg su directorio
+        if os.path.basename(self.DB_URL_SOCKET).startswith(".s.PGSQL."):
+            return os.path.dirname(self.DB_URL_SOCKET)
+        return self.DB_URL_SOCKET
+
     @property
     def DB_URL_TEST(self) -> str:
         return f"{self.DB_DRIVER_TEST}://{self.DB_USER_TEST}:{self.DB_PASSWORD_TEST}@{self.DB_HOST_TEST}:{self.DB_PORT_TEST}/{self.DB_NAME_TEST}"
 
+    @property
+    def DB_ASYNC_URL_TEST(self) -> str:
+        return f"{self.DB_ASYNC_DRIVER_TEST}://{self.DB_USER_TEST}:{self.DB_PASSWORD_TEST}@{self.DB_HOST_TEST}:{self.DB_PORT_TEST}/{self.DB_NAME_TEST}"
+
     @property
     def CELERY_BROKER_URL(self) -> str:
         return f"redis://{self.CELERY_BROKER_HOST}:{self.CELERY_BROKER_PORT}/0"
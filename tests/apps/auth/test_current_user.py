@@ -0,0 +1,82 @@
+import asyncio
+
+from faker import Faker
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.apps.auth.utils import encrypt_password
+from src.apps.users.cache import user_cache
+from src.apps.users.models import User
+from src.apps.users.schemas import CurrentUserSchema
+
+faker = Faker()
+
+
+def test_current_user_cache(
+    client: TestClient, db_session: Session, query_counter: list
+):
+    password = faker.password()
+    user = User(
+        username=faker.user_name(),
+        email=faker.email(),
+        password=encrypt_password(password),
+    )
+    db_session.add(user)
+    db_session.commit()
+    response = client.post(
+        "/api/auth/login", json={"username": user.username, "password": password}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = client.get("/api/tasks", headers=headers)
+    assert response.status_code == 200
+    query_counter.clear()
+    response = client.get("/api/tasks", headers=headers)
+    assert response.status_code == 200
+    # El usuario se obtiene del caché, solo se consultan las tareas
+    assert len(query_counter) == 1
+
+    user.is_active = False
+    db_session.commit()
+    response = client.get("/api/tasks", headers=headers)
+    assert response.status_code == 404
+    assert response.json()["error"] == "error_user"
+
+
+class FakeRedis:
+    """
+    Cliente de Redis que guarda los valores en memoria. Las operaciones son
+    corrutinas, igual que en redis.asyncio.
+    """
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+def test_user_cache_redis(monkeypatch):
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(user_cache, "redis", fake_redis)
+    monkeypatch.setattr(user_cache, "sync_redis", None)
+    user = CurrentUserSchema(id=1, username=faker.user_name(), email=faker.email())
+
+    async def run():
+        await user_cache.set(user)
+        user_cache.clear()
+        # Sin el caché en memoria, el usuario se lee de Redis
+        assert await user_cache.get(user.id) == user
+        # Dentro del event loop la eliminación se programa como una tarea
+        user_cache.invalidate(user.id)
+        await asyncio.gather(*user_cache.pending)
+        assert await user_cache.get(user.id) is None
+
+    asyncio.run(run())
+    assert fake_redis.values == {}
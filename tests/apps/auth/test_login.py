@@ -21,7 +21,7 @@ def test_login_ok_with_username(client: TestClient, db_session: Session):
         password=encrypt_password(password),
     )
     db_session.add(user1)
-    db_session.flush()
+    db_session.commit()
 
     response = client.post(
         "/api/auth/login", json={"username": username, "password": password}
@@ -42,7 +42,7 @@ def test_login_ok_with_email(client: TestClient, db_session: Session):
         password=encrypt_password(password),
     )
     db_session.add(user1)
-    db_session.flush()
+    db_session.commit()
 
     response = client.post(
         "/api/auth/login", json={"username": email, "password": password}
@@ -73,7 +73,7 @@ def test_login_with_invalid_credentials(client: TestClient, db_session: Session)
         password=encrypt_password(password),
     )
     db_session.add(user1)
-    db_session.flush()
+    db_session.commit()
 
     response = client.post(
         "/api/auth/login", json={"username": username, "password": faker.password()}
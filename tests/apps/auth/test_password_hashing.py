@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+import pytest
+
+from src.apps.auth.hashing import PasswordHashingPool
+from src.apps.commons.exceptions import CustomException
+
+
+def test_password_hashing_pool_rejects_when_saturated():
+    pool = PasswordHashingPool(workers=1, max_pending=2)
+
+    async def run():
+        return await asyncio.gather(
+            *(pool.run(time.sleep, 0.05) for _ in range(3)), return_exceptions=True
+        )
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    errors = [result for result in results if isinstance(result, CustomException)]
+    assert len(errors) == 1
+    assert errors[0].status_code == 503
+    timings = [result[1] for result in results if isinstance(result, tuple)]
+    assert len(timings) == 2
+    assert pool.stats["calls"] == 2
+    assert pool.stats["rejected"] == 1
+    assert pool.stats["run_time"] == pytest.approx(
+        sum(timing["run"] for timing in timings)
+    )
+    # La segunda llamada espera a que el único hilo termine la primera
+    assert max(timing["wait"] for timing in timings) >= 40
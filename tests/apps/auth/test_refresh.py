@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from faker import Faker
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.apps.auth.utils import encrypt_password
+from src.apps.users.models import User
+from src.settings.base import settings
+
+faker = Faker()
+
+
+def test_refresh_rotates_tokens(client: TestClient, db_session: Session):
+    password = faker.password()
+    user = User(
+        username=faker.user_name(),
+        email=faker.email(),
+        password=encrypt_password(password),
+    )
+    db_session.add(user)
+    db_session.commit()
+    response = client.post(
+        "/api/auth/login", json={"username": user.username, "password": password}
+    )
+    login = response.json()
+    assert response.status_code == 200
+    assert login["expires_in"] == settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    payload = jwt.decode(
+        login["access_token"], settings.SECRET_KEY, algorithms=["HS256"]
+    )
+    assert payload["id"] == user.id and "exp" in payload
+
+    response = client.post(
+        "/api/auth/refresh", json={"refresh_token": login["refresh_token"]}
+    )
+    refreshed = response.json()
+    assert response.status_code == 200
+    assert refreshed["refresh_token"] != login["refresh_token"]
+    response = client.get(
+        "/api/tasks",
+        headers={"Authorization": f"Bearer {refreshed['access_token']}"},
+    )
+    assert response.status_code == 200
+
+    # Reutilizar un token ya usado revoca también el token que lo reemplazó
+    response = client.post(
+        "/api/auth/refresh", json={"refresh_token": login["refresh_token"]}
+    )
+    assert response.status_code == 401
+    response = client.post(
+        "/api/auth/refresh", json={"refresh_token": refreshed["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+
+def test_expired_access_token(client: TestClient, db_session: Session):
+    token = jwt.encode(
+        {"id": 1, "exp": datetime.now(timezone.utc) - timedelta(minutes=1)},
+        settings.SECRET_KEY,
+        algorithm="HS256",
+    )
+    response = client.get("/api/tasks", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
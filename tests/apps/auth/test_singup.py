@@ -202,7 +202,7 @@ def test_signup_with_existing_user(client: TestClient, db_session: Session):
         password=encrypt_password(password),
     )
     db_session.add(user1)
-    db_session.flush()
+    db_session.commit()
 
     response = client.post(
         "/api/auth/signup",
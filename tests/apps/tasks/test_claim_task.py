@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+from faker import Faker
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from src.apps.tasks.models import Task, TaskStatusEnum
+from src.apps.tasks.tasks import claim_task, release_task
+from src.apps.users.models import User
+
+faker = Faker()
+
+
+def create_task(db_session: Session, status: TaskStatusEnum) -> Task:
+    user = User(username=faker.user_name(), email=faker.email(), password="")
+    db_session.add(user)
+    db_session.commit()
+    task = Task(task_id=faker.uuid4(), user_id=user.id, status=status)
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def test_claim_task_once(db_session: Session):
+    task = create_task(db_session, TaskStatusEnum.UPLOADED)
+
+    assert claim_task(db_session, task)
+    assert task.status == TaskStatusEnum.PROCESSING
+    # Una entrega repetida del evento no toma la tarea de nuevo
+    with Session(bind=db_session.get_bind()) as other_session:
+        other_task = other_session.get(Task, task.id)
+        assert not claim_task(other_session, other_task)
+
+
+def test_claim_task_skips_finished_tasks(db_session: Session):
+    for status in [TaskStatusEnum.PROCESSED, TaskStatusEnum.FAILURE]:
+        task = create_task(db_session, status)
+        assert not claim_task(db_session, task)
+        assert task.status == status
+
+
+def test_claim_abandoned_task(db_session: Session):
+    task = create_task(db_session, TaskStatusEnum.UPLOADED)
+    assert claim_task(db_session, task)
+    assert task.heartbeat_at is not None
+    # Una etapa larga no cambia updated_at, pero el worker sigue enviando
+    # señales
+    db_session.execute(
+        update(Task)
+        .where(Task.id == task.id)
+        .values(updated_at=datetime.now(timezone.utc) - timedelta(days=1))
+    )
+    db_session.commit()
+    assert not claim_task(db_session, task)
+
+    # Sin señales desde hace más de TASK_PROCESSING_TIMEOUT segundos
+    db_session.execute(
+        update(Task)
+        .where(Task.id == task.id)
+        .values(heartbeat_at=datetime.now(timezone.utc) - timedelta(days=1))
+    )
+    db_session.commit()
+    assert claim_task(db_session, task)
+    assert task.heartbeat_at > datetime.now(timezone.utc) - timedelta(hours=1)
+
+
+def test_release_task(db_session: Session):
+    task = create_task(db_session, TaskStatusEnum.UPLOADED)
+    assert claim_task(db_session, task)
+
+    assert release_task(db_session, task.id)
+    db_session.refresh(task)
+    assert task.status == TaskStatusEnum.UPLOADED
+    assert task.heartbeat_at is None
+    # La siguiente entrega del evento la toma de nuevo
+    assert claim_task(db_session, task)
+
+
+def test_release_task_skips_finished_tasks(db_session: Session):
+    for status in [TaskStatusEnum.PROCESSED, TaskStatusEnum.FAILURE]:
+        task = create_task(db_session, status)
+        assert not release_task(db_session, task.id)
+        db_session.refresh(task)
+        assert task.status == status
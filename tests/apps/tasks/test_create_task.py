@@ -0,0 +1,328 @@
+import asyncio
+import hashlib
+import subprocess
+import threading
+
+import pytest
+from faker import Faker
+from fastapi.testclient import TestClient
+from imageio_ffmpeg import get_ffmpeg_exe
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.apps.auth.utils import encrypt_password
+from src.apps.tasks import controllers
+from src.apps.tasks.models import Task, TaskOutboxEvent, TaskStatusEnum
+from src.apps.tasks.tasks import get_waiting_tasks
+from src.apps.users.models import User
+from src.apps.videos.models import Video
+from src.core.gcp.executor import gcp_executor
+
+faker = Faker()
+
+
+@pytest.fixture(scope="module")
+def video_content(tmp_path_factory) -> bytes:
+    path = tmp_path_factory.mktemp("videos") / "video.mp4"
+    subprocess.run(
+        [
+            get_ffmpeg_exe(),
+            "-f",
+            "lavfi",
+            "-i",
+            "testsrc=size=320x180:rate=24",
+            "-t",
+            "1",
+            "-c:v",
+            "libx264",
+            "-pix_fmt",
+            "yuv420p",
+            str(path),
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return path.read_bytes()
+
+
+def login(client: TestClient, db_session: Session) -> tuple[User, str]:
+    password = faker.password()
+    user = User(
+        username=faker.user_name(),
+        email=faker.email(),
+        password=encrypt_password(password),
+    )
+    db_session.add(user)
+    db_session.commit()
+    response = client.post(
+        "/api/auth/login", json={"username": user.username, "password": password}
+    )
+    return user, response.json()["access_token"]
+
+
+def test_create_task_with_invalid_video(client: TestClient, db_session: Session):
+    _, token = login(client, db_session)
+
+    response = client.post(
+        "/api/tasks",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("video.mp4", faker.binary(length=2048), "video/mp4")},
+    )
+    data = response.json()
+    assert response.status_code == 400
+    assert data["message"] == "El archivo no es un video válido"
+    assert db_session.execute(select(Video)).scalars().first() is None
+
+
+def test_create_task_with_processed_video(
+    client: TestClient, db_session: Session, video_content: bytes
+):
+    user, token = login(client, db_session)
+    original_video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="video.mp4",
+        url=f"{faker.uuid4()}/video.mp4",
+        content_hash=hashlib.sha256(video_content).hexdigest(),
+    )
+    processed_video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="processed_video.mp4",
+        url=f"{faker.uuid4()}/processed_video.mp4",
+    )
+    db_session.add_all([original_video, processed_video])
+    db_session.commit()
+    db_session.add(
+        Task(
+            task_id=faker.uuid4(),
+            user_id=user.id,
+            original_video_id=original_video.id,
+            processed_video_id=processed_video.id,
+            status=TaskStatusEnum.PROCESSED,
+        )
+    )
+    db_session.commit()
+
+    response = client.post(
+        "/api/tasks",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("video.mp4", video_content, "video/mp4")},
+    )
+    data = response.json()
+    assert response.status_code == 200
+    task = db_session.execute(select(Task).where(Task.id == data["id"])).scalar_one()
+    assert task.status == TaskStatusEnum.PROCESSED
+    assert task.original_video_id == original_video.id
+    assert task.processed_video_id == processed_video.id
+
+
+def test_create_task_with_fragmented_video(
+    client: TestClient, db_session: Session, mp4_files: dict[str, str]
+):
+    user, token = login(client, db_session)
+    with open(mp4_files["fragmented"], "rb") as file:
+        video_content = file.read()
+    original_video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="video.mp4",
+        url=f"{faker.uuid4()}/video.mp4",
+        content_hash=hashlib.sha256(video_content).hexdigest(),
+    )
+    processed_video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="processed_video.mp4",
+        url=f"{faker.uuid4()}/processed_video.mp4",
+    )
+    db_session.add_all([original_video, processed_video])
+    db_session.commit()
+    db_session.add(
+        Task(
+            task_id=faker.uuid4(),
+            user_id=user.id,
+            original_video_id=original_video.id,
+            processed_video_id=processed_video.id,
+            status=TaskStatusEnum.PROCESSED,
+        )
+    )
+    db_session.commit()
+
+    # El MP4 fragmentado no declara su duración en la caja moov, pero es un
+    # video válido
+    response = client.post(
+        "/api/tasks",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("video.mp4", video_content, "video/mp4")},
+    )
+    assert response.status_code == 200
+    task = db_session.execute(
+        select(Task).where(Task.id == response.json()["id"])
+    ).scalar_one()
+    assert task.processed_video_id == processed_video.id
+
+
+def test_create_task_with_video_in_process(
+    client: TestClient, db_session: Session, video_content: bytes
+):
+    user, token = login(client, db_session)
+    original_video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="video.mp4",
+        url=f"{faker.uuid4()}/video.mp4",
+        content_hash=hashlib.sha256(video_content).hexdigest(),
+    )
+    db_session.add(original_video)
+    db_session.commit()
+    in_flight_task = Task(
+        task_id=faker.uuid4(),
+        user_id=user.id,
+        original_video_id=original_video.id,
+        status=TaskStatusEnum.UPLOADED,
+    )
+    db_session.add(in_flight_task)
+    db_session.flush()
+    db_session.add(
+        TaskOutboxEvent(
+            task_id=in_flight_task.id,
+            event_type="process_video",
+            payload={"video_id": original_video.id, "task_id": in_flight_task.id},
+        )
+    )
+    db_session.commit()
+
+    response = client.post(
+        "/api/tasks",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("video.mp4", video_content, "video/mp4")},
+    )
+    assert response.status_code == 200
+    # La nueva tarea espera a la tarea en proceso, sin publicar otro evento
+    task = db_session.execute(
+        select(Task).where(Task.id == response.json()["id"])
+    ).scalar_one()
+    assert task.status == TaskStatusEnum.UPLOADED
+    assert task.original_video_id == original_video.id
+    event = db_session.execute(select(TaskOutboxEvent)).scalar_one()
+    assert event.task_id == in_flight_task.id
+    assert [t.id for t in get_waiting_tasks(db_session, in_flight_task, True)] == [
+        task.id
+    ]
+    assert get_waiting_tasks(db_session, task, linked_only=True) == []
+
+
+def test_create_task_while_video_in_process_completes(
+    client: TestClient, db_session: Session, video_content: bytes
+):
+    user, token = login(client, db_session)
+    original_video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="video.mp4",
+        url=f"{faker.uuid4()}/video.mp4",
+        content_hash=hashlib.sha256(video_content).hexdigest(),
+    )
+    processed_video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="processed_video.mp4",
+        url=f"{faker.uuid4()}/processed_video.mp4",
+    )
+    db_session.add_all([original_video, processed_video])
+    db_session.commit()
+    in_flight_task = Task(
+        task_id=faker.uuid4(),
+        user_id=user.id,
+        original_video_id=original_video.id,
+        status=TaskStatusEnum.PROCESSING,
+    )
+    db_session.add(in_flight_task)
+    db_session.commit()
+    # El worker completa la tarea en proceso sin confirmar la transacción
+    worker_session = Session(bind=db_session.get_bind())
+    worker_task = worker_session.get(Task, in_flight_task.id)
+    worker_task.status = TaskStatusEnum.PROCESSED
+    worker_task.processed_video_id = processed_video.id
+    worker_session.flush()
+    responses = []
+    request = threading.Thread(
+        target=lambda: responses.append(
+            client.post(
+                "/api/tasks",
+                headers={"Authorization": f"Bearer {token}"},
+                files={"file": ("video.mp4", video_content, "video/mp4")},
+            )
+        )
+    )
+    request.start()
+    try:
+        # La petición espera a que el worker confirme la transacción
+        request.join(timeout=1)
+        assert request.is_alive()
+        assert get_waiting_tasks(worker_session, worker_task) == []
+        worker_session.commit()
+    finally:
+        worker_session.close()
+        request.join()
+
+    response = responses[0]
+    assert response.status_code == 200
+    # La nueva tarea no queda esperando a una tarea ya completada
+    task = db_session.execute(
+        select(Task).where(Task.id == response.json()["id"])
+    ).scalar_one()
+    assert task.status == TaskStatusEnum.PROCESSED
+    assert task.processed_video_id == processed_video.id
+
+
+def test_create_task_when_gcp_is_busy(
+    client: TestClient, db_session: Session, video_content: bytes, monkeypatch
+):
+    _, token = login(client, db_session)
+    # El pool de GCP está saturado y rechaza la subida
+    monkeypatch.setattr(gcp_executor, "max_pending", 0)
+
+    response = client.post(
+        "/api/tasks",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("video.mp4", video_content, "video/mp4")},
+    )
+    assert response.status_code == 503
+    assert response.json()["error"] == "error_busy"
+    # No quedan registros sin video ni eventos sin publicar
+    assert db_session.execute(select(Video)).scalars().all() == []
+    assert db_session.execute(select(Task)).scalars().all() == []
+    assert db_session.execute(select(TaskOutboxEvent)).scalars().all() == []
+
+
+def test_create_task_reads_upload_outside_event_loop(
+    client: TestClient, db_session: Session, video_content: bytes, monkeypatch
+):
+    _, token = login(client, db_session)
+    calls = []
+
+    def not_in_event_loop(fn):
+        def wrapper(*args, **kwargs):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            calls.append(fn.__name__)
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    for name in ["probe_upload", "get_content_hash"]:
+        monkeypatch.setattr(
+            controllers, name, not_in_event_loop(getattr(controllers, name))
+        )
+    # Se detiene antes de subir el video
+    monkeypatch.setattr(gcp_executor, "max_pending", 0)
+
+    client.post(
+        "/api/tasks",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("video.mp4", video_content, "video/mp4")},
+    )
+
+    assert calls == ["probe_upload", "get_content_hash"]
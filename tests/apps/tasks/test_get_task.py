@@ -0,0 +1,94 @@
+from faker import Faker
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.apps.auth.utils import encrypt_password
+from src.apps.tasks.models import Task, TaskMetric, TaskStatusEnum
+from src.apps.users.models import User
+from src.apps.videos.models import Video
+
+faker = Faker()
+
+
+def create_task(db_session: Session, password: str, **kwargs) -> Task:
+    user = User(
+        username=faker.user_name(),
+        email=faker.email(),
+        password=encrypt_password(password),
+    )
+    db_session.add(user)
+    db_session.commit()
+    video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="video.mp4",
+        url=f"{faker.uuid4()}/video.mp4",
+    )
+    db_session.add(video)
+    db_session.commit()
+    task = Task(
+        task_id=faker.uuid4(),
+        user_id=user.id,
+        original_video_id=video.id,
+        **kwargs,
+    )
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def get_token(client: TestClient, task: Task, password: str) -> str:
+    response = client.post(
+        "/api/auth/login",
+        json={"username": task.user.username, "password": password},
+    )
+    return response.json()["access_token"]
+
+
+def test_get_task_with_metrics(
+    client: TestClient, db_session: Session, query_counter: list
+):
+    password = faker.password()
+    task = create_task(db_session, password, status=TaskStatusEnum.FAILURE)
+    db_session.add_all(
+        [
+            TaskMetric(task_id=task.id, stage="fetch", wall_time=0.01, cpu_time=0.0),
+            TaskMetric(task_id=task.id, stage="download", wall_time=1.5, cpu_time=0.2),
+        ]
+    )
+    db_session.commit()
+
+    token = get_token(client, task, password)
+    task_id = task.id
+    db_session.expire_all()
+    query_counter.clear()
+    response = client.get(
+        f"/api/tasks/{task_id}", headers={"Authorization": f"Bearer {token}"}
+    )
+    data = response.json()
+    assert response.status_code == 200
+    # Usuario, tarea con sus videos y métricas
+    assert len(query_counter) == 3
+    assert [metric["stage"] for metric in data["metrics"]] == ["fetch", "download"]
+    assert data["metrics"][1]["wall_time"] == 1.5
+
+
+def test_get_task_progress(client: TestClient, db_session: Session):
+    password = faker.password()
+    task = create_task(
+        db_session,
+        password,
+        status=TaskStatusEnum.PROCESSING,
+        progress=40.0,
+        progress_stage="encoding",
+        progress_eta=3.5,
+    )
+
+    token = get_token(client, task, password)
+    response = client.get(
+        f"/api/tasks/{task.id}", headers={"Authorization": f"Bearer {token}"}
+    )
+    data = response.json()
+    assert response.status_code == 200
+    assert data["progress"] == {"percent": 40.0, "stage": "encoding", "eta": 3.5}
+    assert data["metrics"] == []
@@ -0,0 +1,64 @@
+from faker import Faker
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.apps.auth.utils import encrypt_password
+from src.apps.tasks.models import Task, TaskStatusEnum
+from src.apps.users.models import User
+from src.apps.videos.models import Video
+
+faker = Faker()
+
+
+def test_get_tasks_with_cursor(client: TestClient, db_session: Session):
+    password = faker.password()
+    user = User(
+        username=faker.user_name(),
+        email=faker.email(),
+        password=encrypt_password(password),
+    )
+    db_session.add(user)
+    db_session.commit()
+    video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="video.mp4",
+        url=f"{faker.uuid4()}/video.mp4",
+    )
+    db_session.add(video)
+    db_session.commit()
+    tasks = [
+        Task(
+            task_id=faker.uuid4(),
+            user_id=user.id,
+            original_video_id=video.id,
+            status=TaskStatusEnum.UPLOADED,
+        )
+        for _ in range(5)
+    ]
+    db_session.add_all(tasks)
+    db_session.commit()
+    ids = [task.id for task in tasks]
+
+    response = client.post(
+        "/api/auth/login", json={"username": user.username, "password": password}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    response = client.get("/api/tasks?max=2&order=1", headers=headers)
+    assert [task["id"] for task in response.json()] == ids[::-1][:2]
+    assert set(response.links) == {"next"}
+
+    response = client.get(response.links["next"]["url"], headers=headers)
+    assert [task["id"] for task in response.json()] == ids[::-1][2:4]
+    assert set(response.links) == {"next", "prev"}
+
+    last = client.get(response.links["next"]["url"], headers=headers)
+    assert [task["id"] for task in last.json()] == ids[::-1][4:]
+    assert set(last.links) == {"prev"}
+
+    response = client.get(response.links["prev"]["url"], headers=headers)
+    assert [task["id"] for task in response.json()] == ids[::-1][:2]
+    assert set(response.links) == {"next"}
+
+    response = client.get("/api/tasks?cursor=invalido", headers=headers)
+    assert response.status_code == 400
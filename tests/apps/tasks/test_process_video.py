@@ -0,0 +1,157 @@
+import shutil
+import tempfile
+
+import pytest
+from faker import Faker
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.apps.tasks import progress, tasks
+from src.apps.tasks.models import Task, TaskMetric, TaskStatusEnum
+from src.apps.tasks.tasks import process_video
+from src.apps.users.models import User
+from src.apps.videos.models import Video
+from src.core.media.ffmpeg import FFmpegError
+from src.settings.base import settings
+
+faker = Faker()
+
+
+class FakeStorage:
+    """
+    Cliente de Cloud Storage que lee los videos de archivos locales y
+    registra los archivos subidos.
+    """
+
+    files: dict[str, str] = {}
+    uploaded: list[str] = []
+
+    def open_file(self, bucket_name: str, source_path: str, chunk_size: int = None):
+        return open(self.files[source_path], "rb")
+
+    def download_file(self, bucket_name: str, source_path: str):
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
+        temp_file.close()
+        shutil.copyfile(self.files[source_path], temp_file.name)
+        return temp_file.name
+
+    def download_partial_file(self, bucket_name: str, source_path: str, duration):
+        return self.download_file(bucket_name, source_path)
+
+    def upload_file(self, bucket_name: str, destination_path: str, file_path: str):
+        self.uploaded.append(destination_path)
+
+
+@pytest.fixture
+def storage(monkeypatch, db_session: Session) -> type[FakeStorage]:
+    def get_test_db():
+        yield db_session
+
+    monkeypatch.setattr(tasks, "get_db", get_test_db)
+    monkeypatch.setattr(progress, "engine", db_session.get_bind())
+    monkeypatch.setattr(tasks, "GCPCloudStorage", FakeStorage)
+    monkeypatch.setattr(FakeStorage, "files", {})
+    monkeypatch.setattr(FakeStorage, "uploaded", [])
+    monkeypatch.setattr(settings, "VIDEO_PROCESSING_ENGINE", "ffmpeg")
+    monkeypatch.setattr(settings, "VIDEO_BUMPER_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "VIDEO_STREAMING_INPUT_ENABLED", True)
+    return FakeStorage
+
+
+def create_task(db_session: Session, storage: type[FakeStorage], path: str) -> Task:
+    user = User(username=faker.user_name(), email=faker.email(), password="")
+    db_session.add(user)
+    db_session.commit()
+    video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="video.mp4",
+        url=f"{faker.uuid4()}/video.mp4",
+    )
+    db_session.add(video)
+    db_session.commit()
+    storage.files[video.url] = path
+    task = Task(
+        task_id=faker.uuid4(),
+        user_id=user.id,
+        original_video_id=video.id,
+        status=TaskStatusEnum.UPLOADED,
+    )
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def get_stages(db_session: Session, task: Task) -> list[str]:
+    query = select(TaskMetric.stage).where(TaskMetric.task_id == task.id)
+    return list(db_session.execute(query).scalars().all())
+
+
+def test_process_video_streaming(
+    db_session: Session, storage: type[FakeStorage], mp4_files
+):
+    task = create_task(db_session, storage, mp4_files["faststart"])
+
+    process_video(video_id=task.original_video_id, task_id=task.id)
+
+    db_session.refresh(task)
+    assert task.status == TaskStatusEnum.PROCESSED
+    assert storage.uploaded == [f"{task.task_id}/processed_video.mp4"]
+    assert "download_render" in get_stages(db_session, task)
+    assert "download" not in get_stages(db_session, task)
+
+
+def test_process_video_falls_back_to_download(
+    monkeypatch, db_session: Session, storage: type[FakeStorage], mp4_files
+):
+    def render_stream_with_ffmpeg(reader, *args, **kwargs):
+        reader.read(1024)
+        raise FFmpegError("pipe:0: Invalid data found when processing input")
+
+    monkeypatch.setattr(tasks, "render_stream_with_ffmpeg", render_stream_with_ffmpeg)
+    task = create_task(db_session, storage, mp4_files["faststart"])
+
+    process_video(video_id=task.original_video_id, task_id=task.id)
+
+    db_session.refresh(task)
+    # El error con la entrada por bloques no hace fallar la tarea
+    assert task.status == TaskStatusEnum.PROCESSED
+    assert storage.uploaded == [f"{task.task_id}/processed_video.mp4"]
+    assert {"download", "render"} <= set(get_stages(db_session, task))
+    assert "download_render" not in get_stages(db_session, task)
+
+
+def test_process_video_without_faststart(
+    db_session: Session, storage: type[FakeStorage], mp4_files
+):
+    task = create_task(db_session, storage, mp4_files["moov_at_end"])
+
+    process_video(video_id=task.original_video_id, task_id=task.id)
+
+    db_session.refresh(task)
+    assert task.status == TaskStatusEnum.PROCESSED
+    stages = get_stages(db_session, task)
+    # El video se descarga sin intentar la edición por bloques
+    assert {"download", "render"} <= set(stages)
+    assert "download_render" not in stages
+
+
+def test_process_video_failure(
+    monkeypatch, db_session: Session, storage: type[FakeStorage], mp4_files
+):
+    def render_video(*args, on_progress=None, **kwargs):
+        on_progress(0.5)
+        raise FFmpegError("Error al codificar el video")
+
+    monkeypatch.setattr(settings, "VIDEO_STREAMING_INPUT_ENABLED", False)
+    monkeypatch.setattr(tasks, "render_video", render_video)
+    task = create_task(db_session, storage, mp4_files["faststart"])
+
+    process_video(video_id=task.original_video_id, task_id=task.id)
+
+    db_session.refresh(task)
+    assert task.status == TaskStatusEnum.FAILURE
+    assert task.progress_stage == "failed"
+    assert task.progress_eta is None
+    assert storage.uploaded == []
+    assert "render" in get_stages(db_session, task)
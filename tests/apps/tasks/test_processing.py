@@ -0,0 +1,365 @@
+import os
+import re
+import subprocess
+
+import pytest
+
+from src.apps.tasks import processing
+from src.apps.tasks.processing import (
+    build_ffmpeg_filtergraph,
+    can_remux,
+    get_encoding_workers,
+    get_logo_input_args,
+    get_output_size,
+    plan_chunks,
+    remux_main_segment,
+    render_with_ffmpeg,
+)
+from src.core.media.ffmpeg import get_ffmpeg_binary, probe_media, run_ffmpeg
+from src.core.media.schemas import MediaInfo
+from src.settings.base import settings
+
+
+def create_video(
+    path: str, size: str, rate: int, duration: int = 4, audio_duration: int = 4
+) -> str:
+    subprocess.run(
+        [
+            get_ffmpeg_binary(),
+            "-v",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc=size={size}:rate={rate}:duration={duration}",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:sample_rate=44100:duration={audio_duration}",
+            "-c:v",
+            "libx264",
+            "-g",
+            str(rate),
+            "-pix_fmt",
+            "yuv420p",
+            "-c:a",
+            "aac",
+            "-ac",
+            "2",
+            path,
+        ],
+        check=True,
+    )
+    return path
+
+
+@pytest.mark.parametrize(
+    "width, height, expected",
+    [
+        (1920, 1080, (1920, 1080)),
+        (1280, 720, (1280, 720)),
+        # Proporción 4:3 y vertical: el alto es 9/16 del ancho
+        (640, 480, (480, 360)),
+        (1080, 1920, (340, 606)),
+        # Dimensiones impares se ajustan a valores pares
+        (321, 241, (240, 180)),
+        (3, 2, (2, 2)),
+    ],
+)
+def test_get_output_size(width, height, expected):
+    assert get_output_size(width, height) == expected
+
+
+@pytest.mark.parametrize("has_audio", [True, False])
+def test_build_ffmpeg_filtergraph(has_audio):
+    filtergraph = build_ffmpeg_filtergraph(480, 270, 2, has_audio)
+
+    assert "scale=480:270" in filtergraph
+    assert f"fade=t=out:st={2 - processing.FADE_OUT_DURATION}:" in filtergraph
+    assert ("[0:a]" in filtergraph) == has_audio
+    assert filtergraph.endswith("concat=n=2:v=1:a=1[v][a]")
+    # El filtergraph es válido para ffmpeg con un video de la duración
+    # indicada
+    source = "testsrc=size=320x240:rate=25:duration=2[out0]"
+    if has_audio:
+        source += ";sine=sample_rate=48000:duration=2[out1]"
+    run_ffmpeg(
+        [
+            "-f",
+            "lavfi",
+            "-i",
+            source,
+            *get_logo_input_args(),
+            "-filter_complex",
+            filtergraph,
+            "-map",
+            "[v]",
+            "-map",
+            "[a]",
+            "-f",
+            "null",
+            "-",
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "keyframes, duration, workers, expected",
+    [
+        # Un solo proceso: un tramo con todo el segmento
+        ([0, 2, 4, 6], 8, 1, [(0.0, 8)]),
+        # Tramos de al menos duration / workers segundos
+        ([0, 2, 4, 6], 8, 2, [(0.0, 4), (4, 8)]),
+        ([0, 2, 4, 6], 8, 4, [(0.0, 2), (2, 4), (4, 6), (6, 8)]),
+        # Sin tramos menores a VIDEO_MIN_CHUNK_DURATION, ni al final
+        ([0, 1, 2, 3, 4, 5], 6, 6, [(0.0, 2), (2, 4), (4, 6)]),
+        ([0, 2, 4, 5], 5, 3, [(0.0, 2), (2, 5)]),
+        # Los keyframes no tienen que llegar ordenados
+        ([6, 4, 2, 0], 8, 2, [(0.0, 4), (4, 8)]),
+        # Sin keyframes intermedios no se divide
+        ([0], 8, 4, [(0.0, 8)]),
+        ([], 1, 4, [(0.0, 1)]),
+    ],
+)
+def test_plan_chunks(monkeypatch, keyframes, duration, workers, expected):
+    monkeypatch.setattr(settings, "VIDEO_ENCODING_WORKERS", workers)
+    monkeypatch.setattr(settings, "VIDEO_MIN_CHUNK_DURATION", 2.0)
+    assert plan_chunks(keyframes, duration) == expected
+
+
+def test_encoding_workers_share_cpus_between_jobs(monkeypatch):
+    monkeypatch.setattr(settings, "VIDEO_ENCODING_WORKERS", 0)
+    monkeypatch.setattr(processing.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(settings, "PUBSUB_MAX_CONCURRENT_JOBS", 1)
+    assert get_encoding_workers() == 8
+    monkeypatch.setattr(settings, "PUBSUB_MAX_CONCURRENT_JOBS", 4)
+    assert get_encoding_workers() == 2
+    monkeypatch.setattr(settings, "PUBSUB_MAX_CONCURRENT_JOBS", 16)
+    assert get_encoding_workers() == 1
+
+
+@pytest.mark.parametrize(
+    "size, rate, chunked",
+    [
+        # Ya cumple el formato de salida, se copia sin recodificar
+        ("320x180", 24, False),
+        # Se codifica por tramos
+        ("320x240", 25, True),
+    ],
+)
+def test_render_without_bumper_cache(monkeypatch, tmp_path, size, rate, chunked):
+    monkeypatch.setattr(settings, "VIDEO_BUMPER_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "VIDEO_CHUNKED_ENCODING_ENABLED", chunked)
+    monkeypatch.setattr(settings, "VIDEO_ENCODING_WORKERS", 2)
+    monkeypatch.setattr(settings, "VIDEO_MIN_CHUNK_DURATION", 1.0)
+
+    # Sin el caché no se usa el bucket
+    def get_bumper(width: int, height: int) -> str:
+        raise AssertionError("Se usó el caché de la pantalla negra")
+
+    monkeypatch.setattr(processing, "get_bumper", get_bumper)
+    source_path = create_video(str(tmp_path / "original.mp4"), size, rate)
+    info = probe_media(source_path)
+    destination_path = str(tmp_path / "processed.mp4")
+
+    render_with_ffmpeg(source_path, destination_path, info)
+
+    output = probe_media(destination_path)
+    assert output.duration == pytest.approx(4 + processing.BUMPER_DURATION, abs=0.2)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "original.mp4",
+        "processed.mp4",
+    ]
+
+
+class FakeBumperStorage:
+    """
+    Cliente de Cloud Storage que registra las llamadas y puede fallar en una
+    operación.
+    """
+
+    def __init__(self, exists: bool = False, fail: str | None = None):
+        self.exists = exists
+        self.fail = fail
+        self.calls = []
+
+    def call(self, name: str) -> None:
+        self.calls.append(name)
+        if name == self.fail:
+            raise ConnectionError("Error de conexión con el bucket")
+
+    def file_exists(self, bucket_name: str, source_path: str) -> bool:
+        self.call("file_exists")
+        return self.exists
+
+    def download_file(self, bucket_name: str, source_path: str, destination_path):
+        with open(destination_path, "wb") as file:
+            file.write(b"partial")
+        self.call("download_file")
+        with open(destination_path, "wb") as file:
+            file.write(b"bucket")
+
+    def upload_file(self, bucket_name: str, destination_path: str, file_path: str):
+        self.call("upload_file")
+
+
+@pytest.fixture
+def bumper_storage(monkeypatch, tmp_path):
+    def use_storage(storage: FakeBumperStorage) -> list[str]:
+        def render_bumper(width: int, height: int, destination_path: str) -> None:
+            storage.calls.append("render_bumper")
+            with open(destination_path, "wb") as file:
+                file.write(b"rendered")
+
+        monkeypatch.setattr(processing, "GCPCloudStorage", lambda: storage)
+        monkeypatch.setattr(processing, "render_bumper", render_bumper)
+        return storage.calls
+
+    monkeypatch.setattr(settings, "VIDEO_BUMPER_CACHE_DIR", str(tmp_path))
+    return use_storage
+
+
+@pytest.mark.parametrize(
+    "storage, expected_calls, expected_content",
+    [
+        # En el bucket: se descarga sin codificar
+        (
+            FakeBumperStorage(exists=True),
+            ["file_exists", "download_file"],
+            b"bucket",
+        ),
+        # No existe: se codifica y se guarda en el bucket
+        (
+            FakeBumperStorage(),
+            ["file_exists", "render_bumper", "upload_file"],
+            b"rendered",
+        ),
+        # Los errores del bucket no detienen el procesamiento
+        (
+            FakeBumperStorage(fail="file_exists"),
+            ["file_exists", "render_bumper", "upload_file"],
+            b"rendered",
+        ),
+        (
+            FakeBumperStorage(exists=True, fail="download_file"),
+            ["file_exists", "download_file", "render_bumper", "upload_file"],
+            b"rendered",
+        ),
+        (
+            FakeBumperStorage(fail="upload_file"),
+            ["file_exists", "render_bumper", "upload_file"],
+            b"rendered",
+        ),
+    ],
+)
+def test_get_bumper(
+    bumper_storage, tmp_path, storage, expected_calls, expected_content
+):
+    calls = bumper_storage(storage)
+
+    bumper_path = processing.get_bumper(320, 180)
+
+    assert calls == expected_calls
+    with open(bumper_path, "rb") as file:
+        assert file.read() == expected_content
+    # Sin archivos temporales en el caché local
+    assert [path.name for path in tmp_path.iterdir()] == [os.path.basename(bumper_path)]
+    # La siguiente llamada usa el caché local
+    calls.clear()
+    assert processing.get_bumper(320, 180) == bumper_path
+    assert calls == []
+
+
+REMUX_INFO = MediaInfo(
+    duration=10,
+    video_codec="h264",
+    video_profile="High",
+    pixel_format="yuv420p",
+    width=320,
+    height=180,
+    fps=24,
+)
+
+
+@pytest.mark.parametrize(
+    "changes, expected",
+    [
+        ({}, True),
+        ({"video_codec": "hevc"}, False),
+        ({"pixel_format": "yuv444p"}, False),
+        # El perfil debe coincidir con el de la pantalla negra
+        ({"video_profile": "Main"}, False),
+        ({"video_profile": None}, False),
+        # Los cuadros rotados no se pueden unir con los de la pantalla negra
+        ({"rotation": 90}, False),
+        ({"rotation": 180}, False),
+        ({"fps": 24.005}, True),
+        ({"fps": 23.976}, False),
+        ({"fps": 25}, False),
+        ({"fps": None}, False),
+        ({"width": 322}, False),
+        ({"height": 178}, False),
+        ({"duration": processing.TRIM_DURATION}, True),
+        ({"duration": processing.TRIM_DURATION + 0.01}, False),
+        ({"duration": None}, False),
+    ],
+)
+def test_can_remux(monkeypatch, changes, expected):
+    monkeypatch.setattr(settings, "VIDEO_REMUX_ENABLED", True)
+    info = REMUX_INFO.model_copy(update=changes)
+    assert can_remux(info, 320, 180) is expected
+
+
+def test_can_remux_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "VIDEO_REMUX_ENABLED", False)
+    assert not can_remux(REMUX_INFO, 320, 180)
+
+
+def get_frame_sizes(path: str) -> set[str]:
+    logs = run_ffmpeg(["-i", path, "-map", "0:v", "-vf", "showinfo", "-f", "null", "-"])
+    return set(re.findall(r" s:(\d+x\d+) ", logs))
+
+
+def test_render_rotated_video(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "VIDEO_REMUX_ENABLED", True)
+    monkeypatch.setattr(settings, "VIDEO_BUMPER_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "VIDEO_CHUNKED_ENCODING_ENABLED", False)
+    # Grabado en vertical: se muestra como 320x180, el formato de salida
+    source_path = create_video(str(tmp_path / "original.mp4"), "180x320", 24)
+    rotated_path = str(tmp_path / "rotated.mp4")
+    run_ffmpeg(
+        ["-i", source_path, "-c", "copy", "-metadata:s:v:0", "rotate=90", rotated_path]
+    )
+    info = probe_media(rotated_path)
+    assert (info.width, info.height) == (320, 180) and info.is_rotated
+    destination_path = str(tmp_path / "processed.mp4")
+
+    render_with_ffmpeg(rotated_path, destination_path, info)
+
+    output = probe_media(destination_path)
+    assert (output.width, output.height, output.rotation) == (320, 180, None)
+    # Todos los cuadros, del video y de la pantalla negra, con las mismas
+    # dimensiones
+    assert get_frame_sizes(destination_path) == {"320x180"}
+
+
+def get_audio_duration(path: str) -> float:
+    logs = run_ffmpeg(["-i", path, "-map", "0:a", "-f", "null", "-"])
+    hours, minutes, seconds = re.findall(r"time=(\d+):(\d+):([\d.]+)", logs)[-1]
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+@pytest.mark.parametrize("audio_duration", [2, 6])
+def test_remux_main_segment_aligns_audio(tmp_path, audio_duration):
+    source_path = create_video(
+        str(tmp_path / "original.mp4"), "320x180", 24, audio_duration=audio_duration
+    )
+    info = probe_media(source_path)
+    info.duration = 4
+    destination_path = str(tmp_path / "main.mp4")
+
+    remux_main_segment(source_path, destination_path, info)
+
+    # El audio dura lo mismo que el video aunque el original sea más corto o
+    # más largo
+    assert get_audio_duration(destination_path) == pytest.approx(4, abs=0.05)
@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import Select, insert, select, text
+from sqlalchemy.orm import Session
+
+from src.apps.tasks.models import Task, TaskStatusEnum
+from src.apps.users.models import User
+
+
+def explain(db_session: Session, query: Select) -> str:
+    statement = query.compile(
+        db_session.get_bind(), compile_kwargs={"literal_binds": True}
+    )
+    rows = db_session.execute(text(f"EXPLAIN {statement}")).scalars().all()
+    return "\n".join(rows)
+
+
+@pytest.fixture(scope="function")
+def seeded_session(db_session: Session) -> Session:
+    users = db_session.execute(
+        insert(User).returning(User.id),
+        [
+            {"username": f"user{i}", "email": f"user{i}@mail.com", "password": "x"}
+            for i in range(1000)
+        ],
+    )
+    user_ids = users.scalars().all()
+    statuses = [TaskStatusEnum.UPLOADED] * 49 + [TaskStatusEnum.PROCESSED]
+    db_session.execute(
+        insert(Task),
+        [
+            {
+                "task_id": str(i),
+                "user_id": user_ids[i % len(user_ids)],
+                "status": statuses[i % len(statuses)],
+                "is_active": i % 20 != 0,
+            }
+            for i in range(5000)
+        ],
+    )
+    db_session.execute(text("ANALYZE users"))
+    db_session.execute(text("ANALYZE tasks"))
+    return db_session
+
+
+USER_TASKS = select(Task).where(Task.user_id == 3, Task.is_active == True)
+PROCESSED_TASKS = select(Task).where(
+    Task.is_active == True, Task.status == TaskStatusEnum.PROCESSED
+)
+
+
+@pytest.mark.parametrize(
+    "query,index",
+    [
+        (select(User).where(User.id == 3, User.is_active == True), "pk_users"),
+        (
+            USER_TASKS.order_by(Task.id.asc()).limit(11),
+            "ix_tasks_user_id_id_active",
+        ),
+        (
+            USER_TASKS.where(Task.id < 4000).order_by(Task.id.desc()).limit(11),
+            "ix_tasks_user_id_id_active",
+        ),
+        (
+            PROCESSED_TASKS.order_by(Task.id.asc()).limit(11),
+            "ix_tasks_status_id_active",
+        ),
+        (
+            PROCESSED_TASKS.where(Task.id > 2500).order_by(Task.id.asc()).limit(11),
+            "ix_tasks_status_id_active",
+        ),
+    ],
+)
+def test_list_queries_use_indexes(seeded_session: Session, query: Select, index: str):
+    """
+    Verifica que los listados usen su índice en lugar de recorrer la tabla.
+    """
+    plan = explain(seeded_session, query)
+    assert "Seq Scan" not in plan, plan
+    assert index in plan, plan
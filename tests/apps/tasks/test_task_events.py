@@ -0,0 +1,25 @@
+import asyncio
+
+from src.apps.tasks.events import TaskEventHub
+from src.apps.tasks.schemas import TaskEventSchema
+
+
+def test_dispatch_task_event_to_user_subscribers():
+    async def run():
+        hub = TaskEventHub()
+        hub.loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=2)
+        other_queue = asyncio.Queue(maxsize=2)
+        hub.subscribers[1].add(queue)
+        hub.subscribers[2].add(other_queue)
+        for status in ("uploaded", "processed", "failure"):
+            event = TaskEventSchema(id=1, task_id="task", user_id=1, status=status)
+            hub.dispatch(event.model_dump_json())
+        hub.dispatch("no es un evento")
+        await asyncio.sleep(0)
+        return [queue.get_nowait().status for _ in range(queue.qsize())], other_queue
+
+    statuses, other_queue = asyncio.run(run())
+    # La cola está llena, por lo que se descarta el evento más antiguo
+    assert statuses == ["processed", "failure"]
+    assert other_queue.empty()
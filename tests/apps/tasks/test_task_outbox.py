@@ -0,0 +1,107 @@
+from concurrent.futures import Future
+
+from faker import Faker
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.apps.tasks.models import Task, TaskOutboxEvent, TaskStatusEnum
+from src.apps.tasks.outbox import TaskOutboxRelay
+from src.apps.users.models import User
+from src.core.gcp.pubsub.handlers import PubSubEvents
+from src.settings.base import settings
+
+faker = Faker()
+
+
+def test_relay_task_outbox_events(db_session: Session):
+    user = User(username=faker.user_name(), email=faker.email(), password="")
+    db_session.add(user)
+    db_session.commit()
+    task = Task(task_id=faker.uuid4(), user_id=user.id)
+    db_session.add(task)
+    db_session.commit()
+    events = [
+        TaskOutboxEvent(
+            task_id=task.id,
+            event_type=PubSubEvents.PROCESS_VIDEO,
+            payload={"video_id": index, "task_id": task.id},
+        )
+        for index in range(3)
+    ]
+    db_session.add_all(events)
+    db_session.commit()
+
+    published = []
+
+    def publish(data: dict, event_type: str) -> Future:
+        future = Future()
+        if data["video_id"] == 1:
+            future.set_exception(RuntimeError("Pub/Sub no disponible"))
+        else:
+            published.append(data["video_id"])
+            future.set_result("message-id")
+        return future
+
+    relay = TaskOutboxRelay(publish=publish)
+    # Otro proceso está publicando el último evento
+    with Session(bind=db_session.get_bind()) as other_session:
+        query = (
+            select(TaskOutboxEvent)
+            .where(TaskOutboxEvent.id == events[2].id)
+            .with_for_update()
+        )
+        other_session.execute(query)
+        assert relay.relay_batch(db_session) == 1
+    assert published == [0]
+    db_session.expire_all()
+    assert events[0].published_at is not None
+    assert events[1].published_at is None
+    assert events[1].attempts == 1
+    assert events[1].last_error == "Pub/Sub no disponible"
+    assert events[1].next_attempt_at > events[0].published_at
+
+    # El evento bloqueado ya está disponible y el que falló espera su
+    # siguiente intento
+    assert relay.relay_batch(db_session) == 1
+    assert published == [0, 2]
+    db_session.expire_all()
+    assert events[1].attempts == 1
+
+
+def test_relay_discards_events_after_max_attempts(db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_OUTBOX_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "TASK_OUTBOX_RETRY_DELAY", 0)
+    user = User(username=faker.user_name(), email=faker.email(), password="")
+    db_session.add(user)
+    db_session.commit()
+    task = Task(task_id=faker.uuid4(), user_id=user.id, status=TaskStatusEnum.UPLOADED)
+    db_session.add(task)
+    db_session.commit()
+    event = TaskOutboxEvent(
+        task_id=task.id,
+        event_type=PubSubEvents.PROCESS_VIDEO,
+        payload={"video_id": 1, "task_id": task.id},
+    )
+    db_session.add(event)
+    db_session.commit()
+
+    calls = []
+
+    def publish(data: dict, event_type: str) -> Future:
+        calls.append(data)
+        raise RuntimeError("Pub/Sub no disponible")
+
+    relay = TaskOutboxRelay(publish=publish)
+    assert relay.relay_batch(db_session) == 0
+    db_session.expire_all()
+    assert event.attempts == 1
+    assert task.status == TaskStatusEnum.UPLOADED
+
+    # Al agotar los intentos el evento se descarta y la tarea falla
+    assert relay.relay_batch(db_session) == 0
+    db_session.expire_all()
+    assert event.attempts == 2
+    assert task.status == TaskStatusEnum.FAILURE
+    assert task.progress_stage == "failed"
+    assert relay.relay_batch(db_session) == 0
+    assert len(calls) == 2
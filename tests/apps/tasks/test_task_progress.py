@@ -0,0 +1,109 @@
+import time
+
+import pytest
+from faker import Faker
+from sqlalchemy.orm import Session
+
+from src.apps.tasks import progress
+from src.apps.tasks.models import Task, TaskStatusEnum
+from src.apps.tasks.progress import TaskHeartbeat, TaskProgress
+from src.apps.users.models import User
+
+faker = Faker()
+
+
+class FakeClock:
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(progress.time, "monotonic", clock)
+    return clock
+
+
+def create_task(db_session: Session) -> Task:
+    user = User(username=faker.user_name(), email=faker.email(), password="")
+    db_session.add(user)
+    db_session.commit()
+    task = Task(
+        task_id=faker.uuid4(), user_id=user.id, status=TaskStatusEnum.PROCESSING
+    )
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def test_task_progress_throttling_and_eta(monkeypatch, clock: FakeClock):
+    saved = []
+    monkeypatch.setattr(TaskProgress, "save", lambda self, *args: saved.append(args))
+    task = Task(
+        id=1, task_id=faker.uuid4(), user_id=1, status=TaskStatusEnum.PROCESSING
+    )
+    task_progress = TaskProgress(task, interval=10)
+
+    task_progress.set_stage("encoding")
+    # Menos de `interval` segundos desde la última actualización
+    clock.now = 105
+    task_progress.update(0.25)
+    clock.now = 120
+    task_progress.update(0.5)
+    clock.now = 125
+    task_progress.update(0.6)
+    clock.now = 130
+    task_progress.update(0.75)
+    # Sin avance no se estima el tiempo restante
+    task_progress.set_stage("uploading")
+    clock.now = 140
+    task_progress.update(0)
+
+    assert saved == [
+        ("encoding", 0.0, None),
+        # 20 segundos para la mitad, se estiman 20 segundos más
+        ("encoding", 50.0, 20.0),
+        ("encoding", 75.0, 10.0),
+        ("uploading", 0.0, None),
+        ("uploading", 0.0, None),
+    ]
+
+
+def test_task_progress_saves_to_database(
+    monkeypatch, db_session: Session, clock: FakeClock
+):
+    monkeypatch.setattr(progress, "engine", db_session.get_bind())
+    task = create_task(db_session)
+    task_progress = TaskProgress(task, interval=0)
+
+    task_progress.set_stage("encoding")
+    clock.now = 108
+    task_progress.update(0.8)
+
+    db_session.refresh(task)
+    assert task.progress == 80.0
+    assert task.progress_stage == "encoding"
+    assert task.progress_eta == pytest.approx(2.0)
+
+
+def test_task_heartbeat(monkeypatch, db_session: Session):
+    monkeypatch.setattr(progress, "engine", db_session.get_bind())
+    task = create_task(db_session)
+    finished_task = create_task(db_session)
+    finished_task.status = TaskStatusEnum.PROCESSED
+    db_session.commit()
+
+    heartbeat = TaskHeartbeat(task.id, interval=0.01)
+    heartbeat.start()
+    time.sleep(0.1)
+    heartbeat.stop()
+    TaskHeartbeat(finished_task.id).beat()
+
+    db_session.refresh(task)
+    db_session.refresh(finished_task)
+    assert task.heartbeat_at is not None
+    # Solo se envían señales de las tareas en proceso
+    assert finished_task.heartbeat_at is None
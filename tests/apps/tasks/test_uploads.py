@@ -0,0 +1,53 @@
+from faker import Faker
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.apps.auth.utils import encrypt_password
+from src.apps.tasks.models import Task
+from src.apps.users.models import User
+from src.apps.videos.models import Video
+
+faker = Faker()
+
+
+def test_finalize_upload(client: TestClient, db_session: Session):
+    password = faker.password()
+    user = User(
+        username=faker.user_name(),
+        email=faker.email(),
+        password=encrypt_password(password),
+    )
+    db_session.add(user)
+    db_session.commit()
+    video_uuid = faker.uuid4()
+    video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="video.mp4",
+        url=f"{video_uuid}/video.mp4",
+    )
+    db_session.add(video)
+    db_session.commit()
+    task = Task(task_id=video_uuid, user_id=user.id, original_video_id=video.id)
+    db_session.add(task)
+    db_session.commit()
+
+    response = client.post(
+        "/api/auth/login", json={"username": user.username, "password": password}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    response = client.post(
+        "/api/tasks/uploads", json={"filename": "video.avi"}, headers=headers
+    )
+    assert response.status_code == 400
+    assert response.json()["error"] == "error_video"
+
+    # Finalizar una subida ya finalizada retorna la tarea existente
+    response = client.post(
+        f"/api/tasks/uploads/{video_uuid}",
+        json={"filename": "video.mp4"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == task.id
+    assert db_session.query(Task).count() == 1
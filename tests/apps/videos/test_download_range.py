@@ -0,0 +1,33 @@
+import pytest
+
+from src.apps.videos.utils import RangeNotSatisfiableError, parse_range
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("bytes=0-99", (0, 100)),
+        ("bytes=100-", (100, 1000)),
+        ("bytes=-100", (900, 1000)),
+        ("bytes=-5000", (0, 1000)),
+        ("bytes=900-5000", (900, 1000)),
+        ("bytes=0-0", (0, 1)),
+        # Los headers mal formados o con varios rangos se ignoran
+        ("bytes=0-99,200-299", None),
+        ("bytes=99-0", None),
+        ("bytes=-", None),
+        ("bytes=a-b", None),
+        ("items=0-99", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize(
+    "header, size", [("bytes=1000-", 1000), ("bytes=-0", 1000), ("bytes=-10", 0)]
+)
+def test_parse_range_not_satisfiable(header, size):
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range(header, size)
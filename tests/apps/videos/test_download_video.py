@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from faker import Faker
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.apps.users.models import User
+from src.apps.videos.models import Video
+from src.core.gcp.executor import AsyncCloudStorage
+from src.settings.base import settings
+
+faker = Faker()
+
+CONTENT = bytes(range(256)) * 40
+
+
+class FakeStorage:
+    """
+    Cliente de Cloud Storage con un único archivo en memoria, que registra los
+    rangos descargados.
+    """
+
+    def __init__(self):
+        self.ranges = []
+
+    def get_file(self, bucket_name: str, source_path: str):
+        return SimpleNamespace(
+            size=len(CONTENT),
+            generation=7,
+            updated=datetime(2026, 10, 18, tzinfo=timezone.utc),
+        )
+
+    def download_range(self, bucket_name, source_path, start, end, generation=None):
+        assert generation == 7
+        self.ranges.append((start, end))
+        return CONTENT[start:end]
+
+
+@pytest.fixture
+def storage(monkeypatch) -> FakeStorage:
+    storage = FakeStorage()
+
+    async def get_storage(self):
+        return storage
+
+    monkeypatch.setattr(AsyncCloudStorage, "get_storage", get_storage)
+    monkeypatch.setattr(settings, "VIDEO_DOWNLOAD_MODE", "stream")
+    monkeypatch.setattr(settings, "VIDEO_DOWNLOAD_CHUNK_SIZE", 4096)
+    return storage
+
+
+@pytest.fixture
+def video(db_session: Session) -> Video:
+    user = User(username=faker.user_name(), email=faker.email(), password="")
+    db_session.add(user)
+    db_session.commit()
+    video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="video.mp4",
+        url=f"{faker.uuid4()}/video.mp4",
+    )
+    db_session.add(video)
+    db_session.commit()
+    return video
+
+
+def test_download_video(client: TestClient, storage: FakeStorage, video: Video):
+    response = client.get(f"/api/videos/download/{video.id}")
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["content-length"] == str(len(CONTENT))
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == '"7"'
+    # El contenido se lee por bloques
+    assert storage.ranges == [(0, 4096), (4096, 8192), (8192, len(CONTENT))]
+
+
+def test_download_video_range(client: TestClient, storage: FakeStorage, video: Video):
+    response = client.get(
+        f"/api/videos/download/{video.id}", headers={"Range": "bytes=4000-4199"}
+    )
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[4000:4200]
+    assert response.headers["content-range"] == f"bytes 4000-4199/{len(CONTENT)}"
+    assert response.headers["content-length"] == "200"
+    assert storage.ranges == [(4000, 4200)]
+
+
+def test_download_video_range_not_satisfiable(
+    client: TestClient, storage: FakeStorage, video: Video
+):
+    response = client.get(
+        f"/api/videos/download/{video.id}",
+        headers={"Range": f"bytes={len(CONTENT)}-"},
+    )
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+    assert storage.ranges == []
+
+
+@pytest.mark.parametrize(
+    "if_range, status_code",
+    [
+        ('"7"', 206),
+        ("Sun, 18 Oct 2026 00:00:00 GMT", 206),
+        # El video cambió, se envía completo
+        ('"6"', 200),
+        ("Sat, 17 Oct 2026 00:00:00 GMT", 200),
+    ],
+)
+def test_download_video_if_range(
+    client: TestClient, storage: FakeStorage, video: Video, if_range, status_code
+):
+    response = client.get(
+        f"/api/videos/download/{video.id}",
+        headers={"Range": "bytes=100-199", "If-Range": if_range},
+    )
+
+    assert response.status_code == status_code
+    if status_code == 206:
+        assert response.content == CONTENT[100:200]
+    else:
+        assert response.content == CONTENT
+        assert "content-range" not in response.headers
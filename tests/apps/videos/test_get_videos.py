@@ -0,0 +1,57 @@
+from faker import Faker
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.apps.auth.utils import encrypt_password
+from src.apps.tasks.models import Task, TaskStatusEnum
+from src.apps.users.models import User
+from src.apps.videos.models import Video
+
+faker = Faker()
+
+
+def test_get_videos_query_count(
+    client: TestClient, db_session: Session, query_counter: list
+):
+    password = faker.password()
+    user = User(
+        username=faker.user_name(),
+        email=faker.email(),
+        password=encrypt_password(password),
+    )
+    db_session.add(user)
+    db_session.commit()
+    for _ in range(3):
+        original_video, processed_video = [
+            Video(
+                title=faker.sentence(),
+                user_id=user.id,
+                filename="video.mp4",
+                url=f"{faker.uuid4()}/video.mp4",
+            )
+            for _ in range(2)
+        ]
+        db_session.add_all([original_video, processed_video])
+        db_session.commit()
+        db_session.add(
+            Task(
+                task_id=faker.uuid4(),
+                user_id=user.id,
+                original_video_id=original_video.id,
+                processed_video_id=processed_video.id,
+                status=TaskStatusEnum.PROCESSED,
+            )
+        )
+    db_session.commit()
+
+    response = client.post(
+        "/api/auth/login", json={"username": user.username, "password": password}
+    )
+    token = response.json()["access_token"]
+    db_session.expire_all()
+    query_counter.clear()
+    response = client.get("/api/videos", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    # Usuario y tareas con sus videos procesados, sin importar la cantidad
+    assert len(query_counter) == 2
@@ -0,0 +1,34 @@
+import asyncio
+
+from src.apps.videos.cache import SignedUrlCache
+from src.settings.base import settings
+
+
+class CountingStorage:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_public_url(self, bucket_name: str, file_path: str, expiration: int):
+        self.calls += 1
+        return f"https://storage/{bucket_name}/{file_path}?signature={self.calls}"
+
+
+def test_signed_url_cache_reuses_url_until_close_to_expiration():
+    now = [0.0]
+    cache = SignedUrlCache(timer=lambda: now[0])
+    client = CountingStorage()
+
+    async def get_url(path: str) -> str:
+        return await cache.get_url(client, "videos", path)
+
+    first = asyncio.run(get_url("a.mp4"))
+    assert asyncio.run(get_url("a.mp4")) == first
+    assert asyncio.run(get_url("b.mp4")) != first
+    assert client.calls == 2
+
+    # Cerca de la expiración se firma una URL nueva
+    now[0] = (
+        settings.VIDEO_SIGNED_URL_EXPIRATION - settings.VIDEO_SIGNED_URL_CACHE_MARGIN
+    )
+    assert asyncio.run(get_url("a.mp4")) != first
+    assert client.calls == 3
@@ -1,11 +1,17 @@
+import subprocess
+
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
+from src.apps.users.cache import user_cache
 from src.core.database.base import Base
-from src.core.database.dependencies import get_db
+from src.core.database.dependencies import get_async_db, get_db
+from src.core.media.ffmpeg import get_ffmpeg_binary
 from src.main import app  # type: ignore
 from src.settings.base import settings
 
@@ -22,6 +28,14 @@ engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
 SessionTesting = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Cada TestClient corre en su propio event loop, por lo que las conexiones
+# asíncronas no se reutilizan entre casos de pruebas
+async_engine = create_async_engine(settings.DB_ASYNC_URL_TEST, poolclass=NullPool)
+
+AsyncSessionTesting = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="function")
 def app():
@@ -34,27 +48,115 @@ def app():
     Base.metadata.drop_all(engine)
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_user_cache():
+    """
+    Limpia el caché de usuarios, ya que los ids se repiten entre casos de
+    pruebas al recrear la base de datos.
+    """
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
 @pytest.fixture(scope="function")
 def db_session(app: FastAPI):
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = SessionTesting(bind=connection)
+    """
+    Sesión para preparar los datos de cada caso de pruebas. Las rutas usan
+    otra conexión (asíncrona), por lo que los datos se deben confirmar con
+    commit para que sean visibles; se eliminan al recrear la base de datos.
+    """
+    session = SessionTesting()
     yield session
     session.close()
-    transaction.rollback()
-    connection.close()
 
 
 @pytest.fixture(scope="function")
 def client(app: FastAPI, db_session: SessionTesting):  # type: ignore
     """
-    Crea un nuevo TestClient de FastAPI que usa el fixture `db_session` para
-    sobreescribir la dependencia `get_db` que es inyectada en las rutas.
+    Crea un nuevo TestClient de FastAPI que usa la base de datos de pruebas
+    en las dependencias `get_db` y `get_async_db` que son inyectadas en las
+    rutas.
     """
 
     def _get_test_db():
         return db_session
 
+    async def _get_test_async_db():
+        async with AsyncSessionTesting() as session:
+            yield session
+
     app.dependency_overrides[get_db] = _get_test_db
+    app.dependency_overrides[get_async_db] = _get_test_async_db
     with TestClient(app, raise_server_exceptions=False) as client:
         yield client
+
+
+@pytest.fixture(scope="function")
+def query_counter():
+    """
+    Registra las sentencias SQL que ejecutan las rutas en la base de datos de
+    pruebas, para verificar la cantidad de consultas que realiza una petición.
+    """
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute
+    )
+    yield statements
+    event.remove(
+        async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute
+    )
+
+
+MP4_LAYOUTS = {
+    "faststart": ["-movflags", "+faststart"],
+    "moov_at_end": [],
+    "fragmented": ["-movflags", "frag_keyframe+empty_moov"],
+}
+
+
+@pytest.fixture(scope="session")
+def mp4_files(tmp_path_factory) -> dict[str, str]:
+    """
+    Genera con ffmpeg un video MP4 corto (4 segundos, 320x240 a 25 cuadros
+    por segundo, H.264 con audio AAC estéreo) en cada disposición de cajas:
+    con la caja moov al inicio, al final y fragmentado.
+    """
+    directory = tmp_path_factory.mktemp("mp4")
+    files = {}
+    for layout, movflags in MP4_LAYOUTS.items():
+        path = str(directory / f"{layout}.mp4")
+        subprocess.run(
+            [
+                get_ffmpeg_binary(),
+                "-v",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                "testsrc=size=320x240:rate=25:duration=4",
+                "-f",
+                "lavfi",
+                "-i",
+                "sine=frequency=440:sample_rate=44100:duration=4",
+                "-c:v",
+                "libx264",
+                "-g",
+                "25",
+                "-pix_fmt",
+                "yuv420p",
+                "-c:a",
+                "aac",
+                "-ac",
+                "2",
+                *movflags,
+                path,
+            ],
+            check=True,
+        )
+        files[layout] = path
+    return files
@@ -0,0 +1,46 @@
+import base64
+import json
+import os
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.core.gcp import clients
+from src.core.gcp.cloud_storage.base import GCPCloudStorage
+from src.settings.base import settings
+
+
+def test_gcp_clients_are_shared_by_the_process(monkeypatch):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    account_info = {
+        "type": "service_account",
+        "project_id": "project",
+        "client_email": "api@project.iam.gserviceaccount.com",
+        "private_key": private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode(),
+        "token_uri": "https://oauth2.googleapis.com/token",
+    }
+    monkeypatch.setattr(
+        settings,
+        "GCP_CREDENTIALS_BASE64",
+        base64.b64encode(json.dumps(account_info).encode()).decode(),
+    )
+    monkeypatch.setattr(settings, "GCP_PROJECT_ID", "project")
+    try:
+        storage = GCPCloudStorage()
+        assert GCPCloudStorage().client is storage.client
+        assert clients.get_publisher_client() is clients.get_publisher_client()
+
+        # Un proceso hijo no hereda los clientes del padre
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if clients._storage_client is None else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+    finally:
+        clients.close_clients()
+        clients._credentials = None
+    assert clients._storage_client is None
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+from src.apps.commons.exceptions import CustomException
+from src.core.gcp.executor import GCPExecutor
+
+
+def test_gcp_executor_runs_off_loop_and_rejects_when_saturated():
+    executor = GCPExecutor(workers=1, max_pending=2)
+    release = threading.Event()
+
+    async def run():
+        loop_thread = threading.get_ident()
+        calls = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        # El event loop sigue libre mientras las llamadas esperan en el pool
+        stats = executor.get_stats()
+        rejected = None
+        try:
+            await executor.run(threading.get_ident)
+        except CustomException as e:
+            rejected = e
+        release.set()
+        await asyncio.gather(*calls)
+        thread = await executor.run(threading.get_ident)
+        return stats, rejected, thread != loop_thread
+
+    try:
+        stats, rejected, off_loop = asyncio.run(run())
+    finally:
+        executor.shutdown()
+    assert stats["pending"] == 2 and stats["active"] == 1
+    assert rejected.status_code == 503
+    assert off_loop
+    assert executor.get_stats()["calls"] == 3
+    assert executor.get_stats()["rejected"] == 1
+    assert executor.get_stats()["peak_pending"] == 2
+
+
+def test_gcp_executor_runs_admitted_calls_when_saturated():
+    executor = GCPExecutor(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def run():
+        call = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        rejected = None
+        try:
+            await executor.run(threading.get_ident)
+        except CustomException as e:
+            rejected = e
+        # Los bloques de una descarga admitida esperan un hilo libre
+        admitted = asyncio.ensure_future(executor.run_admitted(lambda: "chunk"))
+        await asyncio.sleep(0.05)
+        pending = executor.get_stats()["pending"]
+        release.set()
+        await call
+        return rejected, pending, await admitted
+
+    try:
+        rejected, pending, result = asyncio.run(run())
+    finally:
+        executor.shutdown()
+    assert rejected.status_code == 503
+    assert pending == 2
+    assert result == "chunk"
@@ -0,0 +1,243 @@
+import json
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from faker import Faker
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.apps.tasks import tasks
+from src.apps.tasks.models import Task, TaskStatusEnum
+from src.apps.tasks.tasks import claim_task
+from src.apps.users.models import User
+from src.apps.videos.models import Video
+from src.core.gcp.pubsub import listener
+from src.core.gcp.pubsub.listener import JobExecutor, callback
+from src.settings.base import settings
+
+faker = Faker()
+
+
+class FakeMessage:
+    def __init__(
+        self,
+        message_id: str = "1",
+        delivery_attempt: int | None = None,
+        video_id: int = 1,
+        task_id: int = 2,
+    ):
+        self.message_id = message_id
+        self.delivery_attempt = delivery_attempt
+        self.data = json.dumps(
+            {
+                "event_type": "process_video",
+                "data": {"video_id": video_id, "task_id": task_id},
+            }
+        ).encode("utf-8")
+        self.acked = False
+        self.nacked = False
+
+    def ack(self):
+        self.acked = True
+
+    def nack(self):
+        self.nacked = True
+
+
+class CrashingExecutor(JobExecutor):
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.calls = 0
+
+    def run(self, fn, **kwargs):
+        self.calls += 1
+        raise BrokenProcessPool("El proceso terminó de forma abrupta")
+
+
+class ClaimingExecutor(JobExecutor):
+    """
+    Simula un proceso que termina de forma abrupta después de tomar la tarea
+    en la primera entrega, y ejecuta el trabajo en el hilo actual en las
+    siguientes.
+    """
+
+    def __init__(self, session: Session):
+        super().__init__(max_workers=1)
+        self.session = session
+        self.calls = 0
+
+    def run(self, fn, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            task = self.session.get(Task, kwargs["task_id"])
+            assert claim_task(self.session, task)
+            raise BrokenProcessPool("El proceso terminó de forma abrupta")
+        return fn(**kwargs)
+
+
+@pytest.fixture
+def discarded(monkeypatch) -> list[int]:
+    discarded = []
+    monkeypatch.setattr(listener, "discard_job", discarded.append)
+    monkeypatch.setattr(listener, "requeue_job", lambda task_id: None)
+    monkeypatch.setattr(settings, "PUBSUB_MAX_JOB_CRASHES", 3)
+    return discarded
+
+
+def crash():
+    os._exit(1)
+
+
+def get_sigint_handler():
+    return signal.getsignal(signal.SIGINT)
+
+
+def wait(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def create_task(db_session: Session) -> Task:
+    user = User(username=faker.user_name(), email=faker.email(), password="")
+    db_session.add(user)
+    db_session.commit()
+    video = Video(
+        title=faker.sentence(),
+        user_id=user.id,
+        filename="video.mp4",
+        url=f"{faker.uuid4()}/video.mp4",
+    )
+    db_session.add(video)
+    db_session.commit()
+    task = Task(
+        task_id=faker.uuid4(),
+        user_id=user.id,
+        original_video_id=video.id,
+        status=TaskStatusEnum.UPLOADED,
+    )
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def test_callback_acks_processed_message(monkeypatch, discarded):
+    jobs = []
+    monkeypatch.setattr(listener, "process_video", lambda **kwargs: jobs.append(kwargs))
+    message = FakeMessage()
+
+    callback(message)
+
+    assert jobs == [{"video_id": 1, "task_id": 2}]
+    assert message.acked and not message.nacked
+    assert discarded == []
+
+
+def test_callback_discards_message_after_max_crashes(discarded):
+    executor = CrashingExecutor()
+    try:
+        for _ in range(2):
+            message = FakeMessage()
+            callback(message, executor=executor)
+            assert message.nacked and not message.acked
+        # Al llegar al límite el mensaje se reconoce y la tarea falla
+        message = FakeMessage()
+        callback(message, executor=executor)
+        assert message.acked and not message.nacked
+        assert discarded == [2]
+        # Otro mensaje tiene su propio contador
+        message = FakeMessage(message_id="2")
+        callback(message, executor=executor)
+        assert message.nacked
+    finally:
+        executor.shutdown()
+
+
+def test_callback_uses_delivery_attempt(discarded):
+    executor = CrashingExecutor()
+    try:
+        message = FakeMessage(delivery_attempt=3)
+        callback(message, executor=executor)
+    finally:
+        executor.shutdown()
+    assert message.acked
+    assert discarded == [2]
+
+
+def test_job_executor_replaces_broken_pool():
+    executor = JobExecutor(max_workers=1)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            executor.run(crash)
+        # Los procesos del pool ignoran Ctrl+C, que maneja el suscriptor
+        assert executor.run(get_sigint_handler) == signal.SIG_IGN
+    finally:
+        executor.shutdown()
+
+
+def test_job_executor_isolates_crashes():
+    executor = JobExecutor(max_workers=2)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as threads:
+            running = threads.submit(executor.run, wait, seconds=2)
+            time.sleep(0.5)
+            crashed = threads.submit(executor.run, crash)
+            with pytest.raises(BrokenProcessPool):
+                crashed.result()
+            # El trabajo del otro proceso no se ve afectado
+            assert running.result() == 2
+    finally:
+        executor.shutdown()
+
+
+def test_callback_requeues_crashed_task(monkeypatch, db_session: Session):
+    def get_test_db():
+        yield db_session
+
+    class FailingStorage:
+        def __init__(self):
+            raise RuntimeError("Sin acceso al bucket")
+
+    monkeypatch.setattr(settings, "PUBSUB_MAX_JOB_CRASHES", 3)
+    monkeypatch.setattr(
+        listener, "session_factory", sessionmaker(db_session.get_bind())
+    )
+    monkeypatch.setattr(tasks, "get_db", get_test_db)
+    monkeypatch.setattr(tasks, "GCPCloudStorage", FailingStorage)
+    task = create_task(db_session)
+    executor = ClaimingExecutor(db_session)
+
+    message = FakeMessage(video_id=task.original_video_id, task_id=task.id)
+    callback(message, executor=executor)
+    assert message.nacked and not message.acked
+    db_session.refresh(task)
+    # La tarea tomada por el proceso caído vuelve a la cola
+    assert task.status == TaskStatusEnum.UPLOADED
+
+    message = FakeMessage(video_id=task.original_video_id, task_id=task.id)
+    callback(message, executor=executor)
+    assert message.acked
+    db_session.refresh(task)
+    # La nueva entrega toma la tarea y la procesa, aquí sin acceso al bucket
+    assert task.status == TaskStatusEnum.FAILURE
+
+
+def test_callback_redelivers_task_in_progress(
+    monkeypatch, db_session: Session, discarded
+):
+    def get_test_db():
+        yield db_session
+
+    monkeypatch.setattr(tasks, "get_db", get_test_db)
+    task = create_task(db_session)
+    assert claim_task(db_session, task)
+
+    message = FakeMessage(video_id=task.original_video_id, task_id=task.id)
+    callback(message)
+
+    # Otro worker la está procesando, el mensaje se entrega de nuevo
+    assert message.nacked and not message.acked
+    db_session.refresh(task)
+    assert task.status == TaskStatusEnum.PROCESSING
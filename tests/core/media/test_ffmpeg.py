@@ -0,0 +1,168 @@
+import subprocess
+
+import pytest
+
+from src.core.media.ffmpeg import (
+    FFmpegError,
+    get_ffmpeg_binary,
+    parse_media_info,
+    probe_media,
+)
+from src.core.media.schemas import MediaInfo
+
+HEADER = """Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'video.mp4':
+  Metadata:
+    major_brand     : isom
+    minor_version   : 512
+    compatible_brands: isomiso2avc1mp41
+    encoder         : Lavf58.29.100
+"""
+
+WITH_AUDIO = (
+    HEADER
+    + """  Duration: 00:01:02.50, start: 0.000000, bitrate: 2158 kb/s
+    Stream #0:0(und): Video: h264 (High) (avc1 / 0x31637661), yuv420p(tv, bt709), 1920x1080 [SAR 1:1 DAR 16:9], 2020 kb/s, 30 fps, 30 tbr, 15360 tbn, 60 tbc (default)
+    Metadata:
+      handler_name    : VideoHandler
+    Stream #0:1(und): Audio: aac (LC) (mp4a / 0x6134706D), 48000 Hz, stereo, fltp, 128 kb/s (default)
+    Metadata:
+      handler_name    : SoundHandler
+"""
+)
+
+WITHOUT_AUDIO = (
+    HEADER
+    + """  Duration: 00:00:02.00, start: 0.000000, bitrate: 69 kb/s
+    Stream #0:0(und): Video: h264 (High) (avc1 / 0x31637661), yuv420p, 322x242 [SAR 1:1 DAR 161:121], 64 kb/s, 29.97 fps, 29.97 tbr, 30k tbn, 59.94 tbc (default)
+    Metadata:
+      handler_name    : VideoHandler
+"""
+)
+
+ROTATED = (
+    HEADER
+    + """  Duration: 00:00:10.01, start: 0.000000, bitrate: 17011 kb/s
+    Stream #0:0(eng): Video: hevc (Main) (hvc1 / 0x31637668), yuv420p(tv, bt709), 1920x1080, 16837 kb/s, 29.98 fps, 29.97 tbr, 600 tbn, 600 tbc (default)
+    Metadata:
+      rotate          : 90
+      creation_time   : 2026-10-18T12:00:00.000000Z
+      handler_name    : Core Media Video
+    Side data:
+      displaymatrix: rotation of -90.00 degrees
+    Stream #0:1(eng): Audio: aac (LC) (mp4a / 0x6134706D), 44100 Hz, mono, fltp, 94 kb/s (default)
+    Metadata:
+      handler_name    : Core Media Audio
+"""
+)
+
+UPSIDE_DOWN = (
+    HEADER
+    + """  Duration: 00:00:03.00, start: 0.000000, bitrate: 900 kb/s
+    Stream #0:0(und): Video: h264 (Baseline) (avc1 / 0x31637661), yuvj420p(pc), 641x359, 850 kb/s, 25 fps, 25 tbr, 12800 tbn, 50 tbc (default)
+    Metadata:
+      rotate          : 180
+    Side data:
+      displaymatrix: rotation of -180.00 degrees
+"""
+)
+
+
+@pytest.mark.parametrize(
+    "output, expected",
+    [
+        (
+            WITH_AUDIO,
+            MediaInfo(
+                duration=62.5,
+                bitrate=2158000,
+                video_codec="h264",
+                video_profile="High",
+                pixel_format="yuv420p",
+                width=1920,
+                height=1080,
+                fps=30,
+                audio_codec="aac",
+                audio_sample_rate=48000,
+                audio_channels=2,
+            ),
+        ),
+        (
+            WITHOUT_AUDIO,
+            MediaInfo(
+                duration=2,
+                bitrate=69000,
+                video_codec="h264",
+                video_profile="High",
+                pixel_format="yuv420p",
+                width=322,
+                height=242,
+                fps=29.97,
+            ),
+        ),
+        # Grabado en vertical: las dimensiones se reportan ya rotadas
+        (
+            ROTATED,
+            MediaInfo(
+                duration=10.01,
+                bitrate=17011000,
+                video_codec="hevc",
+                video_profile="Main",
+                pixel_format="yuv420p",
+                width=1080,
+                height=1920,
+                fps=29.98,
+                rotation=90,
+                audio_codec="aac",
+                audio_sample_rate=44100,
+                audio_channels=1,
+            ),
+        ),
+        # Dimensiones impares y una rotación que no cambia la orientación
+        (
+            UPSIDE_DOWN,
+            MediaInfo(
+                duration=3,
+                bitrate=900000,
+                video_codec="h264",
+                video_profile="Baseline",
+                pixel_format="yuvj420p",
+                width=641,
+                height=359,
+                fps=25,
+                rotation=180,
+            ),
+        ),
+    ],
+)
+def test_parse_media_info(output, expected):
+    assert parse_media_info(output) == expected
+
+
+def test_parse_media_info_invalid():
+    output = "video.mp4: Invalid data found when processing input\n"
+    with pytest.raises(FFmpegError, match="Invalid data"):
+        parse_media_info(output)
+
+
+def test_probe_rotated_video(mp4_files, tmp_path):
+    path = str(tmp_path / "rotated.mp4")
+    subprocess.run(
+        [
+            get_ffmpeg_binary(),
+            "-v",
+            "error",
+            "-i",
+            mp4_files["faststart"],
+            "-c",
+            "copy",
+            "-metadata:s:v:0",
+            "rotate=90",
+            path,
+        ],
+        check=True,
+    )
+
+    info = probe_media(path)
+
+    assert (info.width, info.height) == (240, 320)
+    assert info.rotation == 270
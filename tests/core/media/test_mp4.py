@@ -0,0 +1,207 @@
+import struct
+import subprocess
+
+import pytest
+
+from src.core.media import mp4
+from src.core.media.ffmpeg import get_ffmpeg_binary, probe_media
+from src.core.media.mp4 import (
+    Mp4Error,
+    get_faststart_header_size,
+    merge_ranges,
+    plan_partial_download,
+    probe_mp4,
+)
+
+
+def get_reader(data: bytes):
+    """
+    Crea una función que lee rangos de bytes de `data` y registra cada
+    lectura, como lo hace el cliente de Cloud Storage.
+    """
+    reads = []
+
+    def read_range(start: int, end: int) -> bytes:
+        reads.append((start, end))
+        return data[start:end]
+
+    return read_range, reads
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("layout", ["faststart", "moov_at_end", "fragmented"])
+def test_probe_mp4(mp4_files, layout):
+    data = read_file(mp4_files[layout])
+    read_range, _ = get_reader(data)
+
+    info = probe_mp4(read_range, len(data))
+
+    assert info.video_codec == "h264"
+    assert info.pixel_format == "yuv420p"
+    assert (info.width, info.height) == (320, 240)
+    assert info.video_profile == "High"
+    assert info.rotation is None
+    assert info.audio_codec == "aac"
+    assert info.audio_sample_rate == 44100
+    assert info.audio_channels == 2
+    if layout == "fragmented":
+        # La caja moov no tiene muestras ni caja mehd, la duración la obtiene
+        # el worker
+        assert info.duration is None and info.bitrate is None
+    else:
+        assert info.duration == pytest.approx(4, abs=0.1)
+        assert info.fps == pytest.approx(25)
+        assert info.bitrate == int(len(data) * 8 / info.duration)
+
+
+def test_probe_mp4_rotated(mp4_files, tmp_path):
+    path = str(tmp_path / "rotated.mp4")
+    subprocess.run(
+        [
+            get_ffmpeg_binary(),
+            "-v",
+            "error",
+            "-i",
+            mp4_files["faststart"],
+            "-c",
+            "copy",
+            "-metadata:s:v:0",
+            "rotate=90",
+            path,
+        ],
+        check=True,
+    )
+    data = read_file(path)
+    read_range, _ = get_reader(data)
+
+    info = probe_mp4(read_range, len(data))
+
+    # Las mismas dimensiones y rotación que reporta ffmpeg
+    expected = probe_media(path)
+    assert (info.width, info.height) == (240, 320)
+    assert (info.width, info.height, info.rotation, info.video_profile) == (
+        expected.width,
+        expected.height,
+        expected.rotation,
+        expected.video_profile,
+    )
+
+
+def test_get_faststart_header_size(mp4_files):
+    data = read_file(mp4_files["faststart"])
+    read_range, _ = get_reader(data)
+    size = get_faststart_header_size(read_range, len(data))
+    assert data[size - 8 : size] != b"moov" and b"moov" in data[:size]
+    assert data[size + 4 : size + 8] in (b"free", b"mdat")
+
+    data = read_file(mp4_files["moov_at_end"])
+    read_range, _ = get_reader(data)
+    with pytest.raises(Mp4Error):
+        get_faststart_header_size(read_range, len(data))
+
+
+@pytest.mark.parametrize("layout", ["faststart", "moov_at_end"])
+def test_plan_partial_download(mp4_files, tmp_path, monkeypatch, layout):
+    # Sin unir rangos cercanos, ya que el archivo de prueba es pequeño
+    monkeypatch.setattr(mp4, "RANGE_MERGE_GAP", 0)
+    data = read_file(mp4_files[layout])
+    read_range, _ = get_reader(data)
+
+    known, ranges = plan_partial_download(read_range, len(data), 1, margin=0.5)
+
+    assert ranges == sorted(ranges)
+    assert all(0 <= start < end <= len(data) for start, end in ranges)
+    assert all(end < start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    assert sum(end - start for start, end in ranges) < len(data) / 2
+    moov = data.index(b"moov") - 4
+    assert known[moov][4:8] == b"moov"
+
+    # El archivo con solo los rangos planificados decodifica el inicio
+    partial = bytearray(len(data))
+    for offset, chunk in known.items():
+        partial[offset : offset + len(chunk)] = chunk
+    for start, end in ranges:
+        partial[start:end] = data[start:end]
+    path = tmp_path / "partial.mp4"
+    path.write_bytes(partial)
+    result = subprocess.run(
+        [get_ffmpeg_binary(), "-v", "error", "-i", str(path), "-t", "1"]
+        + ["-f", "null", "-"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0
+    assert result.stderr == ""
+
+
+def test_plan_partial_download_rejects_fragmented(mp4_files):
+    data = read_file(mp4_files["fragmented"])
+    read_range, reads = get_reader(data)
+
+    with pytest.raises(Mp4Error):
+        plan_partial_download(read_range, len(data), 1)
+    # El recorrido termina en el primer fragmento
+    assert len(reads) <= 2
+
+
+def test_plan_partial_download_rejects_corrupt_tables(mp4_files):
+    data = bytearray(read_file(mp4_files["moov_at_end"]))
+    # Cantidad de entradas de stsc mayor a la caja
+    stsc = data.index(b"stsc")
+    data[stsc + 8 : stsc + 12] = struct.pack(">I", 0xFFFFFF)
+    read_range, _ = get_reader(bytes(data))
+
+    with pytest.raises(Mp4Error):
+        plan_partial_download(read_range, len(data), 1)
+
+
+def test_plan_partial_download_rejects_ranges_outside_file(mp4_files):
+    data = read_file(mp4_files["faststart"])
+    # Archivo truncado: las muestras apuntan fuera del archivo
+    truncated = data[: data.index(b"mdat") + 1024]
+    read_range, _ = get_reader(truncated)
+
+    with pytest.raises(Mp4Error):
+        plan_partial_download(read_range, len(truncated), 10)
+
+
+def test_probe_mp4_rejects_invalid_input():
+    data = struct.pack(">I4s", 16, b"ftyp") + b"isom" * 2
+    read_range, _ = get_reader(data)
+    with pytest.raises(Mp4Error):
+        probe_mp4(read_range, len(data))
+
+    data = struct.pack(">I4s", 1024, b"moov") + b"\0" * 8
+    read_range, _ = get_reader(data)
+    with pytest.raises(Mp4Error):
+        probe_mp4(read_range, len(data))
+
+
+def test_read_top_level_boxes_is_bounded(monkeypatch):
+    monkeypatch.setattr(mp4, "MAX_TOP_LEVEL_BOXES", 8)
+    data = struct.pack(">I4s", 8, b"free") * 16
+    read_range, _ = get_reader(data)
+    with pytest.raises(Mp4Error):
+        probe_mp4(read_range, len(data))
+
+
+GAP = mp4.RANGE_MERGE_GAP
+
+
+@pytest.mark.parametrize(
+    "ranges, expected",
+    [
+        ([], []),
+        ([(10, 20)], [(10, 20)]),
+        ([(0, 10), (5, 8)], [(0, 10)]),
+        ([(GAP + 40, GAP + 50), (0, 10)], [(0, 10), (GAP + 40, GAP + 50)]),
+        ([(GAP + 10, GAP + 20), (0, 10)], [(0, GAP + 20)]),
+        ([(0, 10), (20, 30), (GAP + 30, GAP + 40)], [(0, GAP + 40)]),
+    ],
+)
+def test_merge_ranges(ranges, expected):
+    assert merge_ranges(ranges) == expected